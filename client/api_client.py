@@ -1,29 +1,235 @@
-from pymongo import MongoClient
+import base64
+import json
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from bson import ObjectId
-from datetime import datetime
-from .config import MONGODB_URI, MONGODB_DB
+from datetime import datetime, timedelta
+from pymongo import ASCENDING, DESCENDING, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, ConfigurationError, OperationFailure
+from .config import TOURS_PAGE_SIZE, INACTIVE_TOUR_STATUSES
+from .conflicts import BookingIndex, blocks_slot
+from .database import get_client, get_database
+from .metrics import instrument_methods
+from .resilience import UNAVAILABLE_ERRORS, get_circuit_breaker, guarded
+from .tour_schema import LEGACY_TIME_FIELDS, normalize_tour_times, tour_interval, tour_length
 
+# Fields that decide which time slot a tour occupies
+SCHEDULE_FIELDS = ('property_id', 'tour_time', 'end_time', 'status') + LEGACY_TIME_FIELDS
+
+# Fields a tour card (and the edit form behind it) actually reads
+TOUR_CARD_PROJECTION = {
+    'property_id': 1,
+    'tour_time': 1,
+    'end_time': 1,
+    'client_name': 1,
+    'phone_number': 1,
+    'status': 1
+}
+
+def _encode_cursor(tour: Dict) -> str:
+    """Build an opaque keyset token from the last tour of a page"""
+    tour_time = tour.get('tour_time')
+    key = [tour_time.isoformat() if tour_time else None, str(tour['_id'])]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+def _decode_cursor(cursor: str) -> List:
+    """Inverse of _encode_cursor"""
+    tour_time, tour_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return [datetime.fromisoformat(tour_time) if tour_time else None, ObjectId(tour_id)]
+
+def _extract_tour_id(tour_id) -> ObjectId:
+    """Accept a tour id string or a tour dict with 'id'/'_id'"""
+    if isinstance(tour_id, dict):
+        tour_id = tour_id.get('id') or tour_id.get('_id')
+    if not tour_id:
+        raise ValueError("Invalid tour ID")
+    return ObjectId(tour_id)
+
+def _bulk_results(ids: List, invalid: Dict[int, str], write_errors: List[Dict],
+                  positions: List[int]) -> List[Dict]:
+    """Build per-item results for a bulk call
+
+    Args:
+        ids: Requested ids (or None for inserts), in request order
+        invalid: Request index -> error for items rejected before the round trip
+        write_errors: 'writeErrors' from a BulkWriteError (indexes into the sent batch)
+        positions: Request index of each operation in the sent batch
+    """
+    errors = dict(invalid)
+    for error in write_errors:
+        errors[positions[error['index']]] = error.get('errmsg', 'Write failed')
+    results = []
+    for index, item_id in enumerate(ids):
+        item = {'id': item_id, 'success': index not in errors}
+        if index in errors:
+            item['error'] = errors[index]
+        results.append(item)
+    return results
+
+def _parse_tour_ids(tour_ids: List):
+    """Split a bulk request into request-order ids, per-index errors and valid ObjectIds"""
+    ids, invalid, object_ids = [], {}, []
+    for index, tour_id in enumerate(tour_ids):
+        try:
+            object_id = _extract_tour_id(tour_id)
+        except Exception as e:
+            ids.append(None)
+            invalid[index] = str(e)
+            continue
+        ids.append(str(object_id))
+        object_ids.append(object_id)
+    return ids, invalid, object_ids
+
+def _tour_document(tour: Optional[Dict]) -> Optional[Dict]:
+    """Give a raw tour document the string 'id'/'_id' the rest of the app expects"""
+    if tour is not None:
+        tour['id'] = tour['_id'] = str(tour['_id'])
+    return tour
+
+def as_object_id(value):
+    """Coerce a property/tour id string to ObjectId (ObjectIds and None pass through)"""
+    if isinstance(value, str) and ObjectId.is_valid(value):
+        return ObjectId(value)
+    return value
+
+def _day_start(value) -> datetime:
+    """Midnight of a date bound given as a date, datetime or 'YYYY-MM-DD' string"""
+    if isinstance(value, str):
+        value = datetime.strptime(value, '%Y-%m-%d')
+    return datetime(value.year, value.month, value.day)
+
+@instrument_methods('api')
 class ApiClient:
-    def __init__(self):
-        """Initialize MongoDB client"""
-        self.client = MongoClient(MONGODB_URI)
-        self.db = self.client[MONGODB_DB]
+    def __init__(self, db=None):
+        """Initialize MongoDB client (borrowed from the shared pool)
+
+        Args:
+            db: Database to use instead of the configured one (benchmarks, tools)
+        """
+        self.db = db if db is not None else get_database()
+        self.client = self.db.client if db is not None else get_client()
+        self.circuit_breaker = get_circuit_breaker()
+
+    # Health
+    @property
+    def available(self) -> bool:
+        """False while the circuit is open and calls fail fast without a round trip"""
+        return self.circuit_breaker.available
+
+    @property
+    def health(self) -> str:
+        """Circuit state: 'closed' (healthy), 'open' (offline) or 'half_open' (probing)"""
+        return self.circuit_breaker.state
+
+    @guarded(idempotent=True)
+    def ping(self) -> bool:
+        """Round trip to the cluster; raises ServiceUnavailable/ConnectionFailure when down"""
+        self.db.command('ping')
+        return True
+
+    # Booking guard
+    def find_conflicting_tours(self, tour_data: Dict, exclude_id: Optional[ObjectId] = None,
+                               session=None) -> List[str]:
+        """Ids of active tours at the same property overlapping the given tour"""
+        interval = tour_interval(tour_data)
+        if interval is None or not tour_data.get('property_id') or not blocks_slot(tour_data):
+            return []
+        start, end = interval
+        query = {
+            'property_id': as_object_id(tour_data['property_id']),
+            'status': {'$nin': list(INACTIVE_TOUR_STATUSES)},
+            'tour_time': {'$lt': end},
+            'end_time': {'$gt': start}
+        }
+        if exclude_id is not None:
+            query['_id'] = {'$ne': exclude_id}
+        return [str(other['_id']) for other in self.db.tours.find(query, {'_id': 1}, session=session)]
+
+    def _run_booking_guarded(self, property_id, callback):
+        """Run callback(session) so concurrent bookings for one property serialize
+
+        Every guarded write bumps a per-property lock document inside a
+        transaction, so two writers racing for the same property conflict
+        on it and the loser retries (re-running its overlap check).
+
+        Args:
+            property_id: Property to lock, or a list of them for batch writes
+        """
+        property_ids = property_id if isinstance(property_id, list) else [property_id]
+
+        def transaction(session):
+            # Always lock in the same order so two batches can't deadlock each other
+            for locked_id in sorted(set(property_ids), key=str):
+                self.db.property_locks.update_one(
+                    {'_id': locked_id},
+                    {'$inc': {'version': 1}},
+                    upsert=True,
+                    session=session
+                )
+            return callback(session)
+
+        return self._run_in_transaction(transaction, 'booking conflict check')
+
+    def _run_in_transaction(self, callback, description: str):
+        """Run callback(session) in a transaction, or with session=None where unsupported"""
+        try:
+            session = self.client.start_session()
+        except (ConfigurationError, NotImplementedError) as e:
+            # No sessions at all (e.g. the mongomock stand-in used by the benchmarks)
+            logging.warning(f"Sessions unavailable ({e}); {description} is not atomic")
+            return callback(None)
+        try:
+            with session:
+                return session.with_transaction(callback)
+        except OperationFailure as e:
+            # Standalone servers have no transactions (IllegalOperation)
+            if e.code != 20:
+                raise
+            logging.warning(f"Transactions unavailable; {description} is not atomic")
+            return callback(None)
 
     # Tour Methods
+    @guarded()
     def add_tour(self, tour_data: Dict) -> Dict:
-        """Add a new tour"""
+        """Add a new tour, refusing one that overlaps an active tour at the same property
+
+        Returns:
+            Dict with 'success', the new 'id' and the inserted 'tour'
+        """
         try:
             # Add creation timestamp
             tour_data['created_at'] = datetime.utcnow()
-            tour_data['status'] = 'scheduled'
+            tour_data['updated_at'] = tour_data['created_at']
+            tour_data.setdefault('status', 'scheduled')
+            normalize_tour_times(tour_data)
+            if 'property_id' in tour_data:
+                tour_data['property_id'] = as_object_id(tour_data['property_id'])
             
-            result = self.db.tours.insert_one(tour_data)
-            return {
-                'success': True,
-                'id': str(result.inserted_id)
-            }
+            def insert(session):
+                if '_id' in tour_data:
+                    # Ids assigned by the caller make retries safe: replaying a stored tour succeeds
+                    stored = self.db.tours.find_one({'_id': tour_data['_id']}, session=session)
+                    if stored is not None:
+                        return {'success': True, 'id': str(stored['_id']), 'tour': _tour_document(stored)}
+                conflicts = self.find_conflicting_tours(tour_data, session=session)
+                if conflicts:
+                    return {
+                        'success': False,
+                        'error': 'Tour overlaps another tour at this property',
+                        'conflicts': conflicts
+                    }
+                result = self.db.tours.insert_one(tour_data, session=session)
+                return {
+                    'success': True,
+                    'id': str(result.inserted_id),
+                    'tour': _tour_document(dict(tour_data))
+                }
+
+            if tour_interval(tour_data) and tour_data.get('property_id'):
+                return self._run_booking_guarded(tour_data['property_id'], insert)
+            return insert(None)
+        except UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
             logging.error(f"Failed to add tour: {e}")
             return {
@@ -31,6 +237,7 @@ class ApiClient:
                 'error': str(e)
             }
 
+    @guarded(idempotent=True)
     def get_tour(self, tour_id: str) -> Optional[Dict]:
         """Get a single tour by ID"""
         try:
@@ -42,37 +249,242 @@ class ApiClient:
             if tour:
                 tour['_id'] = str(tour['_id'])
             return tour
+        except UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
             logging.error(f"Failed to get tour: {e}")
             return None
 
+    @guarded(idempotent=True)
     def get_tours(self) -> List[Dict]:
         """Fetch all tours"""
         try:
-            tours = list(self.db.tours.find())
-            # Convert ObjectId to string and ensure consistent ID field
-            for tour in tours:
-                tour['id'] = str(tour['_id'])  # Add 'id' field
-                tour['_id'] = str(tour['_id'])  # Keep '_id' for compatibility
-            return tours
+            # String 'id' plus '_id' (kept for compatibility)
+            return [_tour_document(tour) for tour in self.db.tours.find()]
+        except UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
             logging.error(f"Failed to fetch tours: {e}")
             return []
 
-    def update_tour(self, tour_id: str, tour_data: Dict) -> Dict:
-        """Update an existing tour"""
+    @guarded(idempotent=True)
+    def query_tours(self, statuses: Optional[Iterable[str]] = None,
+                    exclude_statuses: Optional[Iterable[str]] = None,
+                    date_from=None, date_to=None,
+                    property_id: Optional[str] = None,
+                    descending: bool = False,
+                    page_size: int = TOURS_PAGE_SIZE,
+                    cursor: Optional[str] = None) -> Dict:
+        """Fetch one page of tours filtered, sorted and paginated server-side
+
+        Args:
+            statuses: Only return tours in these statuses
+            exclude_statuses: Skip tours in these statuses
+            date_from: Earliest tour day (inclusive, date or 'YYYY-MM-DD')
+            date_to: Latest tour day (inclusive, date or 'YYYY-MM-DD')
+            property_id: Only return tours for this property
+            descending: Sort newest first instead of oldest first
+            page_size: Maximum number of tours to return
+            cursor: Keyset token returned as 'next_cursor' by the previous page
+
+        Returns:
+            Dict with 'tours' (card fields only) and 'next_cursor' (None on the last page)
+        """
         try:
-            # Add update timestamp
-            tour_data['updated_at'] = datetime.utcnow()
-            
-            result = self.db.tours.update_one(
-                {'_id': ObjectId(tour_id)}, 
-                {'$set': tour_data}
+            query = {}
+            if statuses is not None:
+                query['status'] = {'$in': list(statuses)}
+            elif exclude_statuses is not None:
+                query['status'] = {'$nin': list(exclude_statuses)}
+
+            time_range = {}
+            if date_from:
+                time_range['$gte'] = _day_start(date_from)
+            if date_to:
+                time_range['$lt'] = _day_start(date_to) + timedelta(days=1)
+            if time_range:
+                query['tour_time'] = time_range
+
+            if property_id:
+                query['property_id'] = as_object_id(property_id)
+
+            if cursor:
+                # Keyset pagination: resume strictly after the last (tour_time, _id)
+                last_time, last_id = _decode_cursor(cursor)
+                op = '$lt' if descending else '$gt'
+                query = {'$and': [query, {'$or': [
+                    {'tour_time': {op: last_time}},
+                    {'tour_time': last_time, '_id': {op: last_id}}
+                ]}]}
+
+            direction = DESCENDING if descending else ASCENDING
+            tours = list(
+                self.db.tours.find(query, TOUR_CARD_PROJECTION)
+                .sort([('tour_time', direction), ('_id', direction)])
+                .limit(page_size + 1)
             )
+
+            next_cursor = None
+            if len(tours) > page_size:
+                tours = tours[:page_size]
+                next_cursor = _encode_cursor(tours[-1])
+
+            for tour in tours:
+                tour['id'] = str(tour['_id'])
+                tour['_id'] = str(tour['_id'])
             return {
                 'success': True,
-                'modified_count': result.modified_count
+                'tours': tours,
+                'next_cursor': next_cursor
+            }
+        except UNAVAILABLE_ERRORS:
+            raise
+        except Exception as e:
+            logging.error(f"Failed to query tours: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'tours': [],
+                'next_cursor': None
+            }
+
+    @guarded(idempotent=True)
+    def get_dashboard_tours(self, limit: int = TOURS_PAGE_SIZE) -> Dict:
+        """Fetch the first page of both dashboard tabs and their totals in one aggregation
+
+        Active tours come back oldest first and past tours newest first,
+        each limited to the fields a tour card shows. Each tab's facet
+        filters and sorts the raw documents before projecting them, and
+        its sort and limit run together as a top-k sort, so a facet never
+        holds more than `limit` tours.
+
+        Returns:
+            Dict with 'active', 'inactive', 'active_total' and 'inactive_total'
+        """
+        inactive = list(INACTIVE_TOUR_STATUSES)
+        pipeline = [
+            {'$facet': {
+                'active': [
+                    {'$match': {'status': {'$nin': inactive}}},
+                    {'$sort': {'tour_time': 1, '_id': 1}},
+                    {'$limit': limit},
+                    {'$project': TOUR_CARD_PROJECTION}
+                ],
+                'inactive': [
+                    {'$match': {'status': {'$in': inactive}}},
+                    {'$sort': {'tour_time': -1, '_id': -1}},
+                    {'$limit': limit},
+                    {'$project': TOUR_CARD_PROJECTION}
+                ],
+                'counts': [
+                    {'$group': {
+                        '_id': {'$in': [{'$ifNull': ['$status', None]}, inactive]},
+                        'count': {'$sum': 1}
+                    }}
+                ]
+            }}
+        ]
+        try:
+            facets = next(self.db.tours.aggregate(pipeline), {})
+            counts = {group['_id']: group['count'] for group in facets.get('counts', [])}
+            for tour in facets.get('active', []) + facets.get('inactive', []):
+                tour['id'] = str(tour['_id'])
+                tour['_id'] = str(tour['_id'])
+            return {
+                'success': True,
+                'active': facets.get('active', []),
+                'inactive': facets.get('inactive', []),
+                'active_total': counts.get(False, 0),
+                'inactive_total': counts.get(True, 0)
+            }
+        except UNAVAILABLE_ERRORS:
+            raise
+        except Exception as e:
+            logging.error(f"Failed to fetch dashboard tours: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'active': [],
+                'inactive': [],
+                'active_total': 0,
+                'inactive_total': 0
             }
+
+    @guarded()
+    def update_tour(self, tour_id: str, tour_data: Dict,
+                    expected_updated_at: Optional[datetime] = None) -> Dict:
+        """Update an existing tour, refusing a reschedule onto an occupied slot
+
+        Args:
+            tour_id: Tour ID
+            tour_data: Fields to set
+            expected_updated_at: Only apply if the tour is unchanged since this
+                'updated_at' (otherwise the result has 'conflict': True)
+
+        Returns:
+            Dict with 'success', 'modified_count' and the updated 'tour'
+            (None if it no longer exists)
+        """
+        try:
+            # Add update timestamp
+            tour_data['updated_at'] = datetime.utcnow()
+            object_id = ObjectId(tour_id)
+            if 'property_id' in tour_data:
+                tour_data['property_id'] = as_object_id(tour_data['property_id'])
+            
+            reschedule = any(field in tour_data for field in SCHEDULE_FIELDS)
+            current = {}
+            if reschedule:
+                current = self.db.tours.find_one(
+                    {'_id': object_id},
+                    {'property_id': 1, 'status': 1, 'tour_time': 1, 'end_time': 1}
+                ) or {}
+                # Moving only the start keeps the tour's existing length
+                normalize_tour_times(tour_data, length=tour_length(current))
+            
+            changes = {'$set': tour_data}
+            if 'tour_time' in tour_data:
+                changes['$unset'] = {field: '' for field in LEGACY_TIME_FIELDS}
+            
+            def update(session):
+                if reschedule:
+                    conflicts = self.find_conflicting_tours(
+                        dict(current, **tour_data), exclude_id=object_id, session=session
+                    )
+                    if conflicts:
+                        return {
+                            'success': False,
+                            'error': 'Tour overlaps another tour at this property',
+                            'conflicts': conflicts
+                        }
+                query = {'_id': object_id}
+                if expected_updated_at is not None:
+                    query['updated_at'] = expected_updated_at
+                tour = self.db.tours.find_one_and_update(
+                    query, 
+                    changes,
+                    return_document=ReturnDocument.AFTER,
+                    session=session
+                )
+                if expected_updated_at is not None and tour is None:
+                    exists = self.db.tours.find_one({'_id': object_id}, {'_id': 1}, session=session)
+                    return {
+                        'success': False,
+                        'error': 'Tour was changed by someone else' if exists else 'Tour not found',
+                        'conflict': True
+                    }
+                return {
+                    'success': True,
+                    'modified_count': int(tour is not None),
+                    'tour': _tour_document(tour)
+                }
+
+            property_id = tour_data.get('property_id') or current.get('property_id')
+            if not reschedule or not property_id:
+                return update(None)
+            return self._run_booking_guarded(property_id, update)
+        except UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
             logging.error(f"Failed to update tour: {e}")
             return {
@@ -88,6 +500,7 @@ class ApiClient:
         """Mark a tour as completed"""
         return self.update_tour_status(tour_id, 'completed', notes)
 
+    @guarded()
     def delete_tour(self, tour_id: str) -> Dict:
         """Delete a tour"""
         try:
@@ -99,10 +512,19 @@ class ApiClient:
                 raise ValueError("Invalid tour ID")
 
             result = self.db.tours.delete_one({'_id': ObjectId(tour_id)})
+            if result.deleted_count:
+                # Leave a tombstone so incremental sync can drop the tour from replicas
+                self.db.tour_tombstones.replace_one(
+                    {'_id': ObjectId(tour_id)},
+                    {'deleted_at': datetime.utcnow()},
+                    upsert=True
+                )
             return {
                 'success': True,
                 'deleted_count': result.deleted_count
             }
+        except UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
             logging.error(f"Failed to delete tour: {e}")
             return {
@@ -110,6 +532,7 @@ class ApiClient:
                 'error': str(e)
             }
 
+    @guarded()
     def update_tour_status(self, tour_id: str, status: str, notes: str = None) -> Dict:
         """Update tour status
         
@@ -119,7 +542,7 @@ class ApiClient:
             notes: Optional notes about the status change
             
         Returns:
-            Dict with success/error information
+            Dict with success/error information and the updated 'tour'
         """
         try:
             # Extract ID from tour object if necessary
@@ -139,15 +562,19 @@ class ApiClient:
             if notes:
                 update_data[f'{status}_notes'] = notes
 
-            result = self.db.tours.update_one(
+            tour = self.db.tours.find_one_and_update(
                 {'_id': ObjectId(tour_id)},
-                {'$set': update_data}
+                {'$set': update_data},
+                return_document=ReturnDocument.AFTER
             )
             
             return {
                 'success': True,
-                'modified_count': result.modified_count
+                'modified_count': int(tour is not None),
+                'tour': _tour_document(tour)
             }
+        except UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
             logging.error(f"Failed to update tour status: {e}")
             return {
@@ -155,7 +582,263 @@ class ApiClient:
                 'error': str(e)
             }
 
+    # Bulk Tour Methods
+    @guarded()
+    def add_tours(self, tours_data: List[Dict]) -> Dict:
+        """Add many tours in one round trip, refusing any that would double-book
+
+        Each tour is checked against the active tours already stored and the
+        tours accepted before it in the same batch, with one query for the
+        whole batch; refused tours are reported with their 'conflicts'.
+
+        Returns:
+            Dict with 'success' (no item failed), 'inserted_count' and
+            per-item 'results' in request order (each with the new 'id')
+        """
+        now = datetime.utcnow()
+        for tour_data in tours_data:
+            tour_data['created_at'] = now
+            tour_data['updated_at'] = now
+            tour_data.setdefault('status', 'scheduled')
+            normalize_tour_times(tour_data)
+            if 'property_id' in tour_data:
+                tour_data['property_id'] = as_object_id(tour_data['property_id'])
+
+        guarded_tours = [tour_data for tour_data in tours_data
+                         if tour_interval(tour_data) and tour_data.get('property_id') and blocks_slot(tour_data)]
+
+        def insert(session):
+            booked = BookingIndex(self._overlapping_active_tours(guarded_tours, session))
+            accepted, positions, refused = [], [], {}
+            for index, tour_data in enumerate(tours_data):
+                conflicts = booked.conflicts_for(tour_data) if blocks_slot(tour_data) else []
+                if conflicts:
+                    refused[index] = conflicts
+                    continue
+                tour_data['_id'] = ObjectId()
+                booked.add(tour_data)
+                accepted.append(tour_data)
+                positions.append(index)
+
+            write_errors = []
+            if accepted:
+                try:
+                    self.db.tours.insert_many(accepted, ordered=False, session=session)
+                except BulkWriteError as e:
+                    write_errors = e.details.get('writeErrors', [])
+            return accepted, positions, refused, write_errors
+
+        try:
+            if guarded_tours:
+                property_ids = [tour_data['property_id'] for tour_data in guarded_tours]
+                accepted, positions, refused, write_errors = self._run_booking_guarded(property_ids, insert)
+            else:
+                accepted, positions, refused, write_errors = insert(None)
+        except UNAVAILABLE_ERRORS:
+            raise
+        except Exception as e:
+            logging.error(f"Failed to add tours: {e}")
+            return {'success': False, 'error': str(e), 'results': []}
+
+        ids = [None] * len(tours_data)
+        for tour_data, index in zip(accepted, positions):
+            ids[index] = str(tour_data['_id'])
+        invalid = {index: 'Tour overlaps another tour at this property' for index in refused}
+        results = _bulk_results(ids, invalid, write_errors, positions)
+        for index, conflicts in refused.items():
+            results[index]['conflicts'] = conflicts
+        failed = sum(1 for item in results if not item['success'])
+        return {
+            'success': not failed,
+            'inserted_count': len(results) - failed,
+            'results': results
+        }
+
+    def _overlapping_active_tours(self, tours_data: List[Dict], session=None) -> List[Dict]:
+        """Stored active tours that could clash with any of the given tours (one query)"""
+        if not tours_data:
+            return []
+        intervals = [tour_interval(tour_data) for tour_data in tours_data]
+        query = {
+            'property_id': {'$in': list({tour_data['property_id'] for tour_data in tours_data})},
+            'status': {'$nin': list(INACTIVE_TOUR_STATUSES)},
+            'tour_time': {'$lt': max(end for _, end in intervals)},
+            'end_time': {'$gt': min(start for start, _ in intervals)}
+        }
+        fields = {'property_id': 1, 'tour_time': 1, 'end_time': 1, 'status': 1}
+        return list(self.db.tours.find(query, fields, session=session))
+
+    def _existing_tour_ids(self, object_ids: List[ObjectId]) -> set:
+        """The subset of object_ids that still has a tour document"""
+        if not object_ids:
+            return set()
+        return {tour['_id'] for tour in self.db.tours.find({'_id': {'$in': object_ids}}, {'_id': 1})}
+
+    @guarded()
+    def update_tour_statuses(self, tour_ids: List, status: str, notes: str = None) -> Dict:
+        """Update the status of many tours with one bulk write
+
+        Ids with no tour behind them are reported per item as not found.
+
+        Args:
+            tour_ids: Tour IDs (strings or dicts containing '_id' or 'id')
+            status: New status ('completed', 'cancelled', 'no_show', etc.)
+            notes: Optional notes applied to every tour
+
+        Returns:
+            Dict with 'success', 'modified_count' and per-item 'results'
+        """
+        now = datetime.utcnow()
+        update_data = {
+            'status': status,
+            'updated_at': now,
+            f'{status}_at': now
+        }
+        if notes:
+            update_data[f'{status}_notes'] = notes
+
+        ids, invalid, object_ids = _parse_tour_ids(tour_ids)
+
+        write_errors, modified_count, positions = [], 0, []
+        try:
+            # Only tours that exist are sent, so an unmatched id is reported rather than counted as done
+            existing = self._existing_tour_ids(object_ids)
+            operations = []
+            for index, item_id in enumerate(ids):
+                if index in invalid:
+                    continue
+                if ObjectId(item_id) not in existing:
+                    invalid[index] = 'Tour not found'
+                    continue
+                operations.append(UpdateOne({'_id': ObjectId(item_id)}, {'$set': update_data}))
+                positions.append(index)
+            if operations:
+                modified_count = self.db.tours.bulk_write(operations, ordered=False).modified_count
+        except BulkWriteError as e:
+            write_errors = e.details.get('writeErrors', [])
+            modified_count = e.details.get('nModified', 0)
+        except UNAVAILABLE_ERRORS:
+            raise
+        except Exception as e:
+            logging.error(f"Failed to update tour statuses: {e}")
+            return {'success': False, 'error': str(e), 'results': []}
+
+        results = _bulk_results(ids, invalid, write_errors, positions)
+        return {
+            'success': all(item['success'] for item in results),
+            'modified_count': modified_count,
+            'results': results
+        }
+
+    @guarded()
+    def apply_tour_changes(self, changes: List[Dict]) -> Dict:
+        """Apply many field updates (no schedule changes) in one round trip
+
+        A second read is only needed when some tour was changed underneath.
+
+        Args:
+            changes: Dicts with 'id', 'fields' to set and an optional
+                'expected_updated_at'; a tour changed since then is left alone
+                and reported with 'conflict': True
+
+        Returns:
+            Dict with 'success' and per-item 'results'
+        """
+        # BSON keeps milliseconds, so stamp a value that reads back unchanged
+        now = datetime.utcnow()
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        ids, invalid, operations, positions = [], {}, [], []
+        for index, change in enumerate(changes):
+            try:
+                object_id = _extract_tour_id(change.get('id'))
+                if any(field in change['fields'] for field in SCHEDULE_FIELDS if field != 'status'):
+                    raise ValueError("Schedule changes must go through update_tour")
+            except Exception as e:
+                ids.append(change.get('id'))
+                invalid[index] = str(e)
+                continue
+            ids.append(str(object_id))
+            query = {'_id': object_id}
+            if change.get('expected_updated_at') is not None:
+                query['updated_at'] = change['expected_updated_at']
+            operations.append(UpdateOne(query, {'$set': dict(change['fields'], updated_at=now)}))
+            positions.append(index)
+
+        write_errors, applied = [], None
+        try:
+            if operations:
+                try:
+                    matched = self.db.tours.bulk_write(operations, ordered=False).matched_count
+                except BulkWriteError as e:
+                    write_errors = e.details.get('writeErrors', [])
+                    matched = e.details.get('nMatched', 0)
+                if matched + len(write_errors) < len(operations):
+                    # Some filters matched nothing; the tours carrying this write's
+                    # updated_at are the ones that were applied
+                    sent = [ObjectId(ids[index]) for index in positions]
+                    applied = {
+                        str(tour['_id'])
+                        for tour in self.db.tours.find({'_id': {'$in': sent}, 'updated_at': now}, {'_id': 1})
+                    }
+        except UNAVAILABLE_ERRORS:
+            raise
+        except Exception as e:
+            logging.error(f"Failed to apply tour changes: {e}")
+            return {'success': False, 'error': str(e), 'results': []}
+
+        results = _bulk_results(ids, invalid, write_errors, positions)
+        for index in positions:
+            item = results[index]
+            if item['success'] and applied is not None and item['id'] not in applied:
+                item.update(success=False, error='Tour was changed by someone else', conflict=True)
+        return {
+            'success': all(item['success'] for item in results),
+            'results': results
+        }
+
+    @guarded()
+    def delete_tours(self, tour_ids: List) -> Dict:
+        """Delete many tours in one round trip (plus a lookup and their tombstones)
+
+        Ids with no tour behind them are reported per item as not found and
+        get no tombstone.
+
+        Returns:
+            Dict with 'success', 'deleted_count' and per-item 'results'
+        """
+        ids, invalid, object_ids = _parse_tour_ids(tour_ids)
+
+        deleted_count = 0
+        try:
+            existing = self._existing_tour_ids(object_ids)
+            for index, item_id in enumerate(ids):
+                if index not in invalid and ObjectId(item_id) not in existing:
+                    invalid[index] = 'Tour not found'
+            if existing:
+                deleted_count = self.db.tours.delete_many({'_id': {'$in': list(existing)}}).deleted_count
+                # Tombstone only what was deleted, so sync spreads real deletes only
+                # (a tour another client removed meanwhile is gone either way)
+                now = datetime.utcnow()
+                self.db.tour_tombstones.bulk_write(
+                    [ReplaceOne({'_id': object_id}, {'deleted_at': now}, upsert=True)
+                     for object_id in existing],
+                    ordered=False
+                )
+        except UNAVAILABLE_ERRORS:
+            raise
+        except Exception as e:
+            logging.error(f"Failed to delete tours: {e}")
+            return {'success': False, 'error': str(e), 'results': []}
+
+        results = _bulk_results(ids, invalid, [], [])
+        return {
+            'success': all(item['success'] for item in results),
+            'deleted_count': deleted_count,
+            'results': results
+        }
+
     # Property Methods
+    @guarded()
     def add_property(self, property_data: Dict) -> Dict:
         """Add a new property"""
         try:
@@ -168,6 +851,8 @@ class ApiClient:
                 'success': True,
                 'id': str(result.inserted_id)
             }
+        except UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
             logging.error(f"Failed to add property: {e}")
             return {
@@ -175,6 +860,7 @@ class ApiClient:
                 'error': str(e)
             }
 
+    @guarded(idempotent=True)
     def get_property(self, property_id: str) -> Optional[Dict]:
         """Get a single property by ID"""
         try:
@@ -182,10 +868,13 @@ class ApiClient:
             if property_data:
                 property_data['_id'] = str(property_data['_id'])
             return property_data
+        except UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
             logging.error(f"Failed to get property: {e}")
             return None
 
+    @guarded(idempotent=True)
     def get_properties(self) -> List[Dict]:
         """Get all properties"""
         try:
@@ -193,10 +882,24 @@ class ApiClient:
             for prop in properties:
                 prop['_id'] = str(prop['_id'])
             return properties
+        except UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
             logging.error(f"Failed to get properties: {e}")
             return []
 
+    @guarded(idempotent=True)
+    def get_properties_by_ids(self, property_ids: List[str]) -> List[Dict]:
+        """Get properties (including deleted ones) by id in one query"""
+        object_ids = [ObjectId(property_id) for property_id in property_ids if ObjectId.is_valid(str(property_id))]
+        if not object_ids:
+            return []
+        properties = list(self.db.properties.find({'_id': {'$in': object_ids}}))
+        for prop in properties:
+            prop['_id'] = str(prop['_id'])
+        return properties
+
+    @guarded()
     def update_property(self, property_id: str, property_data: Dict) -> Dict:
         """Update a property"""
         try:
@@ -211,6 +914,8 @@ class ApiClient:
                 'success': True,
                 'modified_count': result.modified_count
             }
+        except UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
             logging.error(f"Failed to update property: {e}")
             return {
@@ -218,12 +923,72 @@ class ApiClient:
                 'error': str(e)
             }
 
+    @guarded()
+    def rename_property(self, property_id: str, address: str) -> Dict:
+        """Change a property's address and repoint every tour that still refers to it
+
+        Tours normally reference the property by ObjectId and follow the
+        rename for free; tours still keyed by the old address or id string
+        are rewritten to the ObjectId in the same transaction, with one
+        update_many on the indexed property_id field.
+
+        Returns:
+            Dict with 'success', 'properties_modified' and 'tours_modified'
+        """
+        try:
+            object_id = ObjectId(property_id)
+            address = address.strip()
+            if not address:
+                return {'success': False, 'error': 'Address is required'}
+            taken = self.db.properties.find_one(
+                {'_id': {'$ne': object_id}, 'address': address, 'status': 'active'},
+                {'_id': 1}
+            )
+            if taken:
+                return {'success': False, 'error': f"Another property already uses the address {address}"}
+
+            def rename(session):
+                current = self.db.properties.find_one({'_id': object_id}, {'address': 1}, session=session)
+                if current is None:
+                    return {'success': False, 'error': 'Property not found'}
+                now = datetime.utcnow()
+                property_result = self.db.properties.update_one(
+                    {'_id': object_id},
+                    {'$set': {'address': address, 'updated_at': now}},
+                    session=session
+                )
+                legacy_refs = [property_id]
+                if current.get('address'):
+                    legacy_refs.append(current['address'])
+                tour_result = self.db.tours.update_many(
+                    {'property_id': {'$in': legacy_refs}},
+                    {'$set': {'property_id': object_id, 'updated_at': now},
+                     '$unset': {'property_address': ''}},
+                    session=session
+                )
+                return {
+                    'success': True,
+                    'properties_modified': property_result.modified_count,
+                    'tours_modified': tour_result.modified_count
+                }
+
+            return self._run_in_transaction(rename, 'property rename')
+        except UNAVAILABLE_ERRORS:
+            raise
+        except Exception as e:
+            logging.error(f"Failed to rename property: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    @guarded()
     def delete_property(self, property_id: str) -> Dict:
         """Delete a property (soft delete)"""
         try:
             # Check for active tours
             active_tours = self.db.tours.count_documents({
-                'property_id': property_id,
+                'property_id': ObjectId(property_id),
                 'status': {'$in': ['scheduled', 'pending']}
             })
             
@@ -247,6 +1012,8 @@ class ApiClient:
                 'success': True,
                 'modified_count': result.modified_count
             }
+        except UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
             logging.error(f"Failed to delete property: {e}")
             return {
@@ -0,0 +1,57 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+from .api_client import ApiClient
+from .config import DATA_WORKER_THREADS, TOURS_PAGE_SIZE
+
+class AsyncApiClient:
+    """asyncio facade over ApiClient
+
+    Every public ApiClient method is available as a coroutine with the same
+    name and arguments (await client.get_tours(), await client.add_tour(data),
+    ...). Calls run on a bounded thread pool sharing the process-wide
+    MongoClient, so independent reads can be started together and awaited
+    with asyncio.gather instead of paying one round trip after another.
+    """
+
+    def __init__(self, api_client: Optional[ApiClient] = None, max_workers: int = DATA_WORKER_THREADS):
+        self.api_client = api_client or ApiClient()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='api')
+
+    def __getattr__(self, name):
+        method = None
+        if not name.startswith('_') and 'api_client' in self.__dict__:
+            method = getattr(self.api_client, name, None)
+        if not callable(method):
+            raise AttributeError(f"{type(self).__name__} has no coroutine method {name!r}")
+
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            # Carry the caller's context (traced action) onto the worker thread
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(self._executor, functools.partial(context.run, method, *args, **kwargs))
+
+        # Cache the wrapper so later lookups skip __getattr__
+        setattr(self, name, call)
+        return call
+
+    async def get_dashboard(self, limit: int = TOURS_PAGE_SIZE) -> Dict:
+        """Dashboard tours (with their counts) and the property list, fetched concurrently"""
+        tours, properties = await asyncio.gather(
+            self.get_dashboard_tours(limit),
+            self.get_properties()
+        )
+        return dict(tours, properties=properties)
+
+    def close(self):
+        """Stop the worker threads (the shared MongoClient stays open)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,119 @@
+import bisect
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional
+from .config import (
+    AVAILABILITY_SLOT_MINUTES, BUSINESS_HOURS, DEFAULT_TOUR_DURATION, WORKING_DAYS
+)
+
+def _day_layout(slot_minutes: int):
+    """Slots per business day and the bitmap of slots blocked by lunch"""
+    slots_per_hour = 60 // slot_minutes
+    day_slots = (BUSINESS_HOURS['end'] - BUSINESS_HOURS['start']) * slots_per_hour
+    lunch_mask = 0
+    if 'lunch_start' in BUSINESS_HOURS:
+        first = (BUSINESS_HOURS['lunch_start'] - BUSINESS_HOURS['start']) * slots_per_hour
+        last = (BUSINESS_HOURS['lunch_end'] - BUSINESS_HOURS['start']) * slots_per_hour
+        lunch_mask = ((1 << (last - first)) - 1) << first
+    return day_slots, lunch_mask
+
+def _free_starts(occupied: int, day_slots: int, span: int) -> int:
+    """Bitmap of slots where `span` consecutive free slots begin
+
+    Bit i of (free >> j) is bit i + j of free, so AND-ing the shifted copies
+    keeps exactly the starts whose whole run is free. Bits past the end of
+    the day are zero in `free`, so tours cannot run past closing.
+    """
+    free = ~occupied & ((1 << day_slots) - 1)
+    starts = free
+    for shift in range(1, span):
+        starts &= free >> shift
+    return starts
+
+def occupancy(booking_index, property_id: str, date_from: date, date_to: date,
+              slot_minutes: int = AVAILABILITY_SLOT_MINUTES,
+              exclude_id: Optional[str] = None) -> Dict[date, int]:
+    """Per-day bitmap of slots taken by active tours (bit 0 = opening time)"""
+    day_start = time(BUSINESS_HOURS['start'])
+    intervals = booking_index.intervals(property_id)
+    low = bisect.bisect_left(intervals, (datetime.combine(date_from, time.min),))
+    high = bisect.bisect_left(intervals, (datetime.combine(date_to + timedelta(days=1), time.min),))
+
+    days: Dict[date, int] = {}
+    slot = timedelta(minutes=slot_minutes)
+    for start, end, tour_id in intervals[low:high]:
+        if tour_id == exclude_id:
+            continue
+        opening = datetime.combine(start.date(), day_start)
+        # Round outwards so a partial slot counts as taken
+        first = max((start - opening) // slot, 0)
+        last = -((opening - end) // slot)
+        if last > first:
+            days[start.date()] = days.get(start.date(), 0) | (((1 << (last - first)) - 1) << first)
+    return days
+
+def find_available_slots(booking_index, property_ids: Iterable[str], date_from: date, date_to: date,
+                         duration: int = DEFAULT_TOUR_DURATION,
+                         slot_minutes: int = AVAILABILITY_SLOT_MINUTES,
+                         not_before: Optional[datetime] = None,
+                         exclude_id: Optional[str] = None) -> Dict[str, Dict[date, List[datetime]]]:
+    """Free tour start times per property and working day
+
+    Respects BUSINESS_HOURS (including the lunch break), WORKING_DAYS and
+    every active tour in the booking index. Each property/day is one integer
+    bitmap, so a month across many properties is a few thousand bit operations.
+
+    Args:
+        booking_index: BookingIndex holding the active tours
+        property_ids: Properties to search
+        date_from: First day to search (inclusive)
+        date_to: Last day to search (inclusive)
+        duration: Tour length in minutes
+        slot_minutes: Granularity of start times
+        not_before: Skip start times before this moment (defaults to now)
+        exclude_id: Tour whose own slot counts as free (rescheduling it)
+
+    Returns:
+        Dict of property id -> date -> sorted start datetimes (days with no room are omitted)
+    """
+    not_before = not_before or datetime.now()
+    day_slots, lunch_mask = _day_layout(slot_minutes)
+    span = -(-duration // slot_minutes)
+    slot = timedelta(minutes=slot_minutes)
+
+    working_days = []
+    day = date_from
+    while day <= date_to:
+        if day.weekday() in WORKING_DAYS:
+            working_days.append(day)
+        day += timedelta(days=1)
+
+    available: Dict[str, Dict[date, List[datetime]]] = {}
+    for property_id in property_ids:
+        taken = occupancy(booking_index, property_id, date_from, date_to, slot_minutes, exclude_id)
+        per_day = {}
+        for day in working_days:
+            starts = _free_starts(taken.get(day, 0) | lunch_mask, day_slots, span)
+            opening = datetime.combine(day, time(BUSINESS_HOURS['start']))
+            times = []
+            while starts:
+                low_bit = starts & -starts
+                start = opening + slot * (low_bit.bit_length() - 1)
+                if start >= not_before:
+                    times.append(start)
+                starts ^= low_bit
+            if times:
+                per_day[day] = times
+        available[property_id] = per_day
+    return available
+
+def first_available(booking_index, property_ids: Iterable[str], date_from: date, date_to: date,
+                    **kwargs) -> Optional[Dict]:
+    """Earliest free slot across the given properties, as {'property_id', 'start'}"""
+    best = None
+    for property_id, per_day in find_available_slots(booking_index, property_ids,
+                                                     date_from, date_to, **kwargs).items():
+        for times in per_day.values():
+            if times and (best is None or times[0] < best['start']):
+                best = {'property_id': property_id, 'start': times[0]}
+            break
+    return best
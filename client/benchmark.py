@@ -0,0 +1,278 @@
+"""Reproducible data-layer benchmarks against a seeded synthetic dataset
+
+    python -m client.benchmark --tours 100000 --properties 500 --output bench.json
+
+Seeds a scratch database (dropped first) on a local mongod, or in process
+with --uri mongomock:// when mongomock is installed, then times the
+ApiClient operations, the sync bootstrap into the store and the dashboard's
+list build. Results are written as JSON keyed by operation so runs from
+different commits can be diffed. Large datasets may need MONGODB_READ_TIMEOUT_SECONDS raised for
+get_tours.
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+from bson import BSON, ObjectId
+import pymongo
+from .api_client import ApiClient
+from .indexes import ensure_indexes
+from .metrics import get_metrics
+from .state_manager import StateManager, tour_document
+from .sync import TourSyncEngine
+
+STREETS = ['Main St', 'Oak Ave', 'Pine Rd', 'Maple Dr', 'Cedar Ln', 'Elm St', 'Lake Blvd', 'Hill Ct']
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Patel', 'Brown', 'Kim', 'Nguyen', 'Lopez']
+STATUS_WEIGHTS = {'scheduled': 0.4, 'completed': 0.4, 'cancelled': 0.15, 'no_show': 0.05}
+INSERT_BATCH_SIZE = 10000
+
+def open_database(uri: str, name: str):
+    """Database handle for the benchmark run (mongomock:// runs in process)"""
+    if uri.startswith('mongomock://'):
+        try:
+            import mongomock
+        except ImportError:
+            raise SystemExit("mongomock is not installed; use a mongod URI instead")
+        return mongomock.MongoClient()[name]
+    return pymongo.MongoClient(uri)[name]
+
+def seed(db, tours: int, properties: int, spare_properties: int, rng: random.Random) -> Dict:
+    """Drop and refill the benchmark collections; returns the ids the benchmarks need"""
+    db.client.drop_database(db.name)
+    now = datetime.utcnow().replace(second=0, microsecond=0)
+
+    property_docs = [{
+        '_id': ObjectId(),
+        'address': f"{index + 1} {rng.choice(STREETS)} #{index}",
+        'status': 'active',
+        'created_at': now
+    } for index in range(properties + spare_properties)]
+    db.properties.insert_many(property_docs)
+    property_ids = [doc['_id'] for doc in property_docs[:properties]]
+
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    scheduled_ids = []
+    batch = []
+    for index in range(tours):
+        tour_time = now + timedelta(minutes=30 * rng.randint(-8760, 8760))
+        status = rng.choices(statuses, weights)[0]
+        doc = {
+            '_id': ObjectId(),
+            'property_id': rng.choice(property_ids),
+            'client_name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            'phone_number': f"555-{rng.randint(0, 9999):04d}",
+            'tour_time': tour_time,
+            'end_time': tour_time + timedelta(minutes=30),
+            'status': status,
+            'created_at': now - timedelta(days=rng.randint(0, 365)),
+            'updated_at': now - timedelta(minutes=rng.randint(0, 525600))
+        }
+        if status == 'scheduled':
+            scheduled_ids.append(str(doc['_id']))
+        batch.append(doc)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            db.tours.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        db.tours.insert_many(batch, ordered=False)
+
+    return {
+        'property_ids': property_ids,
+        'spare_property_ids': [str(doc['_id']) for doc in property_docs[properties:]],
+        'scheduled_ids': scheduled_ids,
+        'start': now
+    }
+
+def measure(func: Callable, iterations: int) -> Dict:
+    """Wall-clock statistics (ms) for calling func(i) for i in range(iterations)
+
+    Calls answering {'success': False} are counted in 'failures' so a
+    fast-failing operation can't pass for a fast one.
+    """
+    samples: List[float] = []
+    failures = 0
+    for i in range(iterations):
+        started = time.perf_counter()
+        result = func(i)
+        samples.append((time.perf_counter() - started) * 1000)
+        failures += int(isinstance(result, dict) and result.get('success') is False)
+    samples.sort()
+    return {
+        'iterations': iterations,
+        'failures': failures,
+        'min_ms': round(samples[0], 3),
+        'median_ms': round(samples[len(samples) // 2], 3),
+        'p95_ms': round(samples[min(int(len(samples) * 0.95), len(samples) - 1)], 3),
+        'mean_ms': round(sum(samples) / len(samples), 3),
+        'max_ms': round(samples[-1], 3)
+    }
+
+def run_benchmarks(api_client: ApiClient, dataset: Dict, repeat: int, rng: random.Random) -> Dict[str, Dict]:
+    """Time each operation; an operation that raises is reported with its error"""
+    far_future = dataset['start'] + timedelta(days=3650)
+    property_ids = dataset['property_ids']
+    status_targets = rng.sample(dataset['scheduled_ids'], min(repeat, len(dataset['scheduled_ids'])))
+    spare = dataset['spare_property_ids']
+    store = StateManager()
+    engine = TourSyncEngine(api_client, store=store)
+
+    def add_tour(i):
+        # One slot per iteration so the conflict check always passes
+        tour_time = far_future + timedelta(hours=i)
+        return api_client.add_tour({
+            'property_id': property_ids[i % len(property_ids)],
+            'client_name': 'Benchmark Client',
+            'phone_number': '555-0000',
+            'tour_time': tour_time,
+            'end_time': tour_time + timedelta(minutes=30)
+        })
+
+    benchmarks = [
+        ('get_properties', lambda i: api_client.get_properties(), repeat),
+        ('get_tours', lambda i: api_client.get_tours(), repeat),
+        ('get_dashboard_tours', lambda i: api_client.get_dashboard_tours(), repeat),
+        ('add_tour', add_tour, repeat),
+        ('update_tour_status', lambda i: api_client.update_tour_status(status_targets[i], 'completed'),
+         len(status_targets)),
+        ('delete_property', lambda i: api_client.delete_property(spare[i]), len(spare)),
+        ('sync.bootstrap', lambda i: engine.refresh(), 1),
+        # What ModernUI.fetch_tours does once the replica is current
+        ('dashboard.fetch_tours', lambda i: store.dashboard_tours(), repeat)
+    ]
+
+    results = {}
+    for name, func, iterations in benchmarks:
+        if not iterations:
+            continue
+        try:
+            results[name] = measure(func, iterations)
+        except Exception as e:
+            results[name] = {'error': str(e)}
+        print(f"{name:<22} {_format(results[name])}", file=sys.stderr)
+
+    store_results = benchmark_state_store([tour_document(state) for state in store.get_tours()], repeat)
+    results.update(store_results['scans'])
+    results['memory'] = store_results['memory']
+    return results
+
+def _retained_bytes(build: Callable[[], object]) -> int:
+    """Memory still held by build()'s result once its temporaries are freed"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+def benchmark_state_store(tours: List[Dict], repeat: int) -> Dict[str, Dict]:
+    """Memory per tour and status-scan speed: replica dicts vs the columnar StateManager store
+
+    Each representation is built from freshly decoded copies so it pays for
+    every object it keeps rather than sharing the caller's.
+    """
+    encoded = [BSON.encode(tour) for tour in tours]
+    count = max(len(encoded), 1)
+
+    def build_replica():
+        return {tour['id']: tour for tour in (BSON(raw).decode() for raw in encoded)}
+
+    def build_store():
+        store = StateManager()
+        store.update_tours(BSON(raw).decode() for raw in encoded)
+        return store
+
+    memory = {
+        'replica_dicts': {'bytes_per_tour': round(_retained_bytes(build_replica) / count, 1)},
+        'state_store': {'bytes_per_tour': round(_retained_bytes(build_store) / count, 1)}
+    }
+    replica = build_replica()
+    store = build_store()
+    scans = {
+        'scan.replica_status_counts': measure(
+            lambda i: Counter(tour.get('status') for tour in replica.values()), repeat),
+        'scan.state_store_status_counts': measure(lambda i: store.count_by_status(), repeat)
+    }
+    for name, result in list(memory.items()) + list(scans.items()):
+        print(f"{name:<30} {_format(result)}", file=sys.stderr)
+    return {'memory': memory, 'scans': scans}
+
+def _format(result: Dict) -> str:
+    if 'bytes_per_tour' in result:
+        return f"{result['bytes_per_tour']:.0f} bytes/tour"
+    if 'error' in result:
+        return f"FAILED: {result['error']}"
+    failures = f", {result['failures']} failed" if result['failures'] else ''
+    return (f"median {result['median_ms']:>9.2f} ms  p95 {result['p95_ms']:>9.2f} ms  "
+            f"(n={result['iterations']}{failures})")
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+def main(argv=None):
+    """Seed the benchmark database, run the benchmarks and write the JSON report"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--uri', default='mongodb://localhost:27017',
+                        help="MongoDB URI, or mongomock:// for an in-process stand-in")
+    parser.add_argument('--db', default='toursync_benchmark', help="Scratch database (dropped and reseeded)")
+    parser.add_argument('--tours', type=int, default=1000)
+    parser.add_argument('--properties', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20, help="Iterations per operation")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-indexes', action='store_true', help="Benchmark without the required indexes")
+    parser.add_argument('--output', default='benchmark_results.json')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    rng = random.Random(args.seed)
+    db = open_database(args.uri, args.db)
+
+    started = time.perf_counter()
+    dataset = seed(db, args.tours, args.properties, args.repeat, rng)
+    if not args.no_indexes:
+        ensure_indexes(db)
+    seed_seconds = time.perf_counter() - started
+    print(f"Seeded {args.tours} tours / {args.properties} properties in {seed_seconds:.1f}s", file=sys.stderr)
+
+    get_metrics().reset()
+    results = run_benchmarks(ApiClient(db=db), dataset, args.repeat, rng)
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'python': platform.python_version(),
+            'pymongo': pymongo.version,
+            'backend': 'mongomock' if args.uri.startswith('mongomock://') else 'mongod',
+            'tours': args.tours,
+            'properties': args.properties,
+            'repeat': args.repeat,
+            'seed': args.seed,
+            'indexes': not args.no_indexes,
+            'seed_seconds': round(seed_seconds, 2)
+        },
+        'memory': results.pop('memory', {}),
+        'results': results,
+        'api_metrics': get_metrics().snapshot()
+    }
+    with open(args.output, 'w') as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Wrote {args.output}", file=sys.stderr)
+    return 1 if any('error' in result or result['failures'] for result in results.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,6 @@
 import os
 from dotenv import load_dotenv
 import logging
-from pymongo import MongoClient
 from pymongo.errors import ConfigurationError, ServerSelectionTimeoutError
 
 # Load environment variables
@@ -15,14 +14,90 @@ DEV_MODE = os.getenv('DEV_MODE', 'True').lower() == 'true'
 MONGODB_URI = os.getenv('MONGODB_URI')
 MONGODB_DB = os.getenv('MONGODB_DB', 'toursync')
 
+# MongoDB connection pool settings (shared by the whole process)
+MONGODB_MAX_POOL_SIZE = int(os.getenv('MONGODB_MAX_POOL_SIZE', '20'))
+MONGODB_MIN_POOL_SIZE = int(os.getenv('MONGODB_MIN_POOL_SIZE', '0'))
+MONGODB_MAX_IDLE_TIME_MS = int(os.getenv('MONGODB_MAX_IDLE_TIME_MS', '300000'))
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGODB_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+MONGODB_CONNECT_TIMEOUT_MS = int(os.getenv('MONGODB_CONNECT_TIMEOUT_MS', '5000'))
+MONGODB_SOCKET_TIMEOUT_MS = int(os.getenv('MONGODB_SOCKET_TIMEOUT_MS', '20000'))
+MONGODB_COMPRESSORS = os.getenv('MONGODB_COMPRESSORS', 'zlib')
+
+# Per-operation deadlines, read retries and the fail-fast circuit breaker
+MONGODB_READ_TIMEOUT_SECONDS = float(os.getenv('MONGODB_READ_TIMEOUT_SECONDS', '5'))
+MONGODB_WRITE_TIMEOUT_SECONDS = float(os.getenv('MONGODB_WRITE_TIMEOUT_SECONDS', '10'))
+READ_RETRY_ATTEMPTS = int(os.getenv('READ_RETRY_ATTEMPTS', '2'))
+RETRY_BACKOFF_SECONDS = float(os.getenv('RETRY_BACKOFF_SECONDS', '0.2'))
+RETRY_BUDGET_RATIO = float(os.getenv('RETRY_BUDGET_RATIO', '0.2'))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '3'))
+CIRCUIT_RESET_SECONDS = float(os.getenv('CIRCUIT_RESET_SECONDS', '15'))
+HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv('HEALTH_CHECK_INTERVAL_SECONDS', '5'))
+
+# Create any missing MongoDB indexes when the app starts
+ENSURE_INDEXES_ON_STARTUP = os.getenv('ENSURE_INDEXES_ON_STARTUP', 'True').lower() == 'true'
+
+# Run pending data migrations (resumable, no-ops once finished) when the app starts
+RUN_MIGRATIONS_ON_STARTUP = os.getenv('RUN_MIGRATIONS_ON_STARTUP', 'True').lower() == 'true'
+
+# Maximum number of tours fetched per list page
+TOURS_PAGE_SIZE = int(os.getenv('TOURS_PAGE_SIZE', '50'))
+
+# Incremental tour sync
+SYNC_POLL_INTERVAL_SECONDS = float(os.getenv('SYNC_POLL_INTERVAL_SECONDS', '15'))
+SYNC_WATERMARK_OVERLAP_SECONDS = float(os.getenv('SYNC_WATERMARK_OVERLAP_SECONDS', '5'))
+TOMBSTONE_RETENTION_DAYS = int(os.getenv('TOMBSTONE_RETENTION_DAYS', '30'))
+
+# On-disk cache used to render instantly and to keep working offline
+LOCAL_CACHE_PATH = os.getenv('LOCAL_CACHE_PATH', os.path.join(os.path.expanduser('~'), '.toursync', 'cache.sqlite3'))
+LOCAL_CACHE_MAX_TOURS = int(os.getenv('LOCAL_CACHE_MAX_TOURS', '50000'))
+
+# Write-behind journal for tour changes (kept apart from the cache, which is disposable)
+WRITE_JOURNAL_PATH = os.getenv('WRITE_JOURNAL_PATH', os.path.join(os.path.expanduser('~'), '.toursync', 'journal.sqlite3'))
+WRITE_FLUSH_DELAY_SECONDS = float(os.getenv('WRITE_FLUSH_DELAY_SECONDS', '1'))
+WRITE_RETRY_INTERVAL_SECONDS = float(os.getenv('WRITE_RETRY_INTERVAL_SECONDS', '15'))
+WRITE_FLUSH_BATCH_SIZE = int(os.getenv('WRITE_FLUSH_BATCH_SIZE', '200'))
+
+# Background data access (keeps the window responsive during round trips)
+DATA_WORKER_THREADS = int(os.getenv('DATA_WORKER_THREADS', '4'))
+TASK_POLL_INTERVAL_MS = int(os.getenv('TASK_POLL_INTERVAL_MS', '50'))
+TASK_IDLE_POLL_INTERVAL_MS = int(os.getenv('TASK_IDLE_POLL_INTERVAL_MS', '100'))
+# Extra time to collect state changes into one UI update (0: the next UI poll)
+STATE_NOTIFY_WINDOW_MS = int(os.getenv('STATE_NOTIFY_WINDOW_MS', '0'))
+
+# Rows built beyond the visible part of virtualized lists (smoother scrolling)
+VIRTUAL_LIST_BUFFER_ROWS = int(os.getenv('VIRTUAL_LIST_BUFFER_ROWS', '5'))
+# Off-screen row widgets kept per list for reuse instead of being destroyed
+VIRTUAL_LIST_POOL_SIZE = int(os.getenv('VIRTUAL_LIST_POOL_SIZE', '32'))
+
+# Per-operation ApiClient metrics; written as JSON when the path ends in .json,
+# Prometheus text otherwise (set the path empty to disable the export)
+METRICS_EXPORT_PATH = os.getenv('METRICS_EXPORT_PATH', os.path.join(os.path.expanduser('~'), '.toursync', 'metrics.prom'))
+METRICS_EXPORT_INTERVAL_SECONDS = float(os.getenv('METRICS_EXPORT_INTERVAL_SECONDS', '60'))
+
+# Driver command tracing per GUI action (slow-command log, repeated-query warnings); off by
+# default since it adds work to every round trip, turn on while investigating
+TRACE_COMMANDS = os.getenv('TRACE_COMMANDS', 'false').lower() == 'true'
+TRACE_SLOW_COMMAND_MS = float(os.getenv('TRACE_SLOW_COMMAND_MS', '250'))
+TRACE_ACTION_HISTORY = int(os.getenv('TRACE_ACTION_HISTORY', '50'))
+
 # Business rules
 BUSINESS_HOURS = {
-    'start': 9,  # 9 AM
-    'end': 17    # 5 PM
+    'start': 9,         # 9 AM
+    'end': 17,          # 5 PM
+    'lunch_start': 12,  # 12 PM
+    'lunch_end': 13     # 1 PM
 }
 
 WORKING_DAYS = [0, 1, 2, 3, 4]  # Monday (0) through Friday (4)
 
+DEFAULT_TOUR_DURATION = 60  # Minutes
+
+# Granularity of suggested tour start times
+AVAILABILITY_SLOT_MINUTES = int(os.getenv('AVAILABILITY_SLOT_MINUTES', '15'))
+
+# Statuses that move a tour off the active list (and free its time slot)
+INACTIVE_TOUR_STATUSES = ('completed', 'cancelled', 'no_show')
+
 # Logging configuration
 logging.basicConfig(
     level=logging.INFO,
@@ -30,10 +105,10 @@ logging.basicConfig(
 )
 
 def get_database():
-    """Get MongoDB database connection"""
+    """Get MongoDB database connection from the shared pool"""
+    from .database import get_database as get_shared_database
     try:
-        client = MongoClient(MONGODB_URI)
-        return client[MONGODB_DB]
+        return get_shared_database()
     except (ConfigurationError, ServerSelectionTimeoutError) as e:
         logging.error(f"Failed to connect to MongoDB Atlas: {e}")
         raise
@@ -48,8 +123,8 @@ def validate_config():
 
     try:
         # Test database connection
-        db = get_database()
-        db.command('ping')
+        from .database import get_connection_manager
+        get_connection_manager().ping()
         logging.info("Successfully connected to MongoDB Atlas")
     except Exception as e:
         logging.error(f"Failed to connect to MongoDB Atlas: {e}")
@@ -0,0 +1,128 @@
+import bisect
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from .config import INACTIVE_TOUR_STATUSES
+from .tour_schema import tour_interval
+
+def blocks_slot(tour: Dict) -> bool:
+    """Only scheduled (active) tours hold their time slot"""
+    return tour.get('status') not in INACTIVE_TOUR_STATUSES
+
+class BookingIndex:
+    """Per-property sorted interval index for double-booking checks
+
+    Properties are keyed by their id string, so ObjectIds and strings match.
+    Each property keeps its tours as (start, end, tour_id) sorted by start,
+    plus the longest duration seen. Any interval overlapping [start, end)
+    must begin in (start - longest, end), so an overlap query is two binary
+    searches plus the handful of neighbours in that window.
+
+    Sync refreshes update the index from worker threads while the UI
+    queries it, so every method holds the index lock.
+    """
+
+    def __init__(self, tours: Iterable[Dict] = ()):
+        self._lock = threading.RLock()
+        self._intervals: Dict[str, List[Tuple[datetime, datetime, str]]] = {}
+        self._longest: Dict[str, timedelta] = {}
+        self._entries: Dict[str, Tuple[str, Tuple[datetime, datetime, str]]] = {}
+        self.rebuild(tours)
+
+    def rebuild(self, tours: Iterable[Dict]):
+        """Replace the index contents with the given tours"""
+        with self._lock:
+            self._intervals = {}
+            self._longest = {}
+            self._entries = {}
+            for tour in tours:
+                self.add(tour)
+
+    def add(self, tour: Dict):
+        """Index (or re-index) one tour document; inactive or undated tours are dropped"""
+        self._index(tour.get('id') or str(tour.get('_id')), tour.get('property_id'),
+                    tour_interval(tour), blocks_slot(tour))
+
+    def add_record(self, state):
+        """Index (or re-index) one TourState from the store"""
+        interval = (state.tour_time, state.end_time) if state.tour_time else None
+        self._index(state.id, state.property_id, interval,
+                    state.status.value not in INACTIVE_TOUR_STATUSES)
+
+    def _index(self, tour_id: str, property_id, interval: Optional[Tuple[datetime, datetime]],
+               active: bool):
+        with self._lock:
+            self.remove(tour_id)
+            if interval is None or not property_id or not active:
+                return
+            property_id = str(property_id)
+
+            entry = (interval[0], interval[1], tour_id)
+            bisect.insort(self._intervals.setdefault(property_id, []), entry)
+            length = interval[1] - interval[0]
+            if length > self._longest.get(property_id, timedelta(0)):
+                self._longest[property_id] = length
+            self._entries[tour_id] = (property_id, entry)
+
+    def remove(self, tour_id: str):
+        """Drop one tour from the index if present"""
+        with self._lock:
+            found = self._entries.pop(tour_id, None)
+            if found is None:
+                return
+            property_id, entry = found
+            intervals = self._intervals[property_id]
+            index = bisect.bisect_left(intervals, entry)
+            if index < len(intervals) and intervals[index] == entry:
+                del intervals[index]
+
+    def find_conflicts(self, property_id, start: datetime, end: datetime,
+                       exclude_id: Optional[str] = None) -> List[str]:
+        """Ids of active tours at the property overlapping [start, end)"""
+        property_id = str(property_id)
+        with self._lock:
+            intervals = self._intervals.get(property_id)
+            if not intervals:
+                return []
+            earliest = start - self._longest[property_id]
+            low = bisect.bisect_right(intervals, (earliest,))
+            high = bisect.bisect_left(intervals, (end,))
+            window = intervals[low:high]
+        return [
+            tour_id for other_start, other_end, tour_id in window
+            if other_end > start and tour_id != exclude_id
+        ]
+
+    def conflicts_for(self, tour: Dict, exclude_id: Optional[str] = None) -> List[str]:
+        """Ids of active tours clashing with a (proposed) tour"""
+        interval = tour_interval(tour)
+        if interval is None or not tour.get('property_id'):
+            return []
+        return self.find_conflicts(tour['property_id'], *interval, exclude_id=exclude_id)
+
+    def intervals(self, property_id) -> List[Tuple[datetime, datetime, str]]:
+        """Sorted (start, end, tour_id) entries for one property"""
+        with self._lock:
+            return list(self._intervals.get(str(property_id), []))
+
+    def attach(self, sync_engine):
+        """Build from a sync engine's replica (TourState records) and follow its change sets"""
+        with self._lock:
+            self.rebuild(())
+            for state in sync_engine.get_tours():
+                self.add_record(state)
+
+        def apply_changes(changes):
+            try:
+                for tour_id in changes['removed']:
+                    self.remove(tour_id)
+                for tour_id in changes['upserted']:
+                    state = sync_engine.get_tour(tour_id)
+                    if state is not None:
+                        self.add_record(state)
+            except Exception as e:
+                logging.error(f"Failed to update booking index: {e}")
+
+        sync_engine.add_listener(apply_changes)
+        return self
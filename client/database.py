@@ -1,21 +1,102 @@
 from pymongo import MongoClient
+import atexit
 import logging
-from .config import MONGODB_URI, MONGODB_DB
+import threading
+from typing import Optional
+from .config import (
+    MONGODB_URI, MONGODB_DB, MONGODB_MAX_POOL_SIZE, MONGODB_MIN_POOL_SIZE,
+    MONGODB_MAX_IDLE_TIME_MS, MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+    MONGODB_CONNECT_TIMEOUT_MS, MONGODB_SOCKET_TIMEOUT_MS, MONGODB_COMPRESSORS,
+    TRACE_COMMANDS
+)
+from .tracing import get_tracer
+
+class ConnectionManager:
+    """Owns the single pooled MongoClient shared by the whole process"""
+
+    def __init__(self, uri: str = None, db_name: str = None, **client_options):
+        self.uri = uri or MONGODB_URI
+        self.db_name = db_name or MONGODB_DB
+        self.client_options = {
+            'maxPoolSize': MONGODB_MAX_POOL_SIZE,
+            'minPoolSize': MONGODB_MIN_POOL_SIZE,
+            'maxIdleTimeMS': MONGODB_MAX_IDLE_TIME_MS,
+            'serverSelectionTimeoutMS': MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            'connectTimeoutMS': MONGODB_CONNECT_TIMEOUT_MS,
+            'socketTimeoutMS': MONGODB_SOCKET_TIMEOUT_MS,
+            'appname': 'TourSync'
+        }
+        if MONGODB_COMPRESSORS:
+            self.client_options['compressors'] = MONGODB_COMPRESSORS
+        if TRACE_COMMANDS:
+            self.client_options['event_listeners'] = [get_tracer()]
+        self.client_options.update(client_options)
+
+        self._client: Optional[MongoClient] = None
+        self._verified = False
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> MongoClient:
+        """Return the shared client, creating it on first use"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = MongoClient(self.uri, **self.client_options)
+        return self._client
+
+    def get_database(self, name: str = None):
+        """Get a database handle backed by the shared pool"""
+        return self.client[name or self.db_name]
+
+    def ping(self, force: bool = False) -> None:
+        """Verify the connection once; later calls are free unless forced"""
+        if self._verified and not force:
+            return
+        self.get_database().command('ping')
+        self._verified = True
+
+    def close(self) -> None:
+        """Close the pool and its monitor threads"""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+            self._client = None
+            self._verified = False
+
+_manager: Optional[ConnectionManager] = None
+_manager_lock = threading.Lock()
+
+def get_connection_manager() -> ConnectionManager:
+    """Get the process-wide connection manager"""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ConnectionManager()
+                atexit.register(_manager.close)
+    return _manager
+
+def get_client() -> MongoClient:
+    """Get the shared MongoClient"""
+    return get_connection_manager().client
 
 def init_mongodb():
     """Initialize MongoDB connection"""
     try:
-        client = MongoClient(MONGODB_URI)
-        db = client[MONGODB_DB]
-        # Test the connection
-        db.command('ping')
+        manager = get_connection_manager()
+        manager.ping()
         logging.info("MongoDB Atlas connection successful")
-        return db
+        return manager.get_database()
     except Exception as e:
         logging.error(f"Failed to connect to MongoDB Atlas: {e}")
         raise
 
 def get_database():
     """Get MongoDB database instance"""
-    client = MongoClient(MONGODB_URI)
-    return client[MONGODB_DB]
\ No newline at end of file
+    return get_connection_manager().get_database()
+
+def close_mongodb():
+    """Close the shared MongoDB client"""
+    if _manager is not None:
+        _manager.close()
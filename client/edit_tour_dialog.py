@@ -2,25 +2,24 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 import tkcalendar
+from .availability import find_available_slots
+from .config import BUSINESS_HOURS, DEFAULT_TOUR_DURATION, WORKING_DAYS
+from .tour_schema import tour_length
 
 class EditTourDialog:
-    def __init__(self, parent, api_client, tour_id, refresh_callback):
+    def __init__(self, parent, api_client, tour_id, refresh_callback, booking_index=None):
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Edit Tour")
         self.api_client = api_client
         self.tour_id = tour_id
         self.refresh_callback = refresh_callback
+        self.booking_index = booking_index
         
-        # Define business hours (24-hour format)
-        self.business_hours = {
-            'start': 9,     # 9 AM
-            'end': 17,      # 5 PM
-            'lunch_start': 12,  # 12 PM
-            'lunch_end': 13     # 1 PM
-        }
+        # Define business hours (24-hour format, including the lunch break)
+        self.business_hours = BUSINESS_HOURS
         
         # Define working days (0 = Monday, 6 = Sunday)
-        self.working_days = range(0, 5)  # Monday to Friday
+        self.working_days = WORKING_DAYS
         
         # Fetch tour data
         self.tour_data = self.api_client.get_tour(tour_id)
@@ -95,6 +94,21 @@ class EditTourDialog:
         
         return available_hours
 
+    def get_available_times(self, date):
+        """Returns the open start times (12-hour format) for this tour's property on a date"""
+        property_id = self.tour_data.get('property_id')
+        if self.booking_index is None or not property_id:
+            return []
+        
+        # This tour's own slot counts as free so it can be moved within its current window;
+        # the shared index is only read, sync threads keep it current
+        property_id = str(property_id)
+        length = tour_length(self.tour_data)
+        duration = int(length.total_seconds() // 60) if length else DEFAULT_TOUR_DURATION
+        slots = find_available_slots(self.booking_index, [property_id], date, date, duration=duration,
+                                     exclude_id=str(self.tour_data['_id']))
+        return [start.strftime('%I:%M %p') for start in slots[property_id].get(date, [])]
+
     def save_changes(self):
         try:
             # Get the new date and time
@@ -117,8 +131,8 @@ class EditTourDialog:
             new_time = datetime.combine(date, datetime.min.time().replace(hour=hour, minute=minute))
             
             # Update tour
-            result = self.api_client.update_tour(self.tour_id, {'tour_time': new_time.isoformat()})
-            if result:
+            result = self.api_client.update_tour(self.tour_id, {'tour_time': new_time})
+            if result['success']:
                 self.refresh_callback()
                 self.dialog.destroy()
                 messagebox.showinfo("Success", "Tour updated successfully")
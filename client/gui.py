@@ -1,18 +1,58 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-from datetime import datetime
+from datetime import datetime, timedelta
+import asyncio
+import logging
 import tkcalendar
+from pymongo.errors import PyMongoError
 from .api_client import ApiClient
+from .async_api_client import AsyncApiClient
+from .config import DEFAULT_TOUR_DURATION, HEALTH_CHECK_INTERVAL_SECONDS, INACTIVE_TOUR_STATUSES, TRACE_COMMANDS
+from .state_manager import insert_by_start, tour_document, tour_state
+from .sync import TourSyncEngine
+from .conflicts import BookingIndex
+from .availability import find_available_slots
+from .tour_schema import format_tour_time
+from .tour_store import to_micros
+from .properties import PropertyResolver
+from .tasks import TaskRunner
+from .write_queue import WriteQueue
+from .resilience import UNAVAILABLE_ERRORS, is_unavailable, run_guarded
+from .metrics import get_metrics
+from .virtual_list import VirtualList
+from .tracing import get_tracer, traced_action
 
 class ModernUI(ttk.Frame):
-    def __init__(self, parent, state_manager):
+    def __init__(self, parent, state_manager, cache=None):
         super().__init__(parent)
         self.parent = parent
         self.state_manager = state_manager
+        self.cache = cache
+        
+        # Without a cache the caller has already connected to Atlas;
+        # with one we render cached data until main() reports the connection
+        self.connected = cache is None
         
         # Initialize API client
         self.api_client = ApiClient()  # Uses default base_url
         
+        # Database calls run on worker threads so the window never blocks
+        self.tasks = TaskRunner(parent)
+        
+        # Local tour replica, kept in the store the UI renders from; refreshes only pull what changed
+        self.sync_engine = TourSyncEngine(self.api_client, cache, store=state_manager)
+        
+        # Per-property interval index for instant double-booking checks
+        self.booking_index = BookingIndex().attach(self.sync_engine)
+        
+        # Tour changes land locally at once and reach Atlas in the background
+        self.write_queue = WriteQueue(self.api_client, self.sync_engine)
+        
+        # Tours reference properties by id; cards resolve addresses from memory
+        self.property_resolver = PropertyResolver(self.api_client)
+        if cache is not None:
+            self.property_resolver.update(cache.get_properties())
+        
         # Modern color scheme with burgundy
         self.colors = {
             'bg': '#F5F5F5',           # Light gray background
@@ -41,14 +81,169 @@ class ModernUI(ttk.Frame):
         self.setup_styles()
         self.create_layout()
         
+        # The dashboard reads from the indexed store and patches only what its change
+        # sets touch; changes are batched and delivered on the Tk thread (the cached
+        # replica is loaded into the store by the first fetch_tours, on a worker)
+        self.state_manager.set_dispatcher(self.tasks.post)
+        self.state_manager.add_observer(self.apply_state_changes, entities=('tours',))
+        
         # Show default view
         self.show_dashboard()
+
+    def set_connected(self, connected):
+        """Switch between live and offline (cached, read-only) mode"""
+        self.connected = connected
+        self.update_ui()
+
+    def ensure_online(self):
+        """Refuse changes while offline; returns True when writes are allowed"""
+        if not self.connected:
+            messagebox.showwarning(
+                "Offline",
+                "TourSync can't reach the server. Until the connection returns only tour changes "
+                "(scheduling, edits and status updates) are saved; they sync automatically."
+            )
+        return self.connected
+
+    def start_health_monitor(self):
+        """Follow the data layer's health so the UI shows offline instead of hanging"""
+        self._probing = False
+        
+        def probe_failed(error):
+            self._probing = False
+        
+        def check():
+            self.report_write_conflicts()
+            if self.connected and not self.api_client.available:
+                self.mark_offline()
+            elif not self.connected and not self._probing:
+                # A cheap probe; fails fast while the circuit breaker is open
+                self._probing = True
+                self.tasks.submit(self.api_client.ping,
+                                  on_success=lambda ok: self.mark_online(),
+                                  on_error=probe_failed)
+            self.parent.after(int(HEALTH_CHECK_INTERVAL_SECONDS * 1000), check)
+        
+        self.parent.after(int(HEALTH_CHECK_INTERVAL_SECONDS * 1000), check)
+
+    def report_write_conflicts(self):
+        """Tell the user about queued tour changes Atlas refused"""
+        conflicts = self.write_queue.pop_conflicts()
+        if not conflicts:
+            return
+        details = '\n'.join(f"{conflict['tour_id']}: {conflict['error']}" for conflict in conflicts[:10])
+        messagebox.showwarning(
+            "Changes Not Saved",
+            f"{len(conflicts)} tour change(s) could not be saved and were undone:\n{details}"
+        )
+        if hasattr(self, 'active_tours_list') and self.active_tours_list.winfo_exists():
+            self.load_tours()
+
+    def mark_offline(self):
+        """Switch to cached, read-only mode without leaving the current screen"""
+        if not self.connected:
+            return
+        self.connected = False
+        if hasattr(self, 'content') and self.content.winfo_exists():
+            self.show_offline_notice()
+
+    def mark_online(self):
+        """Leave offline mode and refresh whichever list is on screen"""
+        self._probing = False
+        if self.connected:
+            return
+        self.connected = True
+        notice = getattr(self, 'offline_notice', None)
+        if notice is not None and notice.winfo_exists():
+            notice.destroy()
+        if hasattr(self, 'active_tours_list') and self.active_tours_list.winfo_exists():
+            self.load_tours()
+        if hasattr(self, 'tours_list') and self.tours_list.winfo_exists():
+            self.load_tour_page()
+        if hasattr(self, 'properties_list') and self.properties_list.winfo_exists():
+            self.load_properties()
+
+    def run_task(self, func, *args, action='load data', on_success=None, busy=None):
+        """Run a blocking call on a worker thread; on_success(result) runs back on the Tk thread
         
-        # Register as observer for state changes
-        self.state_manager.add_observer(self.update_ui)
+        Args:
+            func: Blocking callable, usually an ApiClient method
+            action: Used in the error message ("Failed to <action>")
+            on_success: Called with func's return value
+            busy: Button to disable until the call finishes (prevents double submits)
+        """
+        if busy is not None:
+            busy.configure(state='disabled')
+        
+        def release():
+            if busy is not None and busy.winfo_exists():
+                busy.configure(state='normal')
+        
+        def succeeded(result):
+            release()
+            if on_success:
+                on_success(result)
+        
+        def failed(error):
+            release()
+            logging.error(f"Failed to {action}: {error}")
+            if is_unavailable(error):
+                self.mark_offline()
+                messagebox.showwarning(
+                    "Offline",
+                    f"Couldn't {action}: TourSync can't reach the server. Please try again once it's back."
+                )
+                return
+            messagebox.showerror("Error", f"Failed to {action}: {str(error)}")
+        
+        return self.tasks.submit(func, *args, on_success=succeeded, on_error=failed)
+
+    def run_write(self, func, *args, action, on_done=None, busy=None):
+        """run_task for ApiClient writes that report {'success': ..., 'error': ...}"""
+        def finished(result):
+            if not result.get('success'):
+                messagebox.showerror("Error", f"Failed to {action}: {result.get('error', 'Unknown error')}")
+                return
+            if on_done:
+                on_done(result)
+        
+        return self.run_task(func, *args, action=action, on_success=finished, busy=busy)
+
+    def apply_state_changes(self, changes):
+        """Patch the tour lists with a batch of tour changes instead of rebuilding them
+        
+        Only the changed tours are taken out and re-inserted in start order,
+        and the lists keep every other card, so one status change touches
+        one card.
+        """
+        if self.current_view == 'tours':
+            if hasattr(self, 'tours_list') and self.tours_list.winfo_exists():
+                self.patch_tour_page(changes['tours'])
+            return
+        if self.current_view != 'dashboard':
+            return
+        if not (hasattr(self, 'active_tours_list') and self.active_tours_list.winfo_exists()):
+            return
+        if getattr(self, '_tours_request', None) is not None:
+            # The load in flight may have read the store before this batch; reload after it
+            self._tours_stale = True
+            return
+        
+        tours = changes['tours']
+        touched = set(tours.added) | set(tours.updated) | set(tours.removed)
+        lists = {False: self.active_tours_list, True: self.inactive_tours_list}
+        items = {inactive: [tour for tour in tour_list.items if tour.id not in touched]
+                 for inactive, tour_list in lists.items()}
+        for tour_id in tours.added + tours.updated:
+            tour = self.state_manager.get_tour(tour_id)
+            if tour is None:
+                continue
+            inactive = tour.status.value in INACTIVE_TOUR_STATUSES
+            insert_by_start(items[inactive], tour, descending=inactive)
+        self.show_tour_lists(items[False], items[True])
 
     def update_ui(self):
-        """Update UI when state changes"""
+        """Rebuild the current view (connection changes and other global state)"""
         current_view = self.current_view
         if current_view:
             # Refresh the current view
@@ -73,6 +268,7 @@ class ModernUI(ttk.Frame):
         self.time_var = tk.StringVar()
         self.current_view = None
         self.nav_buttons = []
+        self.selected_ids = set()  # tour ids ticked for bulk actions (on screen or not)
 
     def setup_styles(self):
         """Setup sophisticated UI styles"""
@@ -321,6 +517,12 @@ class ModernUI(ttk.Frame):
         for widget in self.content.winfo_children():
             widget.destroy()
 
+    def clear_frame(self, frame):
+        """Remove every child widget of a list container"""
+        for widget in frame.winfo_children():
+            if widget.winfo_exists():
+                widget.destroy()
+
     def create_page_header(self, title, description=None):
         """Create consistent page header"""
         header_frame = ttk.Frame(self.content, style='Card.TFrame')
@@ -335,6 +537,7 @@ class ModernUI(ttk.Frame):
                      text=description,
                      style='Body.TLabel').pack(anchor='w', pady=(10, 0))
 
+    @traced_action()
     def show_dashboard(self):
         """Show dashboard view"""
         self.current_view = 'dashboard'
@@ -349,6 +552,8 @@ class ModernUI(ttk.Frame):
         tab_control = ttk.Notebook(container, style='Custom.TNotebook')
         tab_control.pack(fill='both', expand=True, padx=20, pady=20)
         
+        self.dashboard_tabs = tab_control
+        
         # Active Tours Tab
         active_tab = ttk.Frame(tab_control, style='Card.TFrame')
         tab_control.add(active_tab, text='ACTIVE TOURS')
@@ -357,17 +562,30 @@ class ModernUI(ttk.Frame):
         inactive_tab = ttk.Frame(tab_control, style='Card.TFrame')
         tab_control.add(inactive_tab, text='PAST TOURS')
         
-        # Create tour list containers with proper styling
-        self.active_tours_list = ttk.Frame(active_tab, style='Card.TFrame')
+        # Bulk actions for the selected active tours
+        self.create_bulk_actions_bar(active_tab)
+        
+        # Tour lists only build the cards in view, however many tours there are
+        self.active_tours_list = VirtualList(active_tab,
+                                             render=lambda parent, tour: self.create_tour_card(parent, tour),
+                                             update=self.update_tour_card,
+                                             key=lambda tour: tour.id,
+                                             row_gap=10, background=self.colors['white'])
         self.active_tours_list.pack(fill='both', expand=True, padx=20, pady=20)
         
-        self.inactive_tours_list = ttk.Frame(inactive_tab, style='Card.TFrame')
+        self.inactive_tours_list = VirtualList(inactive_tab,
+                                               render=lambda parent, tour: self.create_tour_card(
+                                                   parent, tour, show_status=True),
+                                               update=self.update_tour_card,
+                                               key=lambda tour: tour.id,
+                                               row_gap=10, background=self.colors['white'])
         self.inactive_tours_list.pack(fill='both', expand=True, padx=20, pady=20)
         
         # Load tours
         self.load_tours()
 
-    def show_tours(self):
+    @traced_action()
+    def show_tours(self, refresh=True):
         """Show tours view with management functionality"""
         self.current_view = 'tours'
         self.clear_content()
@@ -389,16 +607,125 @@ class ModernUI(ttk.Frame):
         )
         schedule_btn.pack(side='left')
         
-        # Tours list
-        self.tours_list = ttk.Frame(container, style='Card.TFrame')
-        self.tours_list.pack(fill='both', expand=True, padx=20, pady=(0, 20))
+        # Active tours, soonest first, one keyset page from Atlas at a time
+        self.tours_list = VirtualList(container,
+                                      render=lambda parent, tour: self.create_tour_card(parent, tour),
+                                      update=self.update_tour_card,
+                                      key=lambda tour: tour.id,
+                                      row_gap=10, background=self.colors['white'])
+        self.tours_list.pack(fill='both', expand=True, padx=20, pady=(0, 10))
+        
+        self.more_tours_btn = self.create_styled_button(
+            container,
+            "Load More",
+            'Secondary.TButton',
+            lambda: self.load_tour_page(self.tours_cursor)
+        )
+        self.more_tours_btn.pack(pady=(0, 20))
         
-        self.load_tours()
+        self.selected_ids = set()
+        self.tours_cursor = None
+        self.load_tour_page(remote=refresh)
+
+    def load_tour_page(self, cursor=None, remote=True):
+        """Show the first (or, given a cursor, the next) page of the Tours view
+        
+        Args:
+            cursor: next_cursor from the previous page; None starts over
+            remote: Query Atlas; False lists every active tour from the local
+                store (after a local change, so it shows at once)
+        """
+        self._tours_page_request = request = object()
+        if cursor is None:
+            self.tours_list.show_placeholder(lambda parent: self.show_loading(parent, "Loading tours..."))
+        self.more_tours_btn.configure(state='disabled')
+        
+        def loaded(page):
+            if request is not self._tours_page_request or not self.tours_list.winfo_exists():
+                return
+            self._tours_page_request = None
+            if not page['connected']:
+                self.mark_offline()
+            # Tours patched in while the page loaded are already on screen
+            fresh = {tour.id for tour in page['tours']}
+            earlier = [tour for tour in self.tours_list.items if tour.id not in fresh] if cursor else []
+            self.tours_cursor = page['next_cursor']
+            self.show_tour_page(earlier + page['tours'])
+        
+        def failed(error):
+            logging.error(f"Failed to load tours: {error}")
+            if request is self._tours_page_request and self.tours_list.winfo_exists():
+                self._tours_page_request = None
+                self.more_tours_btn.configure(state='normal' if self.tours_cursor else 'disabled')
+        
+        self.tasks.submit(self.fetch_tour_page, cursor, remote and self.connected,
+                          on_success=loaded, on_error=failed)
+
+    def fetch_tour_page(self, cursor=None, remote=True):
+        """One page of active tours as store records (runs on a worker thread)
+        
+        Atlas sorts and pages them (query_tours); queued local changes are
+        layered on top. Offline, or when Atlas fails, every active tour
+        comes from the local store instead.
+        
+        Returns:
+            Dict with 'tours', 'next_cursor' and 'connected'
+        """
+        connected = self.connected
+        if remote:
+            try:
+                result = self.api_client.query_tours(exclude_statuses=INACTIVE_TOUR_STATUSES, cursor=cursor)
+                if result['success']:
+                    tours = [tour_state(self.write_queue.overlay(tour)) for tour in result['tours']]
+                    tours = [tour for tour in tours
+                             if tour is not None and tour.status.value not in INACTIVE_TOUR_STATUSES]
+                    self.property_resolver.prefetch(tour.property_id for tour in tours)
+                    return {'tours': tours, 'next_cursor': result['next_cursor'], 'connected': True}
+            except PyMongoError as e:
+                logging.error(f"Tour page query failed, showing cached tours: {e}")
+                connected = False
+        self.sync_engine.load_cache()
+        tours = self.state_manager.dashboard_tours()['active']
+        return {'tours': tours, 'next_cursor': None, 'connected': connected}
+
+    def show_tour_page(self, tours):
+        """Put tours in the Tours view list; Load More only shows while Atlas has more"""
+        if tours:
+            self.tours_list.set_items(tours)
+        else:
+            self.tours_list.show_placeholder(lambda parent: ttk.Label(
+                parent, text="No active tours", style='Body.TLabel').pack(pady=20))
+        self.more_tours_btn.configure(state='normal' if self.tours_cursor else 'disabled')
+
+    def patch_tour_page(self, tours):
+        """Apply a store change set to the Tours view's loaded pages
+        
+        Changed tours are re-inserted in start order; tours past the last
+        loaded one are left to arrive with their page.
+        """
+        loaded = self.tours_list.items
+        if not loaded and self._tours_page_request is not None:
+            return  # The first page is still loading and will include these changes
+        touched = set(tours.added) | set(tours.updated) | set(tours.removed)
+        last = (to_micros(loaded[-1].tour_time), loaded[-1].id) if self.tours_cursor and loaded else None
+        items = [tour for tour in loaded if tour.id not in touched]
+        for tour_id in tours.added + tours.updated:
+            tour = self.state_manager.get_tour(tour_id)
+            if tour is None or tour.status.value in INACTIVE_TOUR_STATUSES:
+                continue
+            if last is not None and (to_micros(tour.tour_time), tour.id) > last:
+                continue
+            insert_by_start(items, tour)
+        self.show_tour_page(items)
 
     def create_tour_card(self, parent, tour, show_status=False):
-        """Create a card displaying tour information"""
+        """Create a card displaying tour information (placed by the caller)
+        
+        The card keeps its labels and the tour it shows, so update_tour_card
+        can point it at another tour without rebuilding any widgets.
+        """
         card = ttk.Frame(parent, style='Card.TFrame')
-        card.pack(fill='x', pady=(0, 10))
+        card.show_status = show_status
         
         # Tour info
         info_frame = ttk.Frame(card, style='Card.TFrame')
@@ -406,47 +733,30 @@ class ModernUI(ttk.Frame):
         
         # Add status label for inactive tours with styled badge
         if show_status:
-            status = tour.get('status', 'unknown').upper()
-            status_colors = {
-                'COMPLETED': {'fg': '#2D5A27', 'bg': '#E8F5E9'},  # Green
-                'CANCELLED': {'fg': '#C62828', 'bg': '#FFEBEE'},  # Red
-                'NO_SHOW': {'fg': '#F57C00', 'bg': '#FFF3E0'}    # Orange
-            }
-            
             status_frame = ttk.Frame(info_frame)
             status_frame.pack(anchor='w', pady=(0, 10))
             
-            status_label = ttk.Label(
+            card.status_label = ttk.Label(
                 status_frame,
-                text=status,
                 style='Status.TLabel'
             )
-            status_label.pack(side='left')
-            
-            # Apply status-specific colors
-            colors = status_colors.get(status, {'fg': self.colors['text'], 'bg': self.colors['border']})
-            status_label.configure(foreground=colors['fg'], background=colors['bg'])
+            card.status_label.pack(side='left')
         
         # Property address with larger font
-        ttk.Label(info_frame,
-                 text=f"{tour.get('property_address', 'No address')}",
-                 style='CardTitle.TLabel').pack(anchor='w', pady=(0, 5))
+        card.address_label = ttk.Label(info_frame, style='CardTitle.TLabel')
+        card.address_label.pack(anchor='w', pady=(0, 5))
         
         # Tour details in a grid-like layout
         details_frame = ttk.Frame(info_frame, style='Card.TFrame')
         details_frame.pack(fill='x', pady=(5, 0))
         
         # Date and time
-        date_time = f" {tour.get('date', 'No date')} at {tour.get('time', 'No time')}"
-        ttk.Label(details_frame,
-                 text=date_time,
-                 style='CardBody.TLabel').pack(anchor='w')
+        card.time_label = ttk.Label(details_frame, style='CardBody.TLabel')
+        card.time_label.pack(anchor='w')
         
         # Client info with icon
-        client = f"👤 {tour.get('client_name', 'No name')}"
-        ttk.Label(details_frame,
-                 text=client,
-                 style='CardBody.TLabel').pack(anchor='w', pady=(5, 0))
+        card.client_label = ttk.Label(details_frame, style='CardBody.TLabel')
+        card.client_label.pack(anchor='w', pady=(5, 0))
         
         # Only show action buttons for active tours
         if not show_status:
@@ -456,12 +766,12 @@ class ModernUI(ttk.Frame):
             actions_frame = ttk.Frame(card, style='Card.TFrame')
             actions_frame.pack(fill='x', padx=15, pady=10)
             
-            # Action buttons (using existing button styles)
+            # Action buttons (using existing button styles); they act on whichever tour the card shows
             buttons = [
-                ("Edit", 'Secondary.TButton', lambda t=tour: self.edit_tour(t)),
-                ("Complete", 'Primary.TButton', lambda t=tour: self.complete_tour(t)),
-                ("Cancel", 'Primary.TButton', lambda t=tour: self.cancel_tour(t)),
-                ("No Show", 'Primary.TButton', lambda t=tour: self.mark_no_show(t))
+                ("Edit", 'Secondary.TButton', lambda: self.edit_tour(card.tour)),
+                ("Complete", 'Primary.TButton', lambda: self.complete_tour(card.tour)),
+                ("Cancel", 'Primary.TButton', lambda: self.cancel_tour(card.tour)),
+                ("No Show", 'Primary.TButton', lambda: self.mark_no_show(card.tour))
             ]
             
             for text, style, command in buttons:
@@ -473,80 +783,189 @@ class ModernUI(ttk.Frame):
                 actions_frame,
                 text="Delete",
                 style='Primary.TButton',
-                command=lambda t=tour: self.delete_tour(t)
+                command=lambda: self.delete_tour(card.tour)
             )
             delete_btn.pack(side='right')
-
-    def load_tours(self):
-        """Load and display tours"""
-        try:
-            # Safely clear existing tours
-            if hasattr(self, 'active_tours_list') and self.active_tours_list.winfo_exists():
-                for widget in self.active_tours_list.winfo_children():
-                    if widget.winfo_exists():
-                        widget.destroy()
-                        
-            if hasattr(self, 'inactive_tours_list') and self.inactive_tours_list.winfo_exists():
-                for widget in self.inactive_tours_list.winfo_children():
-                    if widget.winfo_exists():
-                        widget.destroy()
-            
-            # Get tours from API
-            tours = self.api_client.get_tours()
-            
-            # Handle empty tours
-            if not tours:
-                if hasattr(self, 'active_tours_list') and self.active_tours_list.winfo_exists():
-                    ttk.Label(self.active_tours_list,
-                            text="No active tours",
-                            style='Body.TLabel').pack(pady=20)
-                if hasattr(self, 'inactive_tours_list') and self.inactive_tours_list.winfo_exists():
-                    ttk.Label(self.inactive_tours_list,
-                            text="No past tours",
-                            style='Body.TLabel').pack(pady=20)
-                return
             
-            # Sort tours by date and time
-            tours.sort(key=lambda x: (x.get('date', ''), x.get('time', '')))
+            # Selection checkbox for bulk actions (the selection outlives the card)
+            card.selected_var = tk.BooleanVar(value=False)
             
-            # Separate active and inactive tours
-            active_tours = []
-            inactive_tours = []
-            
-            for tour in tours:
-                status = tour.get('status', '').lower()
-                if status in ['completed', 'cancelled', 'no_show']:
-                    inactive_tours.append(tour)
-                else:
-                    active_tours.append(tour)
-            
-            # Display active tours
-            if hasattr(self, 'active_tours_list') and self.active_tours_list.winfo_exists():
-                if active_tours:
-                    for tour in active_tours:
-                        self.create_tour_card(self.active_tours_list, tour)
+            def toggled(*args):
+                if card.selected_var.get():
+                    self.selected_ids.add(card.tour.id)
                 else:
-                    ttk.Label(self.active_tours_list,
-                            text="No active tours",
-                            style='Body.TLabel').pack(pady=20)
+                    self.selected_ids.discard(card.tour.id)
             
-            # Display inactive tours
-            if hasattr(self, 'inactive_tours_list') and self.inactive_tours_list.winfo_exists():
-                if inactive_tours:
-                    for tour in inactive_tours:
-                        self.create_tour_card(self.inactive_tours_list, tour, show_status=True)
-                else:
-                    ttk.Label(self.inactive_tours_list,
-                            text="No past tours",
-                            style='Body.TLabel').pack(pady=20)
-                
-        except Exception as e:
-            print(f"Failed to load tours: {str(e)}")
+            ttk.Checkbutton(actions_frame,
+                           text="Select",
+                           variable=card.selected_var).pack(side='right', padx=(0, 10))
+            card.tour = tour
+            card.selected_var.trace_add('write', toggled)
+        
+        self.update_tour_card(card, tour)
+        return card
+
+    def update_tour_card(self, card, tour):
+        """Show another (or a changed) tour on an existing card"""
+        card.tour = tour
+        
+        if card.show_status:
+            status = tour.status.value.upper()
+            status_colors = {
+                'COMPLETED': {'fg': '#2D5A27', 'bg': '#E8F5E9'},  # Green
+                'CANCELLED': {'fg': '#C62828', 'bg': '#FFEBEE'},  # Red
+                'NO_SHOW': {'fg': '#F57C00', 'bg': '#FFF3E0'}    # Orange
+            }
+            # Apply status-specific colors
+            colors = status_colors.get(status, {'fg': self.colors['text'], 'bg': self.colors['border']})
+            card.status_label.configure(text=status, foreground=colors['fg'], background=colors['bg'])
+        
+        card.address_label.configure(text=self.property_resolver.address_for(tour.property_id))
+        tour_date, tour_time = format_tour_time(tour.tour_time)
+        card.time_label.configure(text=f" {tour_date} at {tour_time}")
+        card.client_label.configure(text=f"👤 {tour.client_name or 'No name'}")
+        
+        if not card.show_status:
+            # Pooled cards are rebound to other tours, so the tick follows the tour, not the card
+            card.selected_var.set(tour.id in self.selected_ids)
+
+    @traced_action()
+    def load_tours(self, refresh=True):
+        """Load and display tours; the refresh runs on a worker thread
+        
+        Args:
+            refresh (bool): Pull changes from Atlas first; False just re-renders
+                the replica (after a local change), keeping the cards and the
+                bulk selection on screen until the new ones are drawn
+        """
+        if refresh:
+            self.selected_ids = set()
+            for tour_list in (getattr(self, 'active_tours_list', None), getattr(self, 'inactive_tours_list', None)):
+                if tour_list is not None and tour_list.winfo_exists():
+                    tour_list.show_placeholder(lambda parent: self.show_loading(parent, "Loading tours..."))
+        
+        # Only the latest request may render (the view can be rebuilt meanwhile)
+        self._tours_request = request = object()
+        self._tours_stale = False
+        
+        def loaded(result):
+            if request is self._tours_request:
+                self._tours_request = None
+                self.render_tours(result)
+                if self._tours_stale:
+                    self.load_tours(refresh=False)
+        
+        def failed(error):
+            logging.error(f"Failed to load tours: {error}")
+            if request is not self._tours_request:
+                return
+            self._tours_request = None
             if hasattr(self, 'content') and self.content.winfo_exists():
                 self.show_error_message(
                     "Unable to load tours",
                     "Please check your connection and try again."
                 )
+        
+        self.tasks.submit(self.fetch_tours, refresh, on_success=loaded, on_error=failed)
+        
+        # The first full download can take a while; paint Atlas's first page meanwhile
+        if refresh and self.connected and not self.sync_engine.is_bootstrapped:
+            def first_paint(page):
+                if request is self._tours_request and page['success']:
+                    self.show_tour_lists(page['active'], page['inactive'],
+                                         page['active_total'], page['inactive_total'])
+            
+            self.tasks.submit(self.fetch_first_page, on_success=first_paint,
+                              on_error=lambda error: logging.error(f"Failed to load the first tours: {error}"))
+
+    def fetch_first_page(self):
+        """The first page of both dashboard tabs, with their totals, straight from Atlas (worker thread)
+        
+        The tours and the property list are fetched concurrently; queued
+        local changes are layered over the tours.
+        """
+        async def fetch():
+            async with AsyncApiClient(self.api_client) as client:
+                return await client.get_dashboard()
+        
+        dashboard = asyncio.run(fetch())
+        self.property_resolver.update(dashboard['properties'])
+        for name in ('active', 'inactive'):
+            tours = (tour_state(self.write_queue.overlay(tour)) for tour in dashboard[name])
+            dashboard[name] = [tour for tour in tours if tour is not None]
+        self.property_resolver.prefetch(tour.property_id for tour in dashboard['active'] + dashboard['inactive'])
+        return dashboard
+
+    def fetch_tours(self, refresh=True):
+        """Refresh the replica and build the dashboard lists (runs on a worker thread)"""
+        # Pull only what changed since the last refresh, then read from the replica
+        connected = self.connected
+        if connected and refresh:
+            try:
+                # Fails fast while the circuit breaker knows the cluster is down
+                run_guarded(self.sync_engine.refresh)
+            except PyMongoError as e:
+                logging.error(f"Tour refresh failed, showing cached tours: {e}")
+                connected = False
+        # Fill the store from the on-disk copy (a no-op after the first load)
+        self.sync_engine.load_cache()
+        # Every tour, in start order straight from the store's status and start-time
+        # indexes; the lists are virtualized, so length no longer costs widgets
+        result = dict(self.state_manager.dashboard_tours(), connected=connected)
+        
+        # Resolve every property shown in one batched lookup
+        if connected:
+            self.property_resolver.prefetch(
+                tour.property_id for tour in result['active'] + result['inactive']
+            )
+        return result
+
+    def render_tours(self, result):
+        """Draw the dashboard lists from fetch_tours() output"""
+        if not result['connected']:
+            self.connected = False
+        self.show_tour_lists(result['active'], result['inactive'])
+        
+        if not self.connected and hasattr(self, 'content') and self.content.winfo_exists():
+            self.show_offline_notice()
+
+    def show_tour_lists(self, active_tours, inactive_tours, active_total=None, inactive_total=None):
+        """Put tours in the dashboard lists; cards already showing a tour are kept
+        
+        The totals default to the list lengths (a first page passes Atlas's counts)
+        """
+        self.update_tab_counts(len(active_tours) if active_total is None else active_total,
+                               len(inactive_tours) if inactive_total is None else inactive_total)
+        
+        # Display active and inactive tours
+        for tour_list, tours, empty_text in (
+            (getattr(self, 'active_tours_list', None), active_tours, "No active tours"),
+            (getattr(self, 'inactive_tours_list', None), inactive_tours, "No past tours")
+        ):
+            if tour_list is None or not tour_list.winfo_exists():
+                continue
+            if tours:
+                tour_list.set_items(tours)
+            else:
+                tour_list.show_placeholder(lambda parent, text=empty_text: ttk.Label(
+                    parent, text=text, style='Body.TLabel').pack(pady=20))
+
+    def update_tab_counts(self, active_total, inactive_total):
+        """Show tour totals in the dashboard tab labels"""
+        if hasattr(self, 'dashboard_tabs') and self.dashboard_tabs.winfo_exists():
+            tabs = self.dashboard_tabs.tabs()
+            self.dashboard_tabs.tab(tabs[0], text=f'ACTIVE TOURS ({active_total})')
+            self.dashboard_tabs.tab(tabs[1], text=f'PAST TOURS ({inactive_total})')
+
+    def show_offline_notice(self):
+        """Tell the user they are looking at cached data"""
+        synced_at = self.sync_engine.synced_at
+        since = synced_at.strftime('%m/%d/%Y %I:%M %p') + ' UTC' if synced_at else 'never'
+        self.offline_notice = self.show_error_message(
+            "Offline",
+            f"Showing cached data (last synced {since}). Tour changes are saved locally and sync when the connection returns."
+        )
+        return self.offline_notice
 
     def show_error_message(self, title, message):
         """Show error message with retry button
@@ -573,6 +992,7 @@ class ModernUI(ttk.Frame):
         return error_frame
 
     # Add other view methods (show_properties, show_reports, show_settings)
+    @traced_action()
     def show_properties(self):
         """Show properties view"""
         self.current_view = 'properties'
@@ -610,81 +1030,78 @@ class ModernUI(ttk.Frame):
         # Separator
         ttk.Separator(container, orient='horizontal').pack(fill='x', padx=20, pady=20)
         
-        # Properties list container
-        self.properties_list = ttk.Frame(container, style='Card.TFrame')
+        # Properties list container (only the rows in view are built)
+        self.properties_list = VirtualList(container, render=self.create_property_card,
+                                           update=self.update_property_card,
+                                           row_gap=1, background=self.colors['white'])
         self.properties_list.pack(fill='both', expand=True, padx=20)
         
         # Load properties
         self.load_properties()
 
+    @traced_action()
     def add_property(self):
         """Add a new property"""
-        try:
-            address = self.address_entry.get().strip()
-            if not address:
-                messagebox.showerror(
-                    "Validation Error",
-                    "Please enter a property address."
-                )
-                return
-            
-            property_data = {
-                'address': address,
-                'created_at': datetime.utcnow()
-            }
-            
-            result = self.api_client.add_property(property_data)
-            
-            if result.get('success'):
-                self.address_entry.delete(0, 'end')  # Clear the entry
-                self.load_properties()  # Refresh the list
-            else:
-                messagebox.showerror(
-                    "Error",
-                    f"Failed to add property: {result.get('error', 'Unknown error')}"
-                )
-                
-        except Exception as e:
+        if not self.ensure_online():
+            return
+        address = self.address_entry.get().strip()
+        if not address:
             messagebox.showerror(
-                "Error",
-                f"Failed to add property: {str(e)}"
+                "Validation Error",
+                "Please enter a property address."
             )
+            return
+        
+        property_data = {
+            'address': address,
+            'created_at': datetime.utcnow()
+        }
+        
+        def added(result):
+            if self.address_entry.winfo_exists():
+                self.address_entry.delete(0, 'end')  # Clear the entry
+                self.load_properties()  # Refresh the list
+        
+        self.run_write(self.api_client.add_property, property_data,
+                       action='add property', on_done=added)
 
+    @traced_action()
     def load_properties(self):
-        """Load and display properties"""
-        try:
-            # Clear existing properties
-            if hasattr(self, 'properties_list') and self.properties_list.winfo_exists():
-                for widget in self.properties_list.winfo_children():
-                    if widget.winfo_exists():
-                        widget.destroy()
-            
-            # Get properties from API
-            properties = self.api_client.get_properties()
-            
+        """Load and display properties; the fetch runs on a worker thread"""
+        if not (hasattr(self, 'properties_list') and self.properties_list.winfo_exists()):
+            return
+        properties_list = self.properties_list
+        if not properties_list.items:
+            # Reloads keep the current rows on screen and reconcile them when the data arrives
+            properties_list.show_placeholder(lambda parent: self.show_loading(parent, "Loading properties..."))
+        
+        def loaded(properties):
+            if not properties_list.winfo_exists():
+                return
             if not properties:
-                ttk.Label(self.properties_list,
-                         text="No properties added yet",
-                         style='Body.TLabel').pack(pady=20)
+                properties_list.show_placeholder(lambda parent: ttk.Label(
+                    parent, text="No properties added yet", style='Body.TLabel').pack(pady=20))
                 return
             
             # Display properties
-            for property_data in properties:
-                self.create_property_card(self.properties_list, property_data)
-                
-        except Exception as e:
-            print(f"Failed to load properties: {str(e)}")
-            if hasattr(self, 'content') and self.content.winfo_exists():
+            properties_list.set_items(properties)
+        
+        def failed(error):
+            logging.error(f"Failed to load properties: {error}")
+            if properties_list.winfo_exists():
+                properties_list.show_placeholder(lambda parent: None)
                 self.show_error_message(
                     "Unable to load properties",
                     "Please check your connection and try again."
                 )
+        
+        # Get properties from API (or the local cache when offline)
+        self.tasks.submit(self.fetch_properties, on_success=loaded, on_error=failed)
 
     def create_property_card(self, parent, property_data):
-        """Create a clean property list item without borders"""
+        """Create a clean property list item without borders (placed by the caller)"""
         # Main container
         card = ttk.Frame(parent, style='Card.TFrame')
-        card.pack(fill='x', pady=1)  # Minimal spacing between items
         
         # Content container
         content = ttk.Frame(card, style='Card.TFrame')
@@ -699,9 +1116,8 @@ class ModernUI(ttk.Frame):
                  text="🏠",
                  style='Body.TLabel').pack(side='left', padx=(0, 10))
                  
-        ttk.Label(left_frame,
-                 text=property_data.get('address', 'No address'),
-                 style='Body.TLabel').pack(side='left')
+        card.address_label = ttk.Label(left_frame, style='Body.TLabel')
+        card.address_label.pack(side='left')
         
         # Right side with action buttons
         actions_frame = ttk.Frame(content, style='Card.TFrame')
@@ -712,7 +1128,7 @@ class ModernUI(ttk.Frame):
             actions_frame,
             "Edit",
             'Primary.TButton',
-            lambda: self.edit_property(property_data)
+            lambda: self.edit_property(card.property_data)
         )
         edit_btn.pack(side='left', padx=(0, 5))
         
@@ -721,7 +1137,7 @@ class ModernUI(ttk.Frame):
             actions_frame,
             "Delete",
             'Primary.TButton',
-            lambda: self.delete_property(property_data.get('_id'))
+            lambda: self.delete_property(card.property_data.get('_id'))
         )
         delete_btn.pack(side='left')
         
@@ -734,14 +1150,80 @@ class ModernUI(ttk.Frame):
         
         card.bind('<Enter>', on_enter)
         card.bind('<Leave>', on_leave)
+        
+        self.update_property_card(card, property_data)
+        return card
+
+    def update_property_card(self, card, property_data):
+        """Show another (or a changed) property on an existing card"""
+        card.property_data = property_data
+        card.address_label.configure(text=property_data.get('address', 'No address'))
 
+    @traced_action()
     def show_reports(self):
         """Show reports view"""
         self.current_view = 'reports'
         self.clear_content()
         self.create_page_header("Reports", "View your tour statistics")
         # Reports content here...
+        self.show_api_metrics()
+        self.show_action_traces()
+
+    def show_api_metrics(self):
+        """Per-operation ApiClient latency (p50/p95/p99), calls, errors and documents returned"""
+        container = ttk.Frame(self.content, style='Card.TFrame')
+        container.pack(fill='x', padx=30, pady=(0, 30))
+        
+        ttk.Label(container,
+                 text="API Performance",
+                 style='SubHeader.TLabel').grid(row=0, column=0, columnspan=8, sticky='w', pady=(0, 10))
+        
+        snapshot = get_metrics().snapshot()
+        if not snapshot:
+            ttk.Label(container,
+                     text="No API calls recorded yet",
+                     style='Body.TLabel').grid(row=1, column=0, sticky='w')
+            return
+        
+        columns = [('Operation', None), ('Calls', 'calls'), ('Errors', 'errors'),
+                   ('p50 ms', 'p50_ms'), ('p95 ms', 'p95_ms'), ('p99 ms', 'p99_ms'),
+                   ('Max ms', 'max_ms'), ('Docs', 'documents')]
+        for column, (title, _) in enumerate(columns):
+            ttk.Label(container, text=title, style='Body.TLabel').grid(
+                row=1, column=column, sticky='w', padx=(0, 20))
+        for row, (operation, stats) in enumerate(snapshot.items(), start=2):
+            for column, (_, key) in enumerate(columns):
+                value = operation if key is None else stats[key]
+                ttk.Label(container, text=str(value), style='Body.TLabel').grid(
+                    row=row, column=column, sticky='w', padx=(0, 20))
+
+    def show_action_traces(self):
+        """Driver commands behind recent screens and actions, with repeated queries called out"""
+        container = ttk.Frame(self.content, style='Card.TFrame')
+        container.pack(fill='both', expand=True, padx=30, pady=(0, 30))
+        
+        ttk.Label(container,
+                 text="Recent Actions",
+                 style='SubHeader.TLabel').pack(anchor='w', pady=(0, 10))
+        
+        if not TRACE_COMMANDS:
+            ttk.Label(container,
+                     text="Command tracing is off (set TRACE_COMMANDS=true to record actions)",
+                     style='Body.TLabel').pack(anchor='w')
+            return
+        
+        for action in get_tracer().recent_actions()[:15]:
+            text = (f"{action['action']}: {action['commands']} commands, "
+                    f"{action['duration_ms']} ms, {action['documents']} docs")
+            if action['slow']:
+                text += f", {action['slow']} slow"
+            if action['repeated']:
+                text += f", {sum(action['repeated'].values())} repeated queries"
+            ttk.Label(container, text=text, style='Body.TLabel').pack(anchor='w')
+            for shape, count in action['repeated'].items():
+                ttk.Label(container, text=f"    x{count} {shape}", style='Body.TLabel').pack(anchor='w')
 
+    @traced_action()
     def show_settings(self):
         """Show settings view"""
         self.current_view = 'settings'
@@ -758,26 +1240,32 @@ class ModernUI(ttk.Frame):
                  text="Select Property",
                  style='Body.TLabel').pack(anchor='w', pady=(0, 5))
         
-        # Get properties from API
-        try:
-            properties = self.api_client.get_properties()
-            property_addresses = [prop['address'] for prop in properties]
-        except Exception as e:
-            property_addresses = []
-            print(f"Error loading properties: {str(e)}")
-        
         # Create Combobox with custom styling
         self.property_var.set('')  # Clear previous selection
         property_dropdown = ttk.Combobox(properties_frame,
                                        textvariable=self.property_var,
-                                       values=property_addresses,
                                        state='readonly',
                                        font=('Segoe UI', 11),
                                        width=40)
         property_dropdown.pack(fill='x')
+        self.populate_property_dropdown(property_dropdown)
         
         return property_dropdown
 
+    def populate_property_dropdown(self, dropdown):
+        """Fill a property Combobox from memory now and from the API once it answers"""
+        dropdown.configure(values=self.property_resolver.addresses())
+        
+        def loaded(properties):
+            if dropdown.winfo_exists():
+                dropdown.configure(values=[prop['address'] for prop in properties])
+        
+        def failed(error):
+            logging.error(f"Failed to load properties: {error}")
+        
+        self.tasks.submit(self.fetch_properties, on_success=loaded, on_error=failed)
+
+    @traced_action()
     def show_add_tour(self):
         """Show tour scheduling form in the main content area"""
         self.clear_content()
@@ -796,14 +1284,13 @@ class ModernUI(ttk.Frame):
                  text="Select Property",
                  style='Body.TLabel').pack(anchor='w', pady=(0, 5))
         
-        properties = self.get_property_list()
         property_dropdown = ttk.Combobox(form_frame,
                                        textvariable=self.property_var,
-                                       values=properties,
                                        state='readonly',
                                        font=('Segoe UI', 11),
                                        width=40)
         property_dropdown.pack(fill='x', pady=(0, 15))
+        self.populate_property_dropdown(property_dropdown)
         
         # Client Name
         ttk.Label(form_frame,
@@ -843,11 +1330,41 @@ class ModernUI(ttk.Frame):
                  style='Body.TLabel').pack(anchor='w', pady=(0, 5))
         
         time_var = tk.StringVar()
-        time_entry = ttk.Entry(form_frame,
-                              textvariable=time_var,
-                              font=('Segoe UI', 11),
-                              width=40)
-        time_entry.pack(fill='x', pady=(0, 15))
+        time_row = ttk.Frame(form_frame, style='Card.TFrame')
+        time_row.pack(fill='x', pady=(0, 15))
+        
+        time_entry = ttk.Combobox(time_row,
+                                 textvariable=time_var,
+                                 font=('Segoe UI', 11),
+                                 width=30)
+        time_entry.pack(side='left', fill='x', expand=True)
+        
+        @traced_action('add_tour.suggest_times')
+        def suggest_times():
+            property_id = self.property_resolver.id_for_address(self.property_var.get())
+            if not property_id:
+                messagebox.showerror("Error", "Please select a property first")
+                return
+            try:
+                tour_date = datetime.strptime(date_var.get(), '%m/%d/%Y').date()
+            except ValueError:
+                messagebox.showerror("Error", "Please enter a valid date in MM/DD/YYYY format")
+                return
+            
+            slots = find_available_slots(self.booking_index, [property_id], tour_date, tour_date)
+            times = [start.strftime('%I:%M %p') for start in slots[property_id].get(tour_date, [])]
+            time_entry.configure(values=times)
+            if times:
+                time_var.set(times[0])
+            else:
+                messagebox.showinfo("No Open Times", "No open times at this property on that date.")
+        
+        self.create_styled_button(
+            time_row,
+            "Open Times",
+            'Secondary.TButton',
+            suggest_times
+        ).pack(side='left', padx=(10, 0))
         
         # Buttons
         button_frame = ttk.Frame(form_frame, style='Card.TFrame')
@@ -862,6 +1379,7 @@ class ModernUI(ttk.Frame):
         )
         cancel_btn.pack(side='left', padx=(0, 10))
         
+        @traced_action('add_tour.save')
         def save_tour():
             try:
                 # Parse and validate date
@@ -877,13 +1395,13 @@ class ModernUI(ttk.Frame):
                     return
                 
                 # Create tour data
+                tour_time = datetime.combine(tour_date, datetime.min.time().replace(hour=hour, minute=minute))
                 tour_data = {
-                    'property_id': self.property_var.get(),
+                    'property_id': self.property_resolver.id_for_address(self.property_var.get()),
                     'client_name': self.client_name_var.get(),
                     'phone_number': self.phone_var.get(),
-                    'date': tour_date.strftime('%Y-%m-%d'),
-                    'time': f"{hour:02d}:{minute:02d}",
-                    'duration': 60  # Fixed 1-hour duration
+                    'tour_time': tour_time,
+                    'end_time': tour_time + timedelta(minutes=DEFAULT_TOUR_DURATION)  # Fixed 1-hour duration
                 }
                 
                 if not all([tour_data['property_id'],
@@ -892,8 +1410,15 @@ class ModernUI(ttk.Frame):
                     messagebox.showerror("Error", "Please fill in all required fields")
                     return
                     
-                self.api_client.add_tour(tour_data)
-                self.show_tours()
+                # Catch double bookings locally before the server re-checks them
+                if self.booking_index.conflicts_for(tour_data):
+                    messagebox.showerror("Time Unavailable",
+                                         "Another tour is already scheduled at this property at that time.")
+                    return
+                
+                # Journaled locally; the write queue sends it to Atlas
+                self.write_queue.add_tour(tour_data)
+                self.show_tours(refresh=False)
                 
             except ValueError:
                 messagebox.showerror("Error", "Please enter a valid date in MM/DD/YYYY format")
@@ -909,6 +1434,7 @@ class ModernUI(ttk.Frame):
         )
         schedule_btn.pack(side='right')
 
+    @traced_action()
     def edit_tour(self, tour):
         """Show tour editing form in the main content area"""
         self.clear_content()
@@ -923,12 +1449,12 @@ class ModernUI(ttk.Frame):
         form_frame.pack(fill='x', padx=20, pady=20)
         
         # Pre-fill existing data
-        self.property_var.set(tour.get('property_id', ''))
-        self.client_name_var.set(tour.get('client_name', ''))
-        self.phone_var.set(tour.get('phone_number', ''))
+        self.client_name_var.set(tour.client_name)
+        self.phone_var.set(tour.phone_number)
         
-        # Property Selection
+        # Property Selection (the dropdown clears its variable, so pre-fill after)
         property_dropdown = self.create_property_dropdown(form_frame)
+        self.property_var.set(self.property_resolver.address_for(tour.property_id, default=''))
         
         # Client Name
         ttk.Label(form_frame,
@@ -950,6 +1476,67 @@ class ModernUI(ttk.Frame):
                  font=('Segoe UI', 11),
                  width=40).pack(fill='x')
         
+        # Rescheduling keeps the tour's length
+        if tour.tour_time and tour.end_time:
+            length = tour.end_time - tour.tour_time
+        else:
+            length = timedelta(minutes=DEFAULT_TOUR_DURATION)
+        
+        # Tour Date
+        ttk.Label(form_frame,
+                 text="Tour Date (MM/DD/YYYY)",
+                 style='Body.TLabel').pack(anchor='w', pady=(15, 5))
+        
+        date_var = tk.StringVar(value=tour.tour_time.strftime('%m/%d/%Y') if tour.tour_time else '')
+        ttk.Entry(form_frame,
+                 textvariable=date_var,
+                 font=('Segoe UI', 11),
+                 width=40).pack(fill='x')
+        
+        # Tour Time
+        ttk.Label(form_frame,
+                 text="Tour Time (HH:MM AM/PM)",
+                 style='Body.TLabel').pack(anchor='w', pady=(15, 5))
+        
+        time_var = tk.StringVar(value=tour.tour_time.strftime('%I:%M %p') if tour.tour_time else '')
+        time_row = ttk.Frame(form_frame, style='Card.TFrame')
+        time_row.pack(fill='x')
+        
+        time_entry = ttk.Combobox(time_row,
+                                 textvariable=time_var,
+                                 font=('Segoe UI', 11),
+                                 width=30)
+        time_entry.pack(side='left', fill='x', expand=True)
+        
+        @traced_action('edit_tour.suggest_times')
+        def suggest_times():
+            property_id = self.property_resolver.id_for_address(self.property_var.get())
+            if not property_id:
+                messagebox.showerror("Error", "Please select a property first")
+                return
+            try:
+                tour_date = datetime.strptime(date_var.get(), '%m/%d/%Y').date()
+            except ValueError:
+                messagebox.showerror("Error", "Please enter a valid date in MM/DD/YYYY format")
+                return
+            
+            # The tour's own slot counts as free, so it can move within its current window
+            slots = find_available_slots(self.booking_index, [property_id], tour_date, tour_date,
+                                         duration=int(length.total_seconds() // 60), exclude_id=tour.id)
+            times = [start.strftime('%I:%M %p') for start in slots[property_id].get(tour_date, [])]
+            time_entry.configure(values=times)
+            if times:
+                time_var.set(times[0])
+            else:
+                messagebox.showinfo("No Open Times", "No open times at this property on that date.")
+        
+        self.create_styled_button(
+            time_row,
+            "Open Times",
+            'Secondary.TButton',
+            suggest_times
+        ).pack(side='left', padx=(10, 0))
+        
         # Tour Status
         ttk.Label(form_frame,
                  text="Tour Status",
@@ -958,13 +1545,10 @@ class ModernUI(ttk.Frame):
         status_frame = ttk.Frame(form_frame, style='Card.TFrame')
         status_frame.pack(fill='x', pady=(0, 15))
         
+        @traced_action('edit_tour.update_status')
         def update_status(new_status):
-            try:
-                self.api_client.update_tour_status(tour['id'], new_status)
-                self.load_tours()  # Refresh tours list
-                self.show_tours()  # Return to tours view
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to update status: {str(e)}")
+            self.write_queue.update_tour_status(tour.id, new_status)
+            self.show_tours(refresh=False)  # Return to tours view
         
         # Status buttons with consistent burgundy styling
         completed_btn = self.create_styled_button(
@@ -1003,6 +1587,7 @@ class ModernUI(ttk.Frame):
         )
         cancel_btn.pack(side='left', padx=(0, 10))
         
+        @traced_action('edit_tour.save')
         def save_changes():
             if not all([self.property_var.get(),
                        self.client_name_var.get(),
@@ -1010,17 +1595,38 @@ class ModernUI(ttk.Frame):
                 messagebox.showerror("Error", "Please fill in all required fields")
                 return
             
+            property_id = self.property_resolver.id_for_address(self.property_var.get())
+            if not property_id:
+                messagebox.showerror("Error", "Please select a property")
+                return
+            
             updated_data = {
-                'property_id': self.property_var.get(),
+                'property_id': property_id,
                 'client_name': self.client_name_var.get(),
                 'phone_number': self.phone_var.get()
             }
             
-            try:
-                self.api_client.update_tour(tour['id'], updated_data)
-                self.show_tours()  # Return to tours list
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save changes: {str(e)}")
+            # Undated tours may be saved without a time; anything entered must parse
+            if date_var.get() or time_var.get() or tour.tour_time:
+                try:
+                    tour_date = datetime.strptime(date_var.get(), '%m/%d/%Y').date()
+                    time_obj = datetime.strptime(time_var.get(), '%I:%M %p')
+                except ValueError:
+                    messagebox.showerror("Error", "Please enter the date as MM/DD/YYYY and the time as HH:MM AM/PM")
+                    return
+                tour_time = datetime.combine(tour_date, time_obj.time())
+                if tour_time != tour.tour_time:
+                    updated_data['tour_time'] = tour_time
+                    updated_data['end_time'] = tour_time + length
+            
+            proposed = dict(tour_document(tour), **updated_data)
+            if self.booking_index.conflicts_for(proposed, exclude_id=tour.id):
+                messagebox.showerror("Time Unavailable",
+                                     "Another tour is already scheduled at this property at that time.")
+                return
+            
+            self.write_queue.update_tour(tour.id, updated_data)
+            self.show_tours(refresh=False)  # Return to tours list
         
         save_btn = self.create_styled_button(
             button_frame,
@@ -1030,49 +1636,140 @@ class ModernUI(ttk.Frame):
         )
         save_btn.pack(side='right')
 
+    @traced_action()
     def delete_tour(self, tour):
         """Delete a tour with confirmation"""
+        if not self.ensure_online():
+            return
         if messagebox.askyesno("Confirm Delete", 
                               "Are you sure you want to delete this tour?"):
-            try:
-                # Get the tour ID (either 'id' or '_id')
-                tour_id = tour.get('id') or tour.get('_id')
-                if not tour_id:
-                    raise ValueError("Invalid tour ID")
-                    
-                result = self.api_client.delete_tour(tour_id)
-                if result['success']:
-                    self.load_tours()  # Refresh the list
-                else:
-                    messagebox.showerror("Error", f"Failed to delete tour: {result.get('error', 'Unknown error')}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to delete tour: {str(e)}")
+            # Queued changes to the tour are written first; the replica drops it
+            # once deleted and the state observer redraws the lists
+            self.run_write(self.write_queue.delete_tour, tour.id, action='delete tour')
 
+    @traced_action()
     def update_tour_status(self, tour, status, notes=None):
         """Update tour status"""
-        try:
-            result = self.api_client.update_tour_status(tour, status, notes)
-            if result['success']:
-                self.load_tours()  # Refresh the list
-            else:
-                messagebox.showerror("Error", f"Failed to update tour status: {result.get('error', 'Unknown error')}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update tour status: {str(e)}")
+        # The replica has the change at once; the state observer redraws the lists
+        self.write_queue.update_tour_status(tour.id, status, notes)
+
+    @traced_action()
+    def complete_tour(self, tour):
+        """Mark a tour as completed"""
+        self.update_tour_status(tour, 'completed')
 
+    @traced_action()
+    def cancel_tour(self, tour):
+        """Cancel a tour"""
+        self.update_tour_status(tour, 'cancelled')
+
+    @traced_action()
+    def mark_no_show(self, tour):
+        """Mark a tour as no-show"""
+        self.update_tour_status(tour, 'no_show')
+
+    def create_bulk_actions_bar(self, parent):
+        """Create the toolbar that applies one action to every selected tour"""
+        bar = ttk.Frame(parent, style='Card.TFrame')
+        bar.pack(fill='x', padx=20, pady=(20, 0))
+        
+        actions = [
+            ("Select All", 'Secondary.TButton', self.select_all_tours),
+            ("Complete Selected", 'Primary.TButton', lambda: self.bulk_update_status('completed')),
+            ("Cancel Selected", 'Primary.TButton', lambda: self.bulk_update_status('cancelled')),
+            ("No Show Selected", 'Primary.TButton', lambda: self.bulk_update_status('no_show'))
+        ]
+        for text, style, command in actions:
+            self.create_styled_button(bar, text, style, command).pack(side='left', padx=(0, 5))
+        
+        self.create_styled_button(
+            bar,
+            "Delete Selected",
+            'Danger.TButton',
+            self.bulk_delete_tours
+        ).pack(side='right')
+        
+        return bar
+
+    def active_tour_ids(self):
+        """Ids of every tour in the active list, built into cards or not"""
+        tour_list = getattr(self, 'active_tours_list', None)
+        if tour_list is None or not tour_list.winfo_exists():
+            return []
+        return [tour.id for tour in tour_list.items]
+
+    def get_selected_tour_ids(self):
+        """Ids of the active tours currently ticked"""
+        return [tour_id for tour_id in self.active_tour_ids() if tour_id in self.selected_ids]
+
+    def select_all_tours(self):
+        """Tick every active tour, or clear them all if they are already ticked"""
+        tour_ids = self.active_tour_ids()
+        select = not all(tour_id in self.selected_ids for tour_id in tour_ids)
+        self.selected_ids = set(tour_ids) if select else set()
+        tour_list = getattr(self, 'active_tours_list', None)
+        if tour_list is not None and tour_list.winfo_exists():
+            for card in tour_list.widgets():
+                card.selected_var.set(card.tour.id in self.selected_ids)
+
+    def report_bulk_result(self, action, result):
+        """Summarize a bulk call; returns True if anything was applied"""
+        if 'error' in result:
+            messagebox.showerror("Error", f"Failed to {action}: {result['error']}")
+            return False
+        
+        failed = [item for item in result['results'] if not item['success']]
+        if failed:
+            details = '\n'.join(f"{item['id'] or 'unknown'}: {item.get('error', 'Unknown error')}"
+                                 for item in failed[:10])
+            messagebox.showerror(
+                "Error",
+                f"Failed to {action} {len(failed)} of {len(result['results'])} tours:\n{details}"
+            )
+        return len(failed) < len(result['results'])
+
+    @traced_action()
+    def bulk_update_status(self, status):
+        """Apply one status to every selected tour (queued, flushed in one round trip)"""
+        tour_ids = self.get_selected_tour_ids()
+        if not tour_ids:
+            messagebox.showinfo("No Selection", "Select one or more tours first.")
+            return
+        
+        # Through the write queue like single status changes, so edits still
+        # queued for these tours are not rolled back as conflicts
+        self.write_queue.update_tour_statuses(tour_ids, status)
+        self.selected_ids.difference_update(tour_ids)
+
+    @traced_action()
+    def bulk_delete_tours(self):
+        """Delete every selected tour with a single round trip"""
+        tour_ids = self.get_selected_tour_ids()
+        if not tour_ids:
+            messagebox.showinfo("No Selection", "Select one or more tours first.")
+            return
+        if not self.ensure_online():
+            return
+        if not messagebox.askyesno("Confirm Delete",
+                                   f"Are you sure you want to delete {len(tour_ids)} tours?"):
+            return
+        
+        def finished(result):
+            # Deleted tours leave the replica, and the state observer redraws the lists
+            if self.report_bulk_result('delete', result):
+                self.selected_ids.difference_update(tour_ids)
+        
+        self.run_task(self.write_queue.delete_tours, tour_ids, action='delete', on_success=finished)
+
+    @traced_action()
     def delete_property(self, property_id):
         """Delete a property with confirmation"""
+        if not self.ensure_online():
+            return
         if messagebox.askyesno("Confirm Delete", 
                               "Are you sure you want to delete this property?"):
-            try:
-                result = self.api_client.delete_property(property_id)
-                if result['success']:
-                    self.load_properties()  # Refresh the list
-                else:
-                    messagebox.showerror("Error", 
-                                       f"Failed to delete property: {result.get('error', 'Unknown error')}")
-            except Exception as e:
-                messagebox.showerror("Error", 
-                                   f"Failed to delete property: {str(e)}")
+            self.run_write(self.api_client.delete_property, property_id, action='delete property',
+                           on_done=lambda result: self.load_properties())  # Refresh the list
 
     def show_loading(self, parent, message="Loading..."):
         """Show loading indicator"""
@@ -1082,7 +1779,7 @@ class ModernUI(ttk.Frame):
         tk.Label(loading_frame,
                 text="⌛",
                 font=('Segoe UI', 24),
-                fg=self.colors['primary'],
+                fg=self.colors['button_primary'],
                 bg=self.colors['white']).pack(pady=(20, 10))
                 
         tk.Label(loading_frame,
@@ -1158,15 +1855,23 @@ class ModernUI(ttk.Frame):
         
         return button
 
-    def get_property_list(self):
-        """Get list of properties from API"""
+    def fetch_properties(self):
+        """Get active properties from the API, falling back to the local cache offline"""
+        if not self.connected:
+            return self.cache.get_properties() if self.cache else []
+        
         try:
             properties = self.api_client.get_properties()
-            return [prop['address'] for prop in properties] if properties else []
-        except Exception as e:
-            print(f"Error loading properties: {str(e)}")
-            return []
+        except UNAVAILABLE_ERRORS as e:
+            logging.error(f"Property fetch failed, showing cached properties: {e}")
+            return self.cache.get_properties() if self.cache else []
+        if self.cache:
+            self.cache.save_properties(properties)
+        self.property_resolver.update(properties)
+        self.state_manager.update_properties(properties)
+        return properties
 
+    @traced_action()
     def edit_property(self, property_data):
         """Show property editing form in the main window"""
         self.clear_content()
@@ -1196,17 +1901,30 @@ class ModernUI(ttk.Frame):
         button_frame = ttk.Frame(form_frame, style='Card.TFrame')
         button_frame.pack(fill='x', pady=(20, 0))
         
+        @traced_action('edit_property.save')
         def save_changes():
+            if not self.ensure_online():
+                return
             address = address_var.get().strip()
             if not address:
                 messagebox.showerror("Error", "Please enter a property address")
                 return
                 
-            try:
-                self.api_client.update_property(property_data['id'], {'address': address})
+            if address == property_data['address']:
+                self.show_properties()
+                return
+
+            def renamed(result):
+                self.property_resolver.update([dict(property_data, address=address)])
+                if result['tours_modified']:
+                    messagebox.showinfo(
+                        "Property Updated",
+                        f"Updated {result['tours_modified']} tour(s) that referred to the old address"
+                    )
                 self.show_properties()  # Return to properties list
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to update property: {str(e)}")
+            
+            self.run_write(self.api_client.rename_property, property_data['_id'], address,
+                           action='update property', on_done=renamed, busy=save_btn)
         
         # Cancel button (burgundy filled)
         cancel_btn = self.create_styled_button(
@@ -0,0 +1,169 @@
+import logging
+import sys
+from datetime import datetime
+from bson import ObjectId
+from typing import Dict, List
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from .api_client import INACTIVE_TOUR_STATUSES
+from .config import TOMBSTONE_RETENTION_DAYS
+
+# Indexes the hot queries in api_client.py rely on, per collection
+REQUIRED_INDEXES = {
+    'tours': [
+        # query_tours: status filter, then keyset sort/range on (tour_time, _id)
+        IndexModel([('status', ASCENDING), ('tour_time', ASCENDING), ('_id', ASCENDING)],
+                   name='status_tour_time'),
+        # query_tours with no status filter (and $nin filters the planner prefers to scan in order)
+        IndexModel([('tour_time', ASCENDING), ('_id', ASCENDING)],
+                   name='tour_time'),
+        # delete_property active-tour check, booking conflict checks and per-property listings
+        IndexModel([('property_id', ASCENDING), ('status', ASCENDING), ('tour_time', ASCENDING)],
+                   name='property_status_tour_time'),
+        # Incremental sync pulls everything changed since a watermark
+        IndexModel([('updated_at', ASCENDING)], name='updated_at')
+    ],
+    'tour_tombstones': [
+        # Incremental sync pulls deletes since a watermark; old tombstones expire
+        IndexModel([('deleted_at', ASCENDING)], name='deleted_at_ttl',
+                   expireAfterSeconds=TOMBSTONE_RETENTION_DAYS * 24 * 3600)
+    ],
+    'properties': [
+        # get_properties only ever reads active properties
+        IndexModel([('status', ASCENDING), ('address', ASCENDING)],
+                   name='active_address',
+                   partialFilterExpression={'status': 'active'})
+    ]
+}
+
+# Representative shapes of the queries issued by ApiClient
+HOT_QUERIES = [
+    {
+        'name': 'get_properties',
+        'collection': 'properties',
+        'filter': {'status': 'active'}
+    },
+    {
+        'name': 'delete_property.count_active_tours',
+        'collection': 'tours',
+        'filter': {'property_id': ObjectId('000000000000000000000000'), 'status': {'$in': ['scheduled', 'pending']}}
+    },
+    {
+        'name': 'rename_property.legacy_refs',
+        'collection': 'tours',
+        'filter': {'property_id': {'$in': ['000000000000000000000000', '1 Example St']}}
+    },
+    {
+        'name': 'sync.changed_tours',
+        'collection': 'tours',
+        'filter': {'updated_at': {'$gt': datetime(2000, 1, 1)}},
+        'sort': [('updated_at', ASCENDING)]
+    },
+    {
+        'name': 'query_tours.active',
+        'collection': 'tours',
+        'filter': {'status': {'$nin': list(INACTIVE_TOUR_STATUSES)}},
+        'sort': [('tour_time', ASCENDING), ('_id', ASCENDING)]
+    },
+    {
+        'name': 'query_tours.past',
+        'collection': 'tours',
+        'filter': {'status': {'$in': list(INACTIVE_TOUR_STATUSES)}},
+        'sort': [('tour_time', DESCENDING), ('_id', DESCENDING)]
+    },
+    {
+        'name': 'query_tours.property',
+        'collection': 'tours',
+        'filter': {'property_id': ObjectId('000000000000000000000000')},
+        'sort': [('tour_time', ASCENDING), ('_id', ASCENDING)]
+    },
+    {
+        'name': 'add_tour.find_conflicting_tours',
+        'collection': 'tours',
+        'filter': {
+            'property_id': ObjectId('000000000000000000000000'),
+            'status': {'$nin': list(INACTIVE_TOUR_STATUSES)},
+            'tour_time': {'$lt': datetime(2000, 1, 1, 11)},
+            'end_time': {'$gt': datetime(2000, 1, 1, 10)}
+        }
+    }
+]
+
+def ensure_indexes(db) -> Dict[str, List[str]]:
+    """Create every required index; existing identical indexes are left alone
+
+    Returns:
+        Dict mapping collection name to the index names now in place
+    """
+    created = {}
+    for collection_name, models in REQUIRED_INDEXES.items():
+        try:
+            created[collection_name] = db[collection_name].create_indexes(models)
+        except OperationFailure as e:
+            # Usually an index with the same name but a different spec
+            logging.error(f"Failed to create indexes on {collection_name}: {e}")
+            created[collection_name] = []
+    return created
+
+def _plan_stages(plan: Dict) -> List[str]:
+    """Collect every stage name in an explain() plan tree"""
+    stages = []
+    if not isinstance(plan, dict):
+        return stages
+    if 'stage' in plan:
+        stages.append(plan['stage'])
+    for key in ('inputStage', 'queryPlan'):
+        if key in plan:
+            stages.extend(_plan_stages(plan[key]))
+    for child in plan.get('inputStages', []):
+        stages.extend(_plan_stages(child))
+    return stages
+
+def verify_indexes(db) -> List[Dict]:
+    """Explain each hot query and report whether it is served by an index
+
+    Returns:
+        List of dicts with 'name', 'collection', 'stages' and 'uses_index'
+    """
+    report = []
+    for query in HOT_QUERIES:
+        cursor = db[query['collection']].find(query['filter'])
+        if query.get('sort'):
+            cursor = cursor.sort(query['sort'])
+        try:
+            plan = cursor.explain().get('queryPlanner', {}).get('winningPlan', {})
+            stages = _plan_stages(plan)
+        except OperationFailure as e:
+            logging.error(f"Failed to explain {query['name']}: {e}")
+            stages = []
+
+        uses_index = bool(stages) and 'COLLSCAN' not in stages
+        if not uses_index:
+            logging.warning(f"Query {query['name']} is not index-backed (plan: {stages or 'unknown'})")
+        report.append({
+            'name': query['name'],
+            'collection': query['collection'],
+            'stages': stages,
+            'uses_index': uses_index
+        })
+    return report
+
+def main(argv=None):
+    """Create the required indexes, or with --verify also check the hot query plans"""
+    from .database import init_mongodb
+
+    argv = sys.argv[1:] if argv is None else argv
+    db = init_mongodb()
+    for collection_name, names in ensure_indexes(db).items():
+        print(f"{collection_name}: {', '.join(names) or 'no indexes created'}")
+
+    if '--verify' in argv:
+        report = verify_indexes(db)
+        for entry in report:
+            status = 'OK  ' if entry['uses_index'] else 'SCAN'
+            print(f"{status} {entry['name']}: {' <- '.join(entry['stages'])}")
+        return 0 if all(entry['uses_index'] for entry in report) else 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from bson import json_util
+from .api_client import INACTIVE_TOUR_STATUSES
+from .config import LOCAL_CACHE_PATH, LOCAL_CACHE_MAX_TOURS
+from .tour_schema import parse_datetime
+
+# Bump whenever the table layout or the stored document shape changes;
+# an out-of-date cache is simply dropped and rebuilt from Atlas.
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tours (
+    id TEXT PRIMARY KEY,
+    tour_time TEXT,
+    inactive INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tours_eviction ON tours (inactive, tour_time);
+CREATE TABLE IF NOT EXISTS properties (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+class LocalCache:
+    """On-disk SQLite copy of tours and properties for instant, offline-capable startup"""
+
+    def __init__(self, path: str = LOCAL_CACHE_PATH, max_tours: int = LOCAL_CACHE_MAX_TOURS):
+        self.path = path
+        self.max_tours = max_tours
+        self._lock = threading.Lock()
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._migrate()
+
+    def _migrate(self):
+        """Create the schema, discarding any cache written by another schema version"""
+        with self._lock, self._conn:
+            version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+            if version != SCHEMA_VERSION:
+                if version:
+                    logging.info(f"Local cache schema {version} is outdated, rebuilding")
+                self._conn.executescript(
+                    'DROP TABLE IF EXISTS tours; DROP TABLE IF EXISTS properties; DROP TABLE IF EXISTS meta;'
+                )
+                self._conn.executescript(_SCHEMA)
+                self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    # Sync bookkeeping
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def get_datetime(self, key: str) -> Optional[datetime]:
+        value = self.get_meta(key)
+        return datetime.fromisoformat(value) if value else None
+
+    def set_meta(self, **values):
+        """Store string or datetime values by key"""
+        rows = [
+            (key, value.isoformat() if isinstance(value, datetime) else value)
+            for key, value in values.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', rows)
+
+    # Tours
+    def get_tours(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute('SELECT data FROM tours').fetchall()
+        return [json_util.loads(row[0]) for row in rows]
+
+    def save_tours(self, tours: Iterable[Dict], removed_ids: Iterable[str] = (), replace: bool = False):
+        """Upsert tours and drop removed ones in one transaction
+
+        Args:
+            tours: Tour documents keyed by their 'id'
+            removed_ids: Ids of tours deleted upstream
+            replace: Discard every cached tour first (after a full resync)
+        """
+        rows = []
+        for tour in tours:
+            tour_time = parse_datetime(tour.get('tour_time'))
+            rows.append((tour['id'], tour_time.isoformat() if tour_time else None,
+                         int(tour.get('status') in INACTIVE_TOUR_STATUSES), json_util.dumps(tour)))
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute('DELETE FROM tours')
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('tours_partial', '0')")
+            self._conn.executemany('DELETE FROM tours WHERE id = ?', [(tour_id,) for tour_id in removed_ids])
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO tours (id, tour_time, inactive, data) VALUES (?, ?, ?, ?)',
+                rows
+            )
+            self._evict()
+
+    def _evict(self):
+        """Keep the cache bounded by dropping the oldest past tours
+
+        Active tours are never evicted, so the cache only exceeds its bound
+        when they alone do. Evicted tours will not come back through an
+        incremental refresh, so the cache is marked partial (see is_partial).
+        """
+        count = self._conn.execute('SELECT COUNT(*) FROM tours').fetchone()[0]
+        excess = count - self.max_tours
+        if excess > 0:
+            evicted = self._conn.execute(
+                'DELETE FROM tours WHERE id IN ('
+                'SELECT id FROM tours WHERE inactive = 1 ORDER BY tour_time LIMIT ?)',
+                (excess,)
+            ).rowcount
+            if evicted:
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('tours_partial', '1')")
+
+    def is_partial(self) -> bool:
+        """True when past tours were evicted since the last full resync"""
+        return self.get_meta('tours_partial') == '1'
+
+    # Properties
+    def get_properties(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute('SELECT data FROM properties').fetchall()
+        return [json_util.loads(row[0]) for row in rows]
+
+    def save_properties(self, properties: Iterable[Dict]):
+        """Replace the cached property list"""
+        rows = [(str(prop['_id']), json_util.dumps(prop)) for prop in properties]
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM properties')
+            self._conn.executemany('INSERT INTO properties (id, data) VALUES (?, ?)', rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,21 +1,56 @@
 import tkinter as tk
 from .gui import ModernUI
 from .database import init_mongodb
-from .config import validate_config, APP_NAME
+from .indexes import ensure_indexes
+from .migrations import run_migrations
+from .config import validate_config, APP_NAME, ENSURE_INDEXES_ON_STARTUP, RUN_MIGRATIONS_ON_STARTUP
+from .local_cache import LocalCache
+from .metrics import MetricsExporter
 import logging
 from .state_manager import StateManager
 
+def connect_in_background(app):
+    """Connect to Atlas and reconcile the local cache without blocking the window"""
+    def connect():
+        try:
+            # Validate configuration
+            validate_config()
+            
+            # Initialize MongoDB
+            db = init_mongodb()
+            
+            # Make sure the hot queries are index-backed
+            if ENSURE_INDEXES_ON_STARTUP:
+                ensure_indexes(db)
+            
+            # Convert any tours still on older schemas
+            if RUN_MIGRATIONS_ON_STARTUP:
+                run_migrations(db)
+            
+            # The replica catches up once connected (the dashboard's refresh and the
+            # sync thread); a first download paints Atlas's first page meanwhile
+            return True
+        except Exception as e:
+            logging.error(f"Running offline from the local cache: {e}")
+            return False
+
+    def connected(result):
+        app.set_connected(result)
+        app.write_queue.start()
+        # Follow Atlas from here on: change stream where supported, polling otherwise
+        app.sync_engine.start()
+        app.start_health_monitor()
+
+    app.tasks.submit(connect, on_success=connected)
+
 def main():
     try:
-        # Validate configuration
-        validate_config()
-        
-        # Initialize MongoDB
-        init_mongodb()
-        
         # Initialize state manager
         state_manager = StateManager()
         
+        # Open the on-disk cache so the first paint needs no network
+        cache = LocalCache()
+        
         # Create GUI
         root = tk.Tk()
         root.title(APP_NAME)
@@ -25,11 +60,21 @@ def main():
         root.grid_rowconfigure(0, weight=1)
         root.grid_columnconfigure(0, weight=1)
         
-        # Create and pack the modern UI
-        app = ModernUI(root, state_manager)
+        # Create and pack the modern UI (renders cached data straight away)
+        app = ModernUI(root, state_manager, cache=cache)
         app.pack(fill='both', expand=True)
         
+        # Periodically dump per-operation API latency for offline analysis
+        metrics_exporter = MetricsExporter()
+        metrics_exporter.start()
+        
+        connect_in_background(app)
+        
         root.mainloop()
+        app.sync_engine.stop()
+        app.write_queue.close()
+        app.tasks.shutdown()
+        metrics_exporter.stop()
         
     except Exception as e:
         logging.error(f"Application failed to start: {e}")
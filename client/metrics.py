@@ -0,0 +1,210 @@
+import bisect
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+from .config import METRICS_EXPORT_INTERVAL_SECONDS, METRICS_EXPORT_PATH
+
+# Latency bucket upper bounds in seconds (Prometheus 'le' labels)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Recent samples kept per operation for exact percentiles
+SAMPLE_WINDOW = 2048
+
+def _result_size(result) -> int:
+    """Documents a call returned (lists, bulk results, query pages and dashboard feeds)"""
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        if 'results' in result:
+            return len(result['results'])
+        # Result dicts carrying lists of documents (query pages, dashboard tabs)
+        lists = [value for value in result.values() if isinstance(value, list)]
+        if lists:
+            return sum(map(len, lists))
+    return 1
+
+def _failed(result) -> bool:
+    """ApiClient reports most failures as {'success': False, ...} rather than raising"""
+    return isinstance(result, dict) and result.get('success') is False
+
+def _percentile(samples: List[float], fraction: float) -> Optional[float]:
+    if not samples:
+        return None
+    return samples[min(int(fraction * len(samples)), len(samples) - 1)]
+
+class OperationStats:
+    """Counters and a latency histogram for one operation"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.documents = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # last slot is +Inf
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+
+    def record(self, seconds: float, failed: bool, documents: int):
+        self.calls += 1
+        self.errors += int(failed)
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.documents += documents
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.samples.append(seconds)
+
+    def summary(self) -> Dict:
+        samples = sorted(self.samples)
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'mean_ms': round(self.total_seconds / self.calls * 1000, 2) if self.calls else None,
+            'p50_ms': self._ms(_percentile(samples, 0.50)),
+            'p95_ms': self._ms(_percentile(samples, 0.95)),
+            'p99_ms': self._ms(_percentile(samples, 0.99)),
+            'max_ms': self._ms(self.max_seconds),
+            'documents': self.documents
+        }
+
+    @staticmethod
+    def _ms(seconds: Optional[float]) -> Optional[float]:
+        return round(seconds * 1000, 2) if seconds is not None else None
+
+class MetricsRegistry:
+    """Thread-safe per-operation latency, call, error and result-size metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: Dict[str, OperationStats] = {}
+
+    def record(self, operation: str, seconds: float, failed: bool = False, documents: int = 0):
+        with self._lock:
+            stats = self._operations.get(operation)
+            if stats is None:
+                stats = self._operations[operation] = OperationStats()
+            stats.record(seconds, failed, documents)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """operation -> {'calls', 'errors', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'documents'}"""
+        with self._lock:
+            return {name: stats.summary() for name, stats in sorted(self._operations.items())}
+
+    def reset(self):
+        with self._lock:
+            self._operations = {}
+
+    def to_json(self) -> str:
+        return json.dumps({'generated_at': time.time(), 'operations': self.snapshot()}, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines = [
+            '# HELP toursync_api_latency_seconds ApiClient call latency',
+            '# TYPE toursync_api_latency_seconds histogram'
+        ]
+        with self._lock:
+            operations = sorted(self._operations.items())
+            for name, stats in operations:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), stats.buckets):
+                    cumulative += count
+                    lines.append(f'toursync_api_latency_seconds_bucket{{operation="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'toursync_api_latency_seconds_sum{{operation="{name}"}} {stats.total_seconds:.6f}')
+                lines.append(f'toursync_api_latency_seconds_count{{operation="{name}"}} {stats.calls}')
+            for metric, kind, help_text, attribute in (
+                ('toursync_api_errors_total', 'counter', 'ApiClient calls that raised or reported failure', 'errors'),
+                ('toursync_api_documents_total', 'counter', 'Documents returned by ApiClient calls', 'documents')
+            ):
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} {kind}')
+                for name, stats in operations:
+                    lines.append(f'{metric}{{operation="{name}"}} {getattr(stats, attribute)}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path: str):
+        """Write the metrics to path (.json for JSON, anything else Prometheus text), atomically"""
+        content = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w') as handle:
+            handle.write(content)
+        os.replace(temporary, path)
+
+_registry = MetricsRegistry()
+
+def get_metrics() -> MetricsRegistry:
+    """The process-wide registry"""
+    return _registry
+
+def timed(operation: str, registry: Optional[MetricsRegistry] = None):
+    """Decorator recording latency, failures and result size under `operation`"""
+    def decorator(func: Callable):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            target = registry or _registry
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                target.record(operation, time.perf_counter() - started, failed=True)
+                raise
+            failed = _failed(result)
+            target.record(operation, time.perf_counter() - started, failed, 0 if failed else _result_size(result))
+            return result
+        return wrapper
+    return decorator
+
+def instrument_methods(prefix: str):
+    """Class decorator timing every public method as '<prefix>.<method>'"""
+    def decorator(cls):
+        for name, member in list(vars(cls).items()):
+            if not name.startswith('_') and callable(member) and not isinstance(member, (staticmethod, classmethod)):
+                setattr(cls, name, timed(f"{prefix}.{name}")(member))
+        return cls
+    return decorator
+
+class MetricsExporter:
+    """Dumps the registry to a file on an interval from a daemon thread"""
+
+    def __init__(self, path: str = METRICS_EXPORT_PATH, interval: float = METRICS_EXPORT_INTERVAL_SECONDS,
+                 registry: Optional[MetricsRegistry] = None):
+        self.path = path
+        self.interval = interval
+        self.registry = registry or _registry
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.export()
+
+    def export(self):
+        if not self.path:
+            return
+        try:
+            self.registry.export(self.path)
+        except OSError as e:
+            logging.error(f"Failed to export metrics to {self.path}: {e}")
+
+    def start(self):
+        if not self.path or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='metrics-export', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop and write one final snapshot"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.export()
@@ -0,0 +1,156 @@
+import logging
+import sys
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from bson import ObjectId
+from pymongo import ASCENDING, UpdateOne
+from .tour_schema import LEGACY_TIME_FIELDS, normalize_tour_times
+
+TOUR_TIMES_MIGRATION = 'tour_times_v1'
+PROPERTY_REFS_MIGRATION = 'property_refs_v1'
+
+# Tours still on the old string schema (or with an ISO string tour_time)
+_LEGACY_TOUR_FILTER = {'$or': [
+    {'date': {'$exists': True}},
+    {'time': {'$exists': True}},
+    {'tour_time': {'$type': 'string'}},
+    {'tour_time': {'$exists': True}, 'end_time': {'$exists': False}}
+]}
+
+# Tours that reference their property by address or id string
+_LEGACY_PROPERTY_FILTER = {'$or': [
+    {'property_id': {'$type': 'string'}},
+    {'property_address': {'$exists': True}}
+]}
+
+def run_batched_migration(db, name: str, query: Dict, fields: Dict,
+                          convert: Callable[[Dict], Optional[Dict]], batch_size: int = 500) -> Dict:
+    """Rewrite matching tours in resumable batches
+
+    Progress (the last _id handled) is checkpointed in the 'migrations'
+    collection after every batch, so an interrupted run picks up where it
+    stopped. Each converted tour gets a fresh updated_at so incremental
+    sync replicas pick up the change.
+
+    Args:
+        db: Database handle
+        name: Migration id in the 'migrations' collection
+        query: Filter matching tours that still need converting
+        fields: Projection passed to find()
+        convert: Returns the update document for one tour, or None to skip it
+        batch_size: Tours per round trip
+
+    Returns:
+        Dict with 'migrated', 'failed' and 'done'
+    """
+    state = db.migrations.find_one({'_id': name}) or {}
+    if state.get('done'):
+        return {'migrated': 0, 'failed': 0, 'done': True}
+
+    last_id = state.get('last_id')
+    migrated = failed = 0
+    while True:
+        batch_query = query
+        if last_id is not None:
+            batch_query = {'$and': [query, {'_id': {'$gt': last_id}}]}
+        batch = list(db.tours.find(batch_query, fields).sort('_id', ASCENDING).limit(batch_size))
+        if not batch:
+            break
+
+        now = datetime.utcnow()
+        operations = []
+        batch_failed = 0
+        for tour in batch:
+            update = convert(tour)
+            if update is None:
+                logging.warning(f"Migration {name}: tour {tour['_id']} could not be converted, skipping")
+                batch_failed += 1
+                continue
+            update.setdefault('$set', {})['updated_at'] = now
+            operations.append(UpdateOne({'_id': tour['_id']}, update))
+        batch_migrated = 0
+        if operations:
+            batch_migrated = db.tours.bulk_write(operations, ordered=False).modified_count
+
+        last_id = batch[-1]['_id']
+        db.migrations.update_one(
+            {'_id': name},
+            {
+                '$set': {'last_id': last_id, 'updated_at': now},
+                '$inc': {'migrated': batch_migrated, 'failed': batch_failed}
+            },
+            upsert=True
+        )
+        migrated += batch_migrated
+        failed += batch_failed
+        logging.info(f"Migration {name}: {migrated} migrated, {failed} skipped so far")
+
+    db.migrations.update_one(
+        {'_id': name},
+        {'$set': {'done': True, 'finished_at': datetime.utcnow()}},
+        upsert=True
+    )
+    return {'migrated': migrated, 'failed': failed, 'done': True}
+
+def migrate_tour_times(db, batch_size: int = 500) -> Dict:
+    """Convert tours to BSON tour_time/end_time datetimes"""
+    def convert(tour):
+        times = normalize_tour_times({key: value for key, value in tour.items() if key != '_id'})
+        if 'tour_time' not in times:
+            return None
+        return {
+            '$set': {'tour_time': times['tour_time'], 'end_time': times['end_time']},
+            '$unset': {field: '' for field in LEGACY_TIME_FIELDS}
+        }
+
+    fields = {field: 1 for field in ('tour_time', 'end_time') + LEGACY_TIME_FIELDS}
+    return run_batched_migration(db, TOUR_TIMES_MIGRATION, _LEGACY_TOUR_FILTER, fields,
+                                 convert, batch_size)
+
+def migrate_property_refs(db, batch_size: int = 500) -> Dict:
+    """Point tours at their property's ObjectId instead of its address or id string"""
+    # One pass over properties; active ones win when an address was reused
+    by_address = {}
+    known_ids = set()
+    for prop in db.properties.find({}, {'address': 1, 'status': 1}).sort('status', ASCENDING):
+        known_ids.add(prop['_id'])
+        if prop.get('address') and (prop['address'] not in by_address or prop.get('status') == 'active'):
+            by_address[prop['address']] = prop['_id']
+
+    def convert(tour):
+        reference = tour.get('property_id')
+        if isinstance(reference, ObjectId):
+            property_id = reference
+        elif isinstance(reference, str) and ObjectId.is_valid(reference) and ObjectId(reference) in known_ids:
+            property_id = ObjectId(reference)
+        else:
+            property_id = by_address.get(reference) or by_address.get(tour.get('property_address'))
+        if property_id is None:
+            return None
+        return {'$set': {'property_id': property_id}, '$unset': {'property_address': ''}}
+
+    return run_batched_migration(db, PROPERTY_REFS_MIGRATION, _LEGACY_PROPERTY_FILTER,
+                                 {'property_id': 1, 'property_address': 1}, convert, batch_size)
+
+# Run in order; each is a no-op once finished
+MIGRATIONS = [
+    (TOUR_TIMES_MIGRATION, migrate_tour_times),
+    (PROPERTY_REFS_MIGRATION, migrate_property_refs)
+]
+
+def run_migrations(db, batch_size: int = 500) -> Dict[str, Dict]:
+    """Run every pending migration"""
+    return {name: migrate(db, batch_size=batch_size) for name, migrate in MIGRATIONS}
+
+def main(argv=None):
+    """Run pending data migrations"""
+    from .database import init_mongodb
+
+    argv = sys.argv[1:] if argv is None else argv
+    batch_size = int(argv[0]) if argv else 500
+    for name, result in run_migrations(init_mongodb(), batch_size=batch_size).items():
+        print(f"{name}: {result['migrated']} migrated, {result['failed']} skipped")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
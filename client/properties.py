@@ -0,0 +1,72 @@
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+class PropertyResolver:
+    """In-memory id -> property map used to render tours without per-card lookups
+
+    Tours reference properties by ObjectId. The resolver is filled from
+    the property list the UI already loads; ids it has never seen (for
+    example soft-deleted properties on old tours) are fetched together in
+    one batched query by prefetch() before a list is rendered. Lookups
+    are safe while a worker thread is filling the map.
+    """
+
+    def __init__(self, api_client):
+        self.api_client = api_client
+        self._lock = threading.Lock()
+        self._by_id: Dict[str, Dict] = {}
+        self._missing = set()
+
+    def update(self, properties: Iterable[Dict]):
+        """Remember these properties (keyed by their string id)"""
+        with self._lock:
+            for prop in properties:
+                property_id = str(prop['_id'])
+                self._by_id[property_id] = prop
+                self._missing.discard(property_id)
+
+    def forget(self, property_id):
+        with self._lock:
+            self._by_id.pop(str(property_id), None)
+
+    def prefetch(self, property_ids: Iterable):
+        """Load any unknown ids in a single query"""
+        unknown = {str(property_id) for property_id in property_ids if property_id}
+        with self._lock:
+            unknown -= set(self._by_id) | self._missing
+        if not unknown:
+            return
+        try:
+            found = self.api_client.get_properties_by_ids(list(unknown))
+        except Exception as e:
+            logging.error(f"Failed to resolve properties: {e}")
+            return
+        self.update(found)
+        # Don't ask again for ids that don't exist
+        with self._lock:
+            self._missing |= unknown - {str(prop['_id']) for prop in found}
+
+    def resolve(self, property_id) -> Optional[Dict]:
+        """Look up a known property; never touches the network (call prefetch first)"""
+        if not property_id:
+            return None
+        return self._by_id.get(str(property_id))
+
+    def address_for(self, property_id, default: str = 'No address') -> str:
+        prop = self.resolve(property_id)
+        return prop.get('address', default) if prop else default
+
+    def id_for_address(self, address: str) -> Optional[str]:
+        """Id of the active property with this address (used by the address dropdowns)"""
+        with self._lock:
+            for property_id, prop in self._by_id.items():
+                if prop.get('address') == address and prop.get('status', 'active') == 'active':
+                    return property_id
+        return None
+
+    def addresses(self) -> List[str]:
+        """Addresses of every known active property, for dropdowns"""
+        with self._lock:
+            return sorted(prop['address'] for prop in self._by_id.values()
+                          if prop.get('address') and prop.get('status', 'active') == 'active')
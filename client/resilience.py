@@ -0,0 +1,181 @@
+import functools
+import logging
+import random
+import threading
+import time
+from typing import Callable, List, Optional
+import pymongo
+from pymongo.errors import ConnectionFailure, ExecutionTimeout
+from .config import (
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS, MONGODB_READ_TIMEOUT_SECONDS,
+    MONGODB_WRITE_TIMEOUT_SECONDS, READ_RETRY_ATTEMPTS, RETRY_BACKOFF_SECONDS,
+    RETRY_BUDGET_RATIO
+)
+
+class ServiceUnavailable(ConnectionFailure):
+    """The cluster is known to be unreachable; raised without a round trip"""
+
+# Errors meaning "the server could not be reached in time", as opposed to
+# errors the server returned (duplicate keys, validation, ...)
+UNAVAILABLE_ERRORS = (ConnectionFailure, ExecutionTimeout)
+
+def is_unavailable(error: BaseException) -> bool:
+    return isinstance(error, UNAVAILABLE_ERRORS) or bool(getattr(error, 'timeout', False))
+
+class CircuitBreaker:
+    """Fails calls fast once the cluster has stopped answering
+
+    After `failure_threshold` consecutive connectivity failures the circuit
+    opens and calls raise ServiceUnavailable immediately. Once
+    `reset_seconds` have passed a single probe call is let through
+    (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_seconds: float = CIRCUIT_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[str], None]] = []
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def available(self) -> bool:
+        """False while calls would be refused without trying the network"""
+        with self._lock:
+            return self._state == self.CLOSED or self._probe_due()
+
+    def add_listener(self, listener: Callable[[str], None]):
+        """Call listener(state) on every state change (from whichever thread caused it)"""
+        self._listeners.append(listener)
+
+    def _probe_due(self) -> bool:
+        return self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds
+
+    def before_call(self):
+        """Raise ServiceUnavailable if the call should not be attempted"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._probe_due():
+                self._state = self.HALF_OPEN
+                return
+        raise ServiceUnavailable("MongoDB is unreachable; retrying shortly")
+
+    def record_success(self):
+        with self._lock:
+            changed = self._state != self.CLOSED
+            self._state = self.CLOSED
+            self._failures = 0
+        if changed:
+            logging.info("MongoDB reachable again, closing circuit")
+            self._notify(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            opening = self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            )
+            if opening:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+        if opening:
+            logging.warning(f"MongoDB unreachable, failing fast for {self.reset_seconds:g}s")
+            self._notify(self.OPEN)
+
+    def _notify(self, state: str):
+        for listener in list(self._listeners):
+            try:
+                listener(state)
+            except Exception as e:
+                logging.error(f"Circuit breaker listener failed: {e}")
+
+class RetryBudget:
+    """Caps retries at a fraction of recent calls so an outage doesn't multiply load
+
+    Every call deposits `ratio` of a token and every retry spends a whole
+    one, so at most about ratio x calls are retried (plus a small reserve).
+    """
+
+    def __init__(self, ratio: float = RETRY_BUDGET_RATIO, reserve: float = 10.0):
+        self.ratio = ratio
+        self.reserve = reserve
+        self._tokens = reserve
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.reserve)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+_breaker = CircuitBreaker()
+_budget = RetryBudget()
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """The process-wide breaker (there is one shared MongoClient, so one health state)"""
+    return _breaker
+
+def run_guarded(func: Callable, *args, idempotent: bool = False,
+                timeout: Optional[float] = None, **kwargs):
+    """Run a data-layer call under a deadline, the circuit breaker and the retry budget
+
+    Args:
+        func: Callable doing MongoDB work
+        idempotent: Retry connectivity failures (with jittered backoff); only for reads
+        timeout: Deadline in seconds for all the operations func runs,
+            or None for the client's own timeouts
+    """
+    attempts = 1 + (READ_RETRY_ATTEMPTS if idempotent else 0)
+    _budget.deposit()
+    for attempt in range(attempts):
+        _breaker.before_call()
+        try:
+            if timeout:
+                with pymongo.timeout(timeout):
+                    result = func(*args, **kwargs)
+            else:
+                result = func(*args, **kwargs)
+        except Exception as e:
+            if not is_unavailable(e):
+                # The server answered; only connectivity counts against the circuit
+                _breaker.record_success()
+                raise
+            _breaker.record_failure()
+            if attempt + 1 >= attempts or not _budget.withdraw():
+                raise
+            # Full jitter keeps many clients from retrying in lockstep
+            delay = random.uniform(0, RETRY_BACKOFF_SECONDS * 2 ** attempt)
+            logging.warning(f"{getattr(func, '__name__', 'call')} failed ({e}), retrying in {delay:.2f}s")
+            time.sleep(delay)
+        else:
+            _breaker.record_success()
+            return result
+
+def guarded(idempotent: bool = False, timeout: Optional[float] = None):
+    """Decorator form of run_guarded; reads default to the read deadline, writes to the write one"""
+    if timeout is None:
+        timeout = MONGODB_READ_TIMEOUT_SECONDS if idempotent else MONGODB_WRITE_TIMEOUT_SECONDS
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return run_guarded(func, *args, idempotent=idempotent, timeout=timeout, **kwargs)
+        return wrapper
+    return decorator
@@ -1,8 +1,16 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any, Iterable, Set, Tuple
 from enum import Enum
+import bisect
 import logging
+import threading
+from .config import INACTIVE_TOUR_STATUSES, STATE_NOTIFY_WINDOW_MS
+from .tour_schema import parse_datetime, tour_interval
+from .tour_store import TourColumns, to_micros
+
+# Index changes above which _by_start is rebuilt with one sort instead of per-entry inserts
+_START_INDEX_REBUILD = 256
 
 class TourStatus(str, Enum):
     SCHEDULED = "scheduled"
@@ -10,76 +18,319 @@ class TourStatus(str, Enum):
     CANCELLED = "cancelled"
     NO_SHOW = "no_show"
 
+# Status lookup by value (plain dict access is much cheaper than TourStatus(value) in bulk loads)
+_STATUSES = {status.value: status for status in TourStatus}
+
 @dataclass
 class TourState:
+    # Slotted: no per-instance __dict__ for the records handed to the UI
+    __slots__ = ('id', 'property_id', 'tour_time', 'end_time', 'status',
+                 'client_name', 'phone_number', 'created_at', 'updated_at')
     id: str
     property_id: str
-    tour_time: datetime
-    end_time: datetime
+    tour_time: Optional[datetime]  # None for tours with no usable time (shown as "No date")
+    end_time: Optional[datetime]
     status: TourStatus
     client_name: str
     phone_number: str
-    created_at: datetime
-    updated_at: datetime
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+def tour_state(tour: Dict[str, Any]) -> Optional[TourState]:
+    """Validate a tour document and build its TourState (None if invalid)
+
+    A missing created_at falls back to updated_at, then to the start
+    time. updated_at is left missing: it is the write queue's conflict
+    check, and the server compares it as stored.
+    """
+    try:
+        if not isinstance(tour.get('id'), str):
+            raise ValueError("Missing tour id")
+        status = _STATUSES.get(tour.get('status', 'scheduled')) or TourStatus(tour['status'])
+    except ValueError as e:
+        logging.warning(f"Tour {tour.get('id')} not stored: {e}")
+        return None
+    start, end = tour_interval(tour) or (None, None)
+    updated_at = parse_datetime(tour.get('updated_at'))
+    created_at = parse_datetime(tour.get('created_at')) or updated_at or start
+    return TourState(
+        id=tour['id'],
+        property_id=str(tour.get('property_id') or ''),
+        tour_time=start,
+        end_time=end,
+        status=status,
+        client_name=tour.get('client_name') or '',
+        phone_number=tour.get('phone_number') or '',
+        created_at=created_at,
+        updated_at=updated_at
+    )
+
+def tour_document(state: TourState) -> Dict[str, Any]:
+    """A record as a replica document (SYNC_PROJECTION fields; missing ones omitted)"""
+    document = {'_id': state.id, 'id': state.id, 'status': state.status.value,
+                'client_name': state.client_name, 'phone_number': state.phone_number}
+    for name in ('property_id', 'tour_time', 'end_time', 'created_at', 'updated_at'):
+        value = getattr(state, name)
+        if value:
+            document[name] = value
+    return document
+
+def insert_by_start(tours: List[TourState], tour: TourState, descending: bool = False):
+    """Insert a record into a list already in start order (binary search, no re-sort)"""
+    key = (to_micros(tour.tour_time), tour.id)
+    low, high = 0, len(tours)
+    while low < high:
+        middle = (low + high) // 2
+        other = (to_micros(tours[middle].tour_time), tours[middle].id)
+        if (other > key) if descending else (other < key):
+            low = middle + 1
+        else:
+            high = middle
+    tours.insert(low, tour)
+
+@dataclass
+class ChangeSet:
+    """Ids touched by one store update, for observers to patch instead of rebuild"""
+    entity: str  # 'tours' or 'properties'
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+    def merge(self, later: 'ChangeSet') -> 'ChangeSet':
+        """Net effect of this change set followed by a later one for the same entity"""
+        kinds = {}
+        for kind in ('added', 'updated', 'removed'):
+            for item_id in getattr(self, kind):
+                kinds[item_id] = kind
+        for item_id in later.added:
+            kinds[item_id] = 'updated' if kinds.get(item_id) == 'removed' else 'added'
+        for item_id in later.updated:
+            if kinds.get(item_id) != 'added':
+                kinds[item_id] = 'updated'
+        for item_id in later.removed:
+            if kinds.get(item_id) == 'added':
+                del kinds[item_id]  # Came and went within the batch
+            else:
+                kinds[item_id] = 'removed'
+        merged = ChangeSet(self.entity)
+        for item_id, kind in kinds.items():
+            getattr(merged, kind).append(item_id)
+        return merged
 
 class StateManager:
+    """In-memory tour and property store with secondary indexes
+
+    Tours live in a compact columnar table (see TourColumns) keyed by id and
+    indexed by property, status and start time, so single-record
+    upserts/removes and the common lookups cost O(1) or O(log n) instead of
+    a list scan, and long histories cost bytes per tour rather than a dict.
+    It is the only in-memory copy of the tours: TourSyncEngine writes its
+    replica straight into it and the UI renders its TourState records.
+
+    Every update computes what actually changed; updates that change
+    nothing notify nobody. Observers subscribe to entity types and receive
+    {entity: ChangeSet}. Without a dispatcher they are called at once, on
+    the thread that made the change. With one (see set_dispatcher) change
+    sets are merged per entity and delivered together, so a burst of
+    updates costs one redraw. Sync threads write while the UI reads, so the
+    store is guarded by a lock and observers are called outside it.
+    """
+
     def __init__(self):
-        self._tours: List[TourState] = []
-        self._properties: List[dict] = []
-        self._observers = []
+        self._lock = threading.RLock()
+        self._table = TourColumns(TourState, TourStatus)
+        self._by_property: Dict[str, Set[str]] = {}
+        self._by_status: Dict[TourStatus, Set[str]] = {}
+        self._by_start: List[Tuple[int, str]] = []  # (tour_time as epoch microseconds, id)
+        self._properties: Dict[str, dict] = {}
+        self._observers: List[Tuple[Callable, Optional[Set[str]]]] = []
+        self._dispatch: Optional[Callable[[Callable], None]] = None
+        self._window_seconds = 0.0
+        self._pending: Dict[str, ChangeSet] = {}
+        self._flush_scheduled = False
+
+    def add_observer(self, observer, entities: Optional[Iterable[str]] = None):
+        """Call observer({entity: ChangeSet}) when any of `entities` change (None: all)"""
+        self._observers.append((observer, set(entities) if entities is not None else None))
+
+    def set_dispatcher(self, dispatch: Callable[[Callable], None], window_ms: int = STATE_NOTIFY_WINDOW_MS):
+        """Batch notifications and deliver them through dispatch(callback)
+
+        Args:
+            dispatch: Runs a callback on the observers' thread, e.g.
+                TaskRunner.post (next Tk poll); must be thread-safe
+            window_ms: Extra time to keep collecting changes before dispatching
+        """
+        self._dispatch = dispatch
+        self._window_seconds = window_ms / 1000
+
+    def notify_observers(self, changes: ChangeSet):
+        if not changes:
+            return
+        if self._dispatch is None:
+            self._deliver({changes.entity: changes})
+            return
+        with self._lock:
+            pending = self._pending.get(changes.entity)
+            self._pending[changes.entity] = pending.merge(changes) if pending else changes
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        if self._window_seconds > 0:
+            timer = threading.Timer(self._window_seconds, self._dispatch, args=(self._flush,))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._dispatch(self._flush)
 
-    def add_observer(self, observer):
-        self._observers.append(observer)
+    def _flush(self):
+        with self._lock:
+            batch = {entity: changes for entity, changes in self._pending.items() if changes}
+            self._pending = {}
+            self._flush_scheduled = False
+        if batch:
+            self._deliver(batch)
 
-    def notify_observers(self):
-        for observer in self._observers:
-            observer()
+    def _deliver(self, batch: Dict[str, ChangeSet]):
+        for observer, entities in list(self._observers):
+            relevant = {entity: changes for entity, changes in batch.items()
+                        if entities is None or entity in entities}
+            if not relevant:
+                continue
+            try:
+                observer(relevant)
+            except Exception as e:
+                logging.error(f"State observer failed: {e}")
 
     def validate_tour_data(self, tour_data: Dict[str, Any]) -> bool:
-        """Validate tour data before creating TourState"""
-        required_fields = {
-            'id': str,
-            'property_id': str,
-            'tour_time': datetime,
-            'end_time': datetime,
-            'status': str,
-            'client_name': str,
-            'phone_number': str,
-            'created_at': datetime,
-            'updated_at': datetime
-        }
-        
-        try:
-            for field, field_type in required_fields.items():
-                if field not in tour_data:
-                    raise ValueError(f"Missing required field: {field}")
-                if not isinstance(tour_data[field], field_type):
-                    raise TypeError(f"Invalid type for {field}")
-            return True
-        except Exception as e:
-            logging.error(f"Tour data validation failed: {e}")
-            return False
-
-    def update_tours(self, tours: List[Dict[str, Any]]) -> None:
-        """Update tours with validation"""
-        validated_tours = []
-        for tour in tours:
-            if self.validate_tour_data(tour):
-                try:
-                    validated_tours.append(TourState(**tour))
-                except Exception as e:
-                    logging.error(f"Failed to create TourState: {e}")
-                    continue
-        
-        self._tours = validated_tours
-        self.notify_observers()
-
-    def get_tours(self):
-        return self._tours
-
-    def get_properties(self):
-        return self._properties
-
-    def update_properties(self, properties):
-        self._properties = properties
-        self.notify_observers() 
\ No newline at end of file
+        """Check a tour has what the store cannot default: an id and a known status
+
+        Times, server-side bookkeeping (created_at/updated_at) and contact
+        fields may be missing, e.g. on an optimistic local add or an older tour.
+        """
+        return tour_state(tour_data) is not None
+
+    # Index maintenance (callers hold the lock)
+    def _put(self, state: TourState, changes: ChangeSet, stale: List, fresh: List):
+        """Store one record; its _by_start entries to drop/add are collected in stale/fresh"""
+        previous = self._table.index_keys(state.id)
+        outcome = self._table.put(state)
+        if outcome is None:
+            return
+        if previous is not None:
+            self._unindex(state.id, previous, stale)
+        self._by_property.setdefault(state.property_id, set()).add(state.id)
+        self._by_status.setdefault(state.status, set()).add(state.id)
+        fresh.append((to_micros(state.tour_time), state.id))
+        (changes.added if outcome == 'added' else changes.updated).append(state.id)
+
+    def _drop(self, tour_id: str, changes: ChangeSet, stale: List):
+        previous = self._table.index_keys(tour_id)
+        if previous is not None:
+            self._table.remove(tour_id)
+            self._unindex(tour_id, previous, stale)
+            changes.removed.append(tour_id)
+
+    def _unindex(self, tour_id: str, keys: Tuple, stale: List):
+        property_id, status, tour_time = keys
+        self._by_property[property_id].discard(tour_id)
+        self._by_status[status].discard(tour_id)
+        stale.append((tour_time, tour_id))
+
+    def _update_start_index(self, stale: List, fresh: List):
+        """Apply collected _by_start changes: per entry for a few, one sort for a bulk load"""
+        if len(stale) + len(fresh) > _START_INDEX_REBUILD:
+            self._by_start = self._table.start_order()
+            return
+        for entry in stale:
+            position = bisect.bisect_left(self._by_start, entry)
+            if position < len(self._by_start) and self._by_start[position] == entry:
+                del self._by_start[position]
+        for entry in fresh:
+            bisect.insort(self._by_start, entry)
+
+    def _apply(self, states: List[TourState], removed_ids: Iterable[str], replace: bool = False) -> ChangeSet:
+        changes = ChangeSet('tours')
+        stale, fresh = [], []
+        with self._lock:
+            if replace:
+                incoming = {state.id for state in states}
+                removed_ids = [tour_id for tour_id in self._table.ids() if tour_id not in incoming]
+            for tour_id in removed_ids:
+                self._drop(tour_id, changes, stale)
+            for state in states:
+                self._put(state, changes, stale, fresh)
+            self._update_start_index(stale, fresh)
+        self.notify_observers(changes)
+        return changes
+
+    # Tour updates
+    def update_tours(self, tours: Iterable[Dict[str, Any]]) -> ChangeSet:
+        """Replace the tour set; observers get only what differs from before"""
+        states = [state for state in map(tour_state, tours) if state is not None]
+        return self._apply(states, (), replace=True)
+
+    def apply_changes(self, upserted: Iterable[Dict[str, Any]] = (),
+                      removed_ids: Iterable[str] = ()) -> ChangeSet:
+        """Insert/patch and drop tours in one step with a single notification"""
+        states = [state for state in map(tour_state, upserted) if state is not None]
+        return self._apply(states, removed_ids)
+
+    # Tour lookups
+    def get_tours(self) -> List[TourState]:
+        with self._lock:
+            return list(self._table.records())
+
+    def get_tour(self, tour_id: str) -> Optional[TourState]:
+        with self._lock:
+            return self._table.get(tour_id)
+
+    def dashboard_tours(self) -> Dict[str, List[TourState]]:
+        """Records for the dashboard tabs read off the indexes in one pass (no sort)
+
+        Returns:
+            Dict with 'active' (oldest first) and 'inactive' (newest first) tours
+        """
+        with self._lock:
+            past = set()
+            for status in INACTIVE_TOUR_STATUSES:
+                past |= self._by_status.get(TourStatus(status), set())
+            active, inactive = [], []
+            for _, tour_id in self._by_start:
+                (inactive if tour_id in past else active).append(self._table.get(tour_id))
+        inactive.reverse()
+        return {'active': active, 'inactive': inactive}
+
+    def count_by_status(self) -> Dict[TourStatus, int]:
+        """Tour totals per status from a scan of the status column"""
+        with self._lock:
+            return self._table.count_by_status()
+
+    # Properties
+    def get_properties(self) -> List[dict]:
+        with self._lock:
+            return list(self._properties.values())
+
+    def get_property(self, property_id) -> Optional[dict]:
+        return self._properties.get(str(property_id))
+
+    def update_properties(self, properties: List[dict]) -> ChangeSet:
+        """Replace the property set; observers get only what differs from before"""
+        incoming = {str(prop.get('_id') or prop.get('id')): prop for prop in properties}
+        changes = ChangeSet('properties')
+        with self._lock:
+            for property_id in self._properties:
+                if property_id not in incoming:
+                    changes.removed.append(property_id)
+            for property_id, prop in incoming.items():
+                existing = self._properties.get(property_id)
+                if existing is None:
+                    changes.added.append(property_id)
+                elif existing != prop:
+                    changes.updated.append(property_id)
+            self._properties = incoming
+        self.notify_observers(changes)
+        return changes
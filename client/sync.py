@@ -0,0 +1,281 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from bson import ObjectId
+from pymongo.errors import OperationFailure, PyMongoError
+from .api_client import TOUR_CARD_PROJECTION
+from .config import (
+    SYNC_POLL_INTERVAL_SECONDS, SYNC_WATERMARK_OVERLAP_SECONDS, TOMBSTONE_RETENTION_DAYS
+)
+from .state_manager import ChangeSet, StateManager, TourState, tour_document
+
+# Fields kept in the local replica: what the cards show plus the sync bookkeeping
+SYNC_PROJECTION = dict(TOUR_CARD_PROJECTION, updated_at=1, created_at=1)
+
+class TourSyncEngine:
+    """Local replica of the tours collection kept current incrementally
+
+    The first refresh downloads every tour once. Later refreshes only pull
+    tours whose 'updated_at' is past the watermark, plus tombstones left by
+    ApiClient.delete_tour, so a refresh costs O(changes). When the cluster
+    supports change streams, start() applies changes as they happen.
+
+    The replica is kept in a StateManager (the UI's store, when one is
+    passed), which also works out what each change set actually changed;
+    the engine only keeps the sync bookkeeping.
+    """
+
+    def __init__(self, api_client, cache=None, store: Optional[StateManager] = None):
+        self.db = api_client.db
+        self.cache = cache
+        self.store = store if store is not None else StateManager()
+        self._watermark: Optional[datetime] = None
+        self._synced_at: Optional[datetime] = None
+        self._resync_due = False
+        # The cached tours are read by load_cache(), off the Tk thread
+        self._cache_loaded = cache is None
+        self._deferred: List[Tuple[str, Dict]] = []
+        if cache is not None:
+            self._watermark = cache.get_datetime('tours_watermark')
+            self._synced_at = cache.get_datetime('tours_synced_at')
+            # Evicted past tours are missing from the copy and newer than no watermark
+            self._resync_due = cache.is_partial()
+        self._resume_token = None
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._overlay: Optional[Callable[[Dict], Dict]] = None
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_bootstrapped(self) -> bool:
+        return self._synced_at is not None
+
+    @property
+    def synced_at(self) -> Optional[datetime]:
+        """When the replica last reconciled with Atlas (possibly in a previous session)"""
+        return self._synced_at
+
+    def load_cache(self):
+        """Fill the store from the on-disk copy so the UI can render before Atlas answers
+
+        Runs once; later calls return at once. Loading a long history takes
+        a while, so call this off the Tk thread. Local changes made before
+        the load are applied on top of it.
+        """
+        with self._lock:
+            if self._cache_loaded:
+                return
+            changes = self.store.apply_changes(map(self._prepare, self.cache.get_tours()))
+            self._cache_loaded = True
+            deferred, self._deferred = self._deferred, []
+        self._notify(changes.added + changes.updated, [])
+        for tour_id, fields in deferred:
+            self.apply_local(tour_id, fields)
+
+    def _persist(self, upserted: List[str], removed: List[str], replace: bool = False):
+        """Mirror a change set into the on-disk cache"""
+        if self.cache is None:
+            return
+        try:
+            states = self.store.get_tours() if replace else map(self.store.get_tour, upserted)
+            tours = [tour_document(state) for state in states if state is not None]
+            self.cache.save_tours(tours, removed, replace=replace)
+            self.cache.set_meta(tours_watermark=self._watermark, tours_synced_at=self._synced_at)
+        except Exception as e:
+            logging.error(f"Failed to update local cache: {e}")
+
+    def add_listener(self, listener: Callable[[Dict], None]):
+        """Call listener with {'upserted': [...ids], 'removed': [...ids]} after each change set"""
+        self._listeners.append(listener)
+
+    def set_overlay(self, overlay: Optional[Callable[[Dict], Dict]]):
+        """Layer local changes not yet written to Atlas over every tour the replica receives"""
+        self._overlay = overlay
+
+    def _notify(self, upserted: List[str], removed: List[str]):
+        if not (upserted or removed):
+            return
+        changes = {'upserted': upserted, 'removed': removed}
+        for listener in self._listeners:
+            try:
+                listener(changes)
+            except Exception as e:
+                logging.error(f"Sync listener failed: {e}")
+
+    def _prepare(self, tour: Dict) -> Dict:
+        """Give a tour document string ids and layer local changes over it"""
+        tour['id'] = tour['_id'] = str(tour['_id'])
+        if self._overlay is not None:
+            tour = self._overlay(tour)
+        return tour
+
+    def _received(self, tour: Dict) -> Dict:
+        """Prepare a tour read from the tours collection and advance the watermark past it"""
+        updated_at = tour.get('updated_at') or tour.get('created_at')
+        if updated_at and (self._watermark is None or updated_at > self._watermark):
+            self._watermark = updated_at
+        return self._prepare(tour)
+
+    def _store(self, tours: Iterable[Dict], removed_ids: Iterable[str] = (),
+               replace: bool = False) -> ChangeSet:
+        """Apply a change set to the store and the cache (callers hold the lock)
+
+        The store skips tours it already holds unchanged (refreshes overlap
+        the previous window, so repeats are expected).
+        """
+        if replace:
+            changes = self.store.update_tours(tours)
+        else:
+            changes = self.store.apply_changes(tours, removed_ids)
+        self._persist(changes.added + changes.updated, changes.removed, replace=replace)
+        return changes
+
+    def _needs_full_resync(self) -> bool:
+        """Tombstones expire, so a replica older than their retention must start over"""
+        if self._synced_at is None or self._resync_due:
+            return True
+        return datetime.utcnow() - self._synced_at > timedelta(days=TOMBSTONE_RETENTION_DAYS)
+
+    def refresh(self) -> Dict:
+        """Pull changes since the last watermark into the replica
+
+        Returns:
+            Dict with the 'upserted' and 'removed' tour ids
+        """
+        self.load_cache()
+        with self._lock:
+            started_at = datetime.utcnow()
+            full_resync = self._needs_full_resync()
+            if full_resync:
+                self._watermark = None
+                tours = [self._received(tour) for tour in self.db.tours.find({}, SYNC_PROJECTION)]
+                removed_ids = []
+            else:
+                # Overlap the window a little so writers with skewed clocks are not missed
+                since = self._watermark or self._synced_at
+                since -= timedelta(seconds=SYNC_WATERMARK_OVERLAP_SECONDS)
+                changed = self.db.tours.find({'updated_at': {'$gt': since}}, SYNC_PROJECTION)
+                tours = [self._received(tour) for tour in changed]
+                tombstones = self.db.tour_tombstones.find({'deleted_at': {'$gt': since}})
+                removed_ids = [str(tombstone['_id']) for tombstone in tombstones]
+
+            # Deletes since the last sync are relative to when we asked, not to tour timestamps
+            self._synced_at = started_at
+            self._resync_due = False
+            if self._watermark is None:
+                self._watermark = started_at
+            changes = self._store(tours, removed_ids, replace=full_resync)
+
+        upserted = changes.added + changes.updated
+        self._notify(upserted, changes.removed)
+        return {'upserted': upserted, 'removed': changes.removed}
+
+    def apply_local(self, tour_id: str, fields: Dict):
+        """Optimistically apply a change made on this machine before Atlas confirms it"""
+        with self._lock:
+            if not self._cache_loaded:
+                # Applied on top of the cached copy by load_cache()
+                self._deferred.append((tour_id, fields))
+                return
+            current = self.store.get_tour(tour_id)
+            tour = tour_document(current) if current is not None else {'_id': tour_id}
+            tour.update({field: value for field, value in fields.items() if field in SYNC_PROJECTION})
+            tour['id'] = tour['_id'] = tour_id
+            changes = self._store([tour])
+        self._notify(changes.added + changes.updated, [])
+
+    def reload(self, tour_ids: List[str]) -> Dict:
+        """Replace the given tours with Atlas's current copies (dropping deleted ones)
+
+        Used after a local change was rejected, when the server copy may be
+        older than the watermark and so would never come back through refresh().
+        The watermark is left alone so other writers' changes are not skipped.
+        """
+        object_ids = [ObjectId(tour_id) for tour_id in tour_ids if ObjectId.is_valid(tour_id)]
+        found = list(self.db.tours.find({'_id': {'$in': object_ids}}, SYNC_PROJECTION))
+        missing = set(tour_ids) - {str(tour['_id']) for tour in found}
+        return self.apply_server_copies(found, removed_ids=missing)
+
+    def apply_server_copies(self, tours: List[Dict], removed_ids: Iterable[str] = ()) -> Dict:
+        """Patch tours Atlas just returned (e.g. a write's post-image) into the replica
+
+        Leaves the watermark alone, like reload(), so changes by other
+        writers still arrive through the next refresh().
+        """
+        self.load_cache()
+        with self._lock:
+            changes = self._store([self._prepare(dict(tour)) for tour in tours], removed_ids)
+        upserted = changes.added + changes.updated
+        self._notify(upserted, changes.removed)
+        return {'upserted': upserted, 'removed': changes.removed}
+
+    def get_tour(self, tour_id: str) -> Optional[TourState]:
+        return self.store.get_tour(tour_id)
+
+    def get_tours(self) -> List[TourState]:
+        return self.store.get_tours()
+
+    def _follow_change_stream(self) -> bool:
+        """Catch up, then apply change stream events until stopped
+
+        The stream is opened before the catch-up refresh, so writes landing
+        while it runs are queued on the stream instead of being missed.
+
+        Returns:
+            False if change streams are unavailable (nothing was refreshed)
+        """
+        try:
+            stream = self.db.tours.watch(full_document='updateLookup',
+                                         resume_after=self._resume_token)
+        except OperationFailure as e:
+            # Standalone servers (and some tiers) do not support change streams
+            logging.info(f"Change streams unavailable, falling back to polling: {e}")
+            return False
+        with stream:
+            self.refresh()
+            while not self._stop.is_set():
+                change = stream.try_next()
+                # Advances even while idle, so a reopened stream resumes from here
+                self._resume_token = stream.resume_token
+                if change is None:
+                    self._stop.wait(0.5)
+                    continue
+                with self._lock:
+                    if change['operationType'] == 'delete':
+                        changes = self._store((), [str(change['documentKey']['_id'])])
+                    elif change.get('fullDocument'):
+                        changes = self._store([self._received(change['fullDocument'])])
+                    else:
+                        continue
+                self._notify(changes.added + changes.updated, changes.removed)
+        return True
+
+    def _run(self, poll_interval: float):
+        use_change_stream = True
+        while not self._stop.is_set():
+            try:
+                if use_change_stream:
+                    use_change_stream = self._follow_change_stream()
+                    if use_change_stream:
+                        continue
+                self.refresh()
+            except PyMongoError as e:
+                logging.error(f"Tour sync failed: {e}")
+            self._stop.wait(poll_interval)
+
+    def start(self, poll_interval: float = SYNC_POLL_INTERVAL_SECONDS):
+        """Keep the replica current from a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(poll_interval,),
+                                        name='tour-sync', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,104 @@
+import contextvars
+import logging
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+from .config import DATA_WORKER_THREADS, TASK_IDLE_POLL_INTERVAL_MS, TASK_POLL_INTERVAL_MS
+
+class TaskRunner:
+    """Runs blocking data access on worker threads and hands results back on the Tk thread
+
+    Tk widgets may only be touched from the thread running mainloop, so
+    workers never call back directly: finished futures and posted calls are
+    picked up by a root.after poll, which runs quickly while work is pending
+    and idles slowly otherwise. The caller's context (e.g. the traced GUI
+    action) is carried to the worker and back to the callbacks.
+    """
+
+    def __init__(self, root, max_workers: int = DATA_WORKER_THREADS,
+                 poll_interval_ms: int = TASK_POLL_INTERVAL_MS,
+                 idle_poll_interval_ms: int = TASK_IDLE_POLL_INTERVAL_MS):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self.idle_poll_interval_ms = idle_poll_interval_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='data')
+        self._pending: List[Tuple[Future, contextvars.Context, Optional[Callable], Optional[Callable]]] = []
+        self._posted = queue.SimpleQueue()
+        self._fast = False
+        self._after_id = self.root.after(self.idle_poll_interval_ms, self._poll)
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._pending)
+
+    def submit(self, func: Callable, *args, on_success: Optional[Callable] = None,
+               on_error: Optional[Callable] = None, **kwargs) -> Future:
+        """Run func(*args, **kwargs) on a worker (call from the Tk thread only)
+
+        Args:
+            func: Blocking callable, typically an ApiClient method
+            on_success: Called with the return value on the Tk thread
+            on_error: Called with the raised exception on the Tk thread
+                (logged when omitted)
+        """
+        context = contextvars.copy_context()
+        future = self._executor.submit(context.run, func, *args, **kwargs)
+        self._pending.append((future, context, on_success, on_error))
+        if not self._fast and self._after_id is not None:
+            self._fast = True
+            self.root.after_cancel(self._after_id)
+            self._after_id = self.root.after(self.poll_interval_ms, self._poll)
+        return future
+
+    def post(self, func: Callable, *args):
+        """Run func(*args) on the Tk thread at the next poll; safe from any thread"""
+        self._posted.put((contextvars.copy_context(), func, args))
+
+    def _poll(self):
+        # Callbacks below may submit more work; the reschedule at the end covers it
+        self._fast = True
+        finished = []
+        still_pending = []
+        for entry in self._pending:
+            (finished if entry[0].done() else still_pending).append(entry)
+        self._pending = still_pending
+
+        for future, context, on_success, on_error in finished:
+            if future.cancelled():
+                continue
+            error = future.exception()
+            try:
+                if error is not None:
+                    if on_error:
+                        context.run(on_error, error)
+                    else:
+                        logging.error(f"Background task failed: {error}")
+                elif on_success:
+                    context.run(on_success, future.result())
+            except Exception as e:
+                logging.error(f"Background task callback failed: {e}")
+
+        while True:
+            try:
+                context, func, args = self._posted.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                context.run(func, *args)
+            except Exception as e:
+                logging.error(f"Posted call failed: {e}")
+
+        self._fast = bool(self._pending)
+        interval = self.poll_interval_ms if self._fast else self.idle_poll_interval_ms
+        self._after_id = self.root.after(interval, self._poll)
+
+    def shutdown(self):
+        """Drop queued work; running calls finish in the background"""
+        self._pending = []
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass  # The window is already gone
+            self._after_id = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from .config import DEFAULT_TOUR_DURATION
+
+# Canonical schedule fields: BSON datetimes for when a tour starts and ends
+TOUR_TIME_FIELDS = ('tour_time', 'end_time')
+
+# Older string/minute fields the canonical pair replaces
+LEGACY_TIME_FIELDS = ('date', 'time', 'duration')
+
+def parse_datetime(value) -> Optional[datetime]:
+    """Accept a datetime or an ISO string (as older edits stored); anything else is None"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+def _legacy_start(tour: Dict) -> Optional[datetime]:
+    """Start time from the old 'YYYY-MM-DD' date and 'HH:MM' time strings"""
+    try:
+        return datetime.strptime(f"{tour['date']} {tour['time']}", '%Y-%m-%d %H:%M')
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def tour_length(tour: Dict) -> Optional[timedelta]:
+    """How long a tour lasts, if both canonical times are known"""
+    start = parse_datetime(tour.get('tour_time'))
+    end = parse_datetime(tour.get('end_time'))
+    if start and end and end > start:
+        return end - start
+    return None
+
+def tour_interval(tour: Dict) -> Optional[Tuple[datetime, datetime]]:
+    """Return the (start, end) a tour occupies, or None if it has no usable times"""
+    start = parse_datetime(tour.get('tour_time')) or _legacy_start(tour)
+    if start is None:
+        return None
+    end = parse_datetime(tour.get('end_time'))
+    if end is None or end <= start:
+        end = start + timedelta(minutes=tour.get('duration') or DEFAULT_TOUR_DURATION)
+    return start, end
+
+def normalize_tour_times(tour_data: Dict, length: Optional[timedelta] = None) -> Dict:
+    """Rewrite tour fields in place to the canonical tour_time/end_time pair
+
+    Args:
+        tour_data: New tour or partial update; legacy date/time/duration and
+            ISO-string times are converted and the legacy fields removed
+        length: Duration to keep when only the start moves (defaults to the
+            tour's own duration, then DEFAULT_TOUR_DURATION)
+
+    Returns:
+        The same dict, for chaining
+    """
+    start = parse_datetime(tour_data.get('tour_time')) or _legacy_start(tour_data)
+    end = parse_datetime(tour_data.get('end_time'))
+    if start is not None:
+        if end is None or end <= start:
+            if length is None or tour_data.get('duration'):
+                length = timedelta(minutes=tour_data.get('duration') or DEFAULT_TOUR_DURATION)
+            end = start + length
+        tour_data['tour_time'] = start
+        tour_data['end_time'] = end
+    elif end is not None:
+        tour_data['end_time'] = end
+
+    for field in LEGACY_TIME_FIELDS:
+        tour_data.pop(field, None)
+    return tour_data
+
+def format_tour_time(start: Optional[datetime]) -> Tuple[str, str]:
+    """Display strings (date, time) for a tour card's start time"""
+    if start is None:
+        return 'No date', 'No time'
+    return start.strftime('%m/%d/%Y'), start.strftime('%I:%M %p')
@@ -0,0 +1,153 @@
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+EPOCH = datetime(1970, 1, 1)
+
+# Stored for a missing timestamp; sorts before every real one
+NO_TIME = -2 ** 63
+
+def to_micros(value: Optional[datetime]) -> int:
+    """Naive-UTC datetime -> integer microseconds since the epoch (lossless); None -> NO_TIME"""
+    if value is None:
+        return NO_TIME
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+def from_micros(value: int) -> Optional[datetime]:
+    return None if value == NO_TIME else EPOCH + timedelta(microseconds=value)
+
+class TourColumns:
+    """Array-backed tour table: one typed column per field, one row per tour
+
+    Timestamps are int64 microseconds, statuses one-byte codes and property
+    ids indexes into an interned list, so a row costs a few dozen bytes
+    instead of a dict of nine boxed objects. Missing timestamps are stored
+    as NO_TIME. Rows are packed: removing one moves the last row into its
+    slot. Records are built on demand by get().
+    """
+
+    def __init__(self, record_type, status_type):
+        self._record_type = record_type
+        self._statuses = list(status_type)
+        self._status_codes = {status: code for code, status in enumerate(self._statuses)}
+        self._rows: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._property_ids: List[str] = []
+        self._property_codes: Dict[str, int] = {}
+        self._property = array('I')
+        self._status = array('B')
+        self._tour_time = array('q')
+        self._end_time = array('q')
+        self._created_at = array('q')
+        self._updated_at = array('q')
+        self._client_name: List[str] = []
+        self._phone_number: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, tour_id: str) -> bool:
+        return tour_id in self._rows
+
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    def _property_code(self, property_id: str) -> int:
+        code = self._property_codes.get(property_id)
+        if code is None:
+            code = self._property_codes[property_id] = len(self._property_ids)
+            self._property_ids.append(sys.intern(property_id))
+        return code
+
+    def _encode(self, record) -> Tuple:
+        return (
+            self._property_code(record.property_id),
+            self._status_codes[record.status],
+            to_micros(record.tour_time),
+            to_micros(record.end_time),
+            to_micros(record.created_at),
+            to_micros(record.updated_at),
+            record.client_name,
+            record.phone_number
+        )
+
+    def _columns(self):
+        return (self._property, self._status, self._tour_time, self._end_time,
+                self._created_at, self._updated_at, self._client_name, self._phone_number)
+
+    def _row_values(self, row: int) -> Tuple:
+        return tuple(column[row] for column in self._columns())
+
+    def put(self, record) -> Optional[str]:
+        """Store a record; returns 'added', 'updated' or None when nothing changed"""
+        values = self._encode(record)
+        row = self._rows.get(record.id)
+        if row is None:
+            self._rows[record.id] = len(self._ids)
+            self._ids.append(record.id)
+            for column, value in zip(self._columns(), values):
+                column.append(value)
+            return 'added'
+        if self._row_values(row) == values:
+            return None
+        for column, value in zip(self._columns(), values):
+            column[row] = value
+        return 'updated'
+
+    def remove(self, tour_id: str) -> bool:
+        row = self._rows.pop(tour_id, None)
+        if row is None:
+            return False
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+            for column in self._columns():
+                column[row] = column[last]
+        self._ids.pop()
+        for column in self._columns():
+            column.pop()
+        return True
+
+    def get(self, tour_id: str):
+        row = self._rows.get(tour_id)
+        return None if row is None else self._record(row)
+
+    def _record(self, row: int):
+        return self._record_type(
+            id=self._ids[row],
+            property_id=self._property_ids[self._property[row]],
+            tour_time=from_micros(self._tour_time[row]),
+            end_time=from_micros(self._end_time[row]),
+            status=self._statuses[self._status[row]],
+            client_name=self._client_name[row],
+            phone_number=self._phone_number[row],
+            created_at=from_micros(self._created_at[row]),
+            updated_at=from_micros(self._updated_at[row])
+        )
+
+    def records(self) -> Iterator:
+        for row in range(len(self._ids)):
+            yield self._record(row)
+
+    def index_keys(self, tour_id: str) -> Optional[Tuple]:
+        """(property_id, status, tour_time micros) of a stored tour, without building its record"""
+        row = self._rows.get(tour_id)
+        if row is None:
+            return None
+        return (self._property_ids[self._property[row]], self._statuses[self._status[row]],
+                self._tour_time[row])
+
+    # Column scans (no records are built)
+    def count_by_status(self) -> Dict:
+        return {self._statuses[code]: count for code, count in Counter(self._status).items()}
+
+    def start_order(self) -> List[Tuple[int, str]]:
+        """(tour_time micros, id) for every row, sorted"""
+        return sorted(zip(self._tour_time, self._ids))
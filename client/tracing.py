@@ -0,0 +1,169 @@
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from bson import json_util
+from pymongo import monitoring
+from .config import TRACE_ACTION_HISTORY, TRACE_COMMANDS, TRACE_SLOW_COMMAND_MS
+
+# Command fields that vary per call without changing what was asked for
+_NOISE_FIELDS = {
+    'lsid', '$clusterTime', '$db', 'txnNumber', 'autocommit', 'startTransaction',
+    '$readPreference', 'readConcern', 'writeConcern', 'maxTimeMS', 'apiVersion'
+}
+
+# Commands whose repetition inside one action means a redundant round trip
+_READ_COMMANDS = {'find', 'aggregate', 'count', 'distinct'}
+
+def _shape(value):
+    """Structure of a command with literal values replaced by '?'"""
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        if len(value) > 1:
+            return [_shape(value[0]), f"...x{len(value)}"]
+        return [_shape(item) for item in value]
+    return '?'
+
+def _describe(command_name: str, command: Dict, with_values: bool = False) -> str:
+    """Shape of a command (literal values replaced by '?'), or its full text with_values"""
+    body = {key: value for key, value in command.items() if key not in _NOISE_FIELDS}
+    target = body.pop(command_name, None)
+    return json_util.dumps({command_name: target, **(body if with_values else _shape(body))}, sort_keys=True)
+
+def _documents_returned(reply: Dict) -> int:
+    cursor = reply.get('cursor') if isinstance(reply, dict) else None
+    if isinstance(cursor, dict):
+        return len(cursor.get('firstBatch', cursor.get('nextBatch', [])))
+    return 0
+
+class ActionTrace:
+    """Driver commands issued on behalf of one GUI action"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.time()
+        self.commands: List[Dict] = []
+        self.repeated: Dict[str, int] = {}
+        self._seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict, command: Dict):
+        # Only reads are checked for repeats, so only they pay for the literal-value text
+        identity = _describe(record['command'], command, with_values=True) if record['command'] in _READ_COMMANDS else None
+        with self._lock:
+            self.commands.append(record)
+            if identity is None:
+                return
+            count = self._seen[identity] = self._seen.get(identity, 0) + 1
+            if count > 1:
+                self.repeated[record['shape']] = count
+        if count == 2:
+            logging.warning(f"Repeated query in {self.name}: {record['command']} {record['shape']}")
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                'action': self.name,
+                'started_at': self.started_at,
+                'commands': len(self.commands),
+                'duration_ms': round(sum(command['duration_ms'] for command in self.commands), 2),
+                'documents': sum(command['documents'] for command in self.commands),
+                'slow': sum(1 for command in self.commands if command['slow']),
+                'failed': sum(1 for command in self.commands if command['error']),
+                'repeated': dict(self.repeated)
+            }
+
+_current_action: ContextVar[Optional[ActionTrace]] = ContextVar('toursync_action', default=None)
+
+class CommandTracer(monitoring.CommandListener):
+    """Attributes driver commands to the GUI action that caused them
+
+    The action travels in a context variable, which TaskRunner copies onto
+    its worker threads, so commands issued in the background still land on
+    the action that submitted them. Slow commands are logged whether or not
+    an action is active.
+    """
+
+    def __init__(self, slow_ms: float = TRACE_SLOW_COMMAND_MS, history: int = TRACE_ACTION_HISTORY):
+        self.slow_ms = slow_ms
+        self._inflight: Dict[tuple, tuple] = {}
+        self._actions = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def begin(self, name: str) -> ActionTrace:
+        trace = ActionTrace(name)
+        with self._lock:
+            self._actions.append(trace)
+        return trace
+
+    def recent_actions(self) -> List[Dict]:
+        """Summaries of the latest actions, newest first"""
+        with self._lock:
+            actions = list(self._actions)
+        return [trace.summary() for trace in reversed(actions)]
+
+    def started(self, event):
+        # Nothing is serialized here: the shape is only built for traced actions and slow commands
+        with self._lock:
+            self._inflight[(event.request_id, event.connection_id)] = (_current_action.get(), event.command)
+
+    def succeeded(self, event):
+        self._finish(event, _documents_returned(event.reply), None)
+
+    def failed(self, event):
+        self._finish(event, 0, event.failure)
+
+    def _finish(self, event, documents: int, error):
+        with self._lock:
+            action, command = self._inflight.pop((event.request_id, event.connection_id), (None, None))
+        duration_ms = event.duration_micros / 1000
+        slow = duration_ms >= self.slow_ms
+        if command is None or (action is None and not slow):
+            return
+        shape = _describe(event.command_name, command)
+        if slow:
+            owner = action.name if action else 'background'
+            logging.warning(f"Slow {event.command_name} ({duration_ms:.0f} ms) in {owner}: {shape}")
+        if action is not None:
+            action.add({
+                'command': event.command_name,
+                'shape': shape,
+                'duration_ms': round(duration_ms, 2),
+                'documents': documents,
+                'slow': slow,
+                'error': error
+            }, command)
+
+_tracer = CommandTracer()
+
+def get_tracer() -> CommandTracer:
+    """The process-wide tracer registered on the shared MongoClient"""
+    return _tracer
+
+def traced_action(name: Optional[str] = None):
+    """Decorator attributing the commands a GUI handler triggers to `name`
+
+    Nested handlers (edit_tour building a property dropdown, ...) stay part
+    of the outermost action so repeats across them are caught. With
+    TRACE_COMMANDS off handlers are returned unwrapped.
+    """
+    def decorator(func):
+        if not TRACE_COMMANDS:
+            return func
+        action_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_action.get() is not None:
+                return func(*args, **kwargs)
+            token = _current_action.set(_tracer.begin(action_name))
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _current_action.reset(token)
+        return wrapper
+    return decorator
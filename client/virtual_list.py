@@ -0,0 +1,255 @@
+import copy
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from .config import VIRTUAL_LIST_BUFFER_ROWS, VIRTUAL_LIST_POOL_SIZE
+
+def _default_key(item) -> Hashable:
+    return item.get('id') or str(item.get('_id'))
+
+class _Row:
+    """A row widget on the canvas and the item it currently shows"""
+    __slots__ = ('widget', 'window', 'item', 'index')
+
+    def __init__(self, widget: tk.Widget, window: int, item: Any, index: int):
+        self.widget = widget
+        self.window = window
+        self.item = item
+        self.index = index
+
+class VirtualList(ttk.Frame):
+    """Scrollable list that only builds widgets for the rows in view
+
+    Rows share one height (measured from the first row unless given) and
+    sit on a Canvas at index * row_height, so the scroll region covers
+    every item while only the visible rows, plus `buffer_rows` above and
+    below, exist as widgets.
+
+    Rows are keyed by item id and reconciled against each new item list:
+    a row whose item is unchanged stays as it is (moved if its index
+    shifted), a changed item is patched in place through `update`, and
+    rows leaving the view are parked off-screen in a pool and handed to
+    the next items coming into view. So a status change on one tour
+    touches one card, and scrolling reconfigures widgets rather than
+    building them.
+
+    Args:
+        render: render(parent, item) -> widget for one row; must not pack
+            or grid the widget (the canvas places it)
+        update: update(widget, item) points an existing row widget at
+            another item; without it changed rows are rebuilt and nothing
+            is pooled
+        key: key(item) -> identity of an item across refreshes
+        row_gap: Vertical space between rows, in pixels
+    """
+
+    def __init__(self, parent, render: Callable, update: Optional[Callable] = None,
+                 key: Callable[[Any], Hashable] = _default_key, row_height: Optional[int] = None,
+                 row_gap: int = 0, buffer_rows: int = VIRTUAL_LIST_BUFFER_ROWS,
+                 pool_size: int = VIRTUAL_LIST_POOL_SIZE, background: str = '#FFFFFF', **kwargs):
+        kwargs.setdefault('style', 'Card.TFrame')
+        super().__init__(parent, **kwargs)
+        self.render = render
+        self.update_row = update
+        self.key = key
+        self.row_height = row_height
+        self.row_gap = row_gap
+        self.buffer_rows = buffer_rows
+        self.pool_size = pool_size if update is not None else 0
+        self.items: List = []
+        self._rows: Dict[Hashable, _Row] = {}
+        self._pool: List[Tuple[tk.Widget, int]] = []
+        self._placeholder: Optional[Tuple[tk.Widget, int]] = None
+        self._refresh_pending = False
+
+        self.canvas = tk.Canvas(self, background=background, highlightthickness=0,
+                                yscrollincrement=20)
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_scrolled)
+        self.scrollbar.pack(side='right', fill='y')
+        self.canvas.pack(side='left', fill='both', expand=True)
+
+        self.canvas.bind('<Configure>', self._on_resize)
+        # Wheel events go to the widget under the pointer, so listen globally while inside
+        self.bind('<Enter>', self._bind_wheel)
+        self.bind('<Leave>', self._unbind_wheel)
+
+    # Content
+    def set_items(self, items: List):
+        """Show items, keeping the scroll position (clamped to the new length)
+
+        Rows already on screen are matched to the new items by key, so only
+        added, removed and changed items cost widget work.
+        """
+        top = self.canvas.canvasy(0)
+        self._clear_placeholder()
+        self.items = list(items)
+        if self.items and self.row_height is None:
+            self.row_height = self._measure(self.items[0])
+        self._update_scroll_region()
+        total = self._content_height()
+        if total:
+            self.canvas.yview_moveto(min(top, max(total - self.canvas.winfo_height(), 0)) / total)
+        self._refresh()
+
+    def widgets(self) -> List[tk.Widget]:
+        """The row widgets currently built for items in view (pooled rows excluded)"""
+        return [row.widget for row in self._rows.values()]
+
+    def show_placeholder(self, build: Callable):
+        """Replace the rows with a single widget, e.g. a loading or empty message
+
+        build(parent) fills the given frame (pack/grid inside it freely).
+        """
+        for key in list(self._rows):
+            self._release_row(key)
+        self._clear_placeholder()
+        self.items = []
+        frame = ttk.Frame(self.canvas, style='Card.TFrame')
+        build(frame)
+        window = self.canvas.create_window(0, 0, anchor='nw', window=frame,
+                                           width=max(self.canvas.winfo_width(), 1))
+        self._placeholder = (frame, window)
+        self.canvas.configure(scrollregion=(0, 0, 0, 0))
+        self.canvas.yview_moveto(0)
+
+    def _clear_placeholder(self):
+        if self._placeholder is not None:
+            frame, window = self._placeholder
+            self.canvas.delete(window)
+            frame.destroy()
+            self._placeholder = None
+
+    # Rows
+    def _measure(self, item) -> int:
+        widget = self.render(self.canvas, item)
+        widget.update_idletasks()
+        height = widget.winfo_reqheight() + self.row_gap
+        if len(self._pool) < self.pool_size:
+            # Already built: park it for the first row instead of throwing it away
+            window = self.canvas.create_window(0, self._offscreen(height), anchor='nw', window=widget,
+                                               width=max(self.canvas.winfo_width(), 1),
+                                               height=height - self.row_gap)
+            self._pool.append((widget, window))
+        else:
+            widget.destroy()
+        return max(height, 1)
+
+    def _offscreen(self, height: Optional[int] = None) -> int:
+        # Above the scroll region, which starts at 0, so never visible
+        return -2 * (height or self.row_height or 1)
+
+    def _content_height(self) -> int:
+        return len(self.items) * (self.row_height or 0)
+
+    def _update_scroll_region(self):
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), self._content_height()))
+
+    def _visible_range(self) -> Tuple[int, int]:
+        if not self.items or not self.row_height:
+            return 0, 0
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first = max(int(top // self.row_height) - self.buffer_rows, 0)
+        last = min(int(bottom // self.row_height) + 1 + self.buffer_rows, len(self.items))
+        return first, last
+
+    def _acquire_row(self, key: Hashable, index: int):
+        item = self.items[index]
+        if self._pool:
+            widget, window = self._pool.pop()
+            self.update_row(widget, item)
+            self.canvas.coords(window, 0, index * self.row_height)
+        else:
+            widget = self.render(self.canvas, item)
+            window = self.canvas.create_window(
+                0, index * self.row_height, anchor='nw', window=widget,
+                width=max(self.canvas.winfo_width(), 1), height=self.row_height - self.row_gap
+            )
+        self._rows[key] = _Row(widget, window, copy.copy(item), index)
+
+    def _release_row(self, key: Hashable):
+        row = self._rows.pop(key)
+        if len(self._pool) < self.pool_size:
+            self.canvas.coords(row.window, 0, self._offscreen())
+            self._pool.append((row.widget, row.window))
+        else:
+            self.canvas.delete(row.window)
+            row.widget.destroy()
+
+    def _sync_row(self, row: _Row, index: int):
+        """Bring a kept row up to date with the item now at index"""
+        item = self.items[index]
+        if item != row.item:
+            if self.update_row is None:
+                self.canvas.delete(row.window)
+                row.widget.destroy()
+                row.widget = self.render(self.canvas, item)
+                row.window = self.canvas.create_window(
+                    0, index * self.row_height, anchor='nw', window=row.widget,
+                    width=max(self.canvas.winfo_width(), 1), height=self.row_height - self.row_gap
+                )
+                row.index = index
+            else:
+                self.update_row(row.widget, item)
+            row.item = copy.copy(item)
+        if row.index != index:
+            self.canvas.coords(row.window, 0, index * self.row_height)
+            row.index = index
+
+    def _refresh(self):
+        """Reconcile the rows on the canvas with the items in view"""
+        self._refresh_pending = False
+        if not self.winfo_exists():
+            return
+        first, last = self._visible_range()
+        wanted = {self.key(self.items[index]): index for index in range(first, last)}
+        for key in [key for key in self._rows if key not in wanted]:
+            self._release_row(key)
+        for key, index in wanted.items():
+            row = self._rows.get(key)
+            if row is None:
+                self._acquire_row(key, index)
+            else:
+                self._sync_row(row, index)
+
+    def _schedule_refresh(self):
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.after_idle(self._refresh)
+
+    # Events
+    def _on_scrolled(self, first, last):
+        self.scrollbar.set(first, last)
+        self._schedule_refresh()
+
+    def _on_resize(self, event):
+        for row in self._rows.values():
+            self.canvas.itemconfigure(row.window, width=event.width)
+        for widget, window in self._pool:
+            self.canvas.itemconfigure(window, width=event.width)
+        if self._placeholder is not None:
+            self.canvas.itemconfigure(self._placeholder[1], width=event.width)
+        self._update_scroll_region()
+        self._schedule_refresh()
+
+    def _on_wheel(self, event):
+        if not self.items:
+            return
+        # Button-4/5 on X11; MouseWheel with a signed delta elsewhere
+        direction = -1 if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0 else 1
+        self.canvas.yview_scroll(direction * 3, 'units')
+
+    def _bind_wheel(self, event):
+        self.bind_all('<MouseWheel>', self._on_wheel)
+        self.bind_all('<Button-4>', self._on_wheel)
+        self.bind_all('<Button-5>', self._on_wheel)
+
+    def _unbind_wheel(self, event):
+        # Moving onto a row also fires <Leave>; only unbind when really outside
+        inside = self.winfo_containing(*self.winfo_pointerxy())
+        if inside is not None and str(inside).startswith(str(self)):
+            return
+        self.unbind_all('<MouseWheel>')
+        self.unbind_all('<Button-4>')
+        self.unbind_all('<Button-5>')
@@ -0,0 +1,398 @@
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from bson import ObjectId, json_util
+from .api_client import as_object_id
+from .config import (
+    WRITE_FLUSH_BATCH_SIZE, WRITE_FLUSH_DELAY_SECONDS, WRITE_JOURNAL_PATH, WRITE_RETRY_INTERVAL_SECONDS
+)
+from .resilience import is_unavailable
+from .tour_schema import TOUR_TIME_FIELDS, normalize_tour_times
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_writes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    tour_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    base_updated_at TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pending_writes_tour ON pending_writes (tour_id, seq);
+"""
+
+# Changes that move a tour in time or between properties need the booking guard
+_GUARDED_FIELDS = TOUR_TIME_FIELDS + ('property_id',)
+
+def coalesce(ops: List[Dict]) -> Dict:
+    """Fold one tour's queued operations (oldest first) into a single write
+
+    Later values win, and a status change drops the timestamp/notes fields
+    of the statuses it replaces, so scheduled -> cancelled -> completed is
+    sent as one 'completed' update.
+
+    Returns:
+        Dict with 'tour_id', 'kind' ('add' or 'update'), 'fields',
+        'base_updated_at', 'last_seq' and 'count'
+    """
+    fields: Dict = {}
+    status_fields = set()
+    for op in ops:
+        if op['kind'] == 'status':
+            for field in status_fields:
+                fields.pop(field, None)
+            status_fields = set(op['fields']) - {'status'}
+        fields.update(op['fields'])
+    return {
+        'tour_id': ops[0]['tour_id'],
+        'kind': 'add' if ops[0]['kind'] == 'add' else 'update',
+        'fields': fields,
+        'base_updated_at': ops[0]['base_updated_at'],
+        'last_seq': ops[-1]['seq'],
+        'count': len(ops)
+    }
+
+class WriteQueue:
+    """Durable write-behind journal for tour changes
+
+    add_tour, update_tour and update_tour_status append to a SQLite (WAL)
+    journal and apply to the local replica straight away, so the UI never
+    waits on Atlas and nothing is lost if the app or the link goes down. A
+    background flusher coalesces each tour's queued changes and sends them
+    in batches. Updates only apply if the tour is unchanged on the server
+    since it was edited here; rejected changes are rolled back locally and
+    reported through pop_conflicts().
+    """
+
+    def __init__(self, api_client, sync_engine, path: str = WRITE_JOURNAL_PATH):
+        self.api_client = api_client
+        self.sync_engine = sync_engine
+        self.path = path
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, Dict] = {}
+        self._conflicts: List[Dict] = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        # Every queued change must survive a crash or power loss
+        self._conn.execute('PRAGMA synchronous=FULL')
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+        self._reload_pending()
+
+        # Keep queued changes visible over whatever the server sends until they land
+        sync_engine.set_overlay(self.overlay)
+        for tour_id, entry in list(self._pending.items()):
+            sync_engine.apply_local(tour_id, entry['fields'])
+
+    @property
+    def pending_count(self) -> int:
+        """Tours with changes not yet written to Atlas"""
+        return len(self._pending)
+
+    def _reload_pending(self, tour_ids: Optional[Iterable[str]] = None):
+        """Rebuild the coalesced view of the journal (for some tours, or all)"""
+        query = 'SELECT seq, tour_id, kind, fields, base_updated_at FROM pending_writes'
+        params: List = []
+        if tour_ids is not None:
+            tour_ids = list(tour_ids)
+            if not tour_ids:
+                return
+            query += f" WHERE tour_id IN ({', '.join('?' * len(tour_ids))})"
+            params = tour_ids
+        rows = self._conn.execute(query + ' ORDER BY seq', params).fetchall()
+
+        ops: Dict[str, List[Dict]] = {}
+        for seq, tour_id, kind, fields, base_updated_at in rows:
+            ops.setdefault(tour_id, []).append({
+                'seq': seq,
+                'tour_id': tour_id,
+                'kind': kind,
+                'fields': json_util.loads(fields),
+                'base_updated_at': datetime.fromisoformat(base_updated_at) if base_updated_at else None
+            })
+        for tour_id in (tour_ids if tour_ids is not None else list(self._pending)):
+            self._pending.pop(tour_id, None)
+        for tour_id, tour_ops in ops.items():
+            self._pending[tour_id] = coalesce(tour_ops)
+
+    def _enqueue(self, changes: List[Tuple[str, str, Dict, Optional[datetime]]]):
+        """Journal (tour_id, kind, fields, base_updated_at) changes in one transaction, then apply them locally"""
+        created_at = datetime.utcnow().isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT INTO pending_writes (tour_id, kind, fields, base_updated_at, created_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [(tour_id, kind, json_util.dumps(fields),
+                  base_updated_at.isoformat() if base_updated_at else None, created_at)
+                 for tour_id, kind, fields, base_updated_at in changes]
+            )
+            self._reload_pending([tour_id for tour_id, _, _, _ in changes])
+        for tour_id, _, fields, _ in changes:
+            self.sync_engine.apply_local(tour_id, fields)
+        self._wake.set()
+
+    # Tour changes (same arguments as the ApiClient methods they stand in for)
+    def add_tour(self, tour_data: Dict) -> str:
+        """Queue a new tour; returns its id (assigned here, so retries can't duplicate it)"""
+        tour_id = str(ObjectId())
+        fields = normalize_tour_times(dict(tour_data))
+        if 'property_id' in fields:
+            fields['property_id'] = as_object_id(fields['property_id'])
+        fields.setdefault('status', 'scheduled')
+        fields['created_at'] = datetime.utcnow()
+        self._enqueue([(tour_id, 'add', fields, None)])
+        return tour_id
+
+    def update_tour(self, tour_id: str, tour_data: Dict):
+        """Queue field changes to a tour"""
+        current = self.sync_engine.get_tour(tour_id)
+        fields = dict(tour_data)
+        if 'property_id' in fields:
+            fields['property_id'] = as_object_id(fields['property_id'])
+        if any(field in fields for field in TOUR_TIME_FIELDS):
+            # Moving only the start keeps the tour's existing length
+            length = None
+            if current is not None and current.tour_time and current.end_time:
+                length = current.end_time - current.tour_time
+            normalize_tour_times(fields, length=length)
+        self._enqueue([(tour_id, 'update', fields, current.updated_at if current else None)])
+
+    def update_tour_status(self, tour_id, status: str, notes: str = None):
+        """Queue a status change (tour_id may be a tour dict, as with ApiClient)"""
+        self.update_tour_statuses([tour_id], status, notes)
+
+    def update_tour_statuses(self, tour_ids: List, status: str, notes: str = None):
+        """Queue one status change for several tours (journaled in one transaction)"""
+        now = datetime.utcnow()
+        changes = []
+        for tour_id in tour_ids:
+            if isinstance(tour_id, dict):
+                tour_id = tour_id.get('id') or tour_id.get('_id')
+            tour_id = str(tour_id)
+            fields = {'status': status, f'{status}_at': now}
+            if notes:
+                fields[f'{status}_notes'] = notes
+            current = self.sync_engine.get_tour(tour_id)
+            changes.append((tour_id, 'status', fields, current.updated_at if current else None))
+        self._enqueue(changes)
+
+    def delete_tour(self, tour_id: str) -> Dict:
+        """Delete a tour once its queued changes are written (blocking; run on a worker)"""
+        tour_id = str(tour_id)
+        self._flush_tours([tour_id])
+        result = self.api_client.delete_tour(tour_id)
+        if result.get('success'):
+            self._forget([tour_id])
+        return result
+
+    def delete_tours(self, tour_ids: List[str]) -> Dict:
+        """Delete several tours once their queued changes are written (blocking; run on a worker)
+
+        Deleting around the queue would roll pending edits back as false
+        conflicts and report tours added here but not yet sent as missing.
+
+        Returns:
+            ApiClient.delete_tours results
+        """
+        tour_ids = [str(tour_id) for tour_id in tour_ids]
+        self._flush_tours(tour_ids)
+        result = self.api_client.delete_tours(tour_ids)
+        deleted = [item['id'] for item in result.get('results', []) if item['success']]
+        if deleted:
+            self._forget(deleted)
+        return result
+
+    def _flush_tours(self, tour_ids: List[str]):
+        """Send whatever is queued for these tours; stops early if Atlas is unreachable"""
+        waiting = [tour_id for tour_id in tour_ids if tour_id in self._pending]
+        while waiting:
+            result = self.flush(waiting)
+            if not (result['flushed'] or result['rejected']):
+                return
+            waiting = [tour_id for tour_id in waiting if tour_id in self._pending]
+
+    def _forget(self, tour_ids: List[str]):
+        """Drop deleted tours from the journal and the replica"""
+        with self._lock, self._conn:
+            self._conn.executemany('DELETE FROM pending_writes WHERE tour_id = ?',
+                                   [(tour_id,) for tour_id in tour_ids])
+            self._reload_pending(tour_ids)
+        self.sync_engine.apply_server_copies([], removed_ids=tour_ids)
+
+    def overlay(self, tour: Dict) -> Dict:
+        """A server copy of a tour with this machine's queued changes applied"""
+        entry = self._pending.get(tour['id'])
+        if entry is None:
+            return tour
+        return dict(tour, **entry['fields'])
+
+    def pop_conflicts(self) -> List[Dict]:
+        """Changes Atlas rejected since the last call ({'tour_id', 'kind', 'fields', 'error'})"""
+        with self._lock:
+            conflicts, self._conflicts = self._conflicts, []
+        return conflicts
+
+    # Flushing
+    def _send(self, entry: Dict) -> Dict:
+        """Write one coalesced add or schedule change through the booking guard"""
+        fields = dict(entry['fields'])
+        if entry['kind'] == 'add':
+            # add_tour treats an id it already stored as success, so an add replayed after a
+            # flush that stopped before clearing the journal does not conflict with itself
+            return self.api_client.add_tour(dict(fields, _id=ObjectId(entry['tour_id'])))
+        return self.api_client.update_tour(entry['tour_id'], fields,
+                                           expected_updated_at=entry['base_updated_at'])
+
+    def flush(self, tour_ids: Optional[Iterable[str]] = None) -> Dict:
+        """Send queued changes to Atlas
+
+        Args:
+            tour_ids: Only send these tours' changes (default: everything queued)
+
+        Returns:
+            Dict with 'flushed' and 'rejected' tour counts (changes left
+            queued because the cluster is unreachable are retried later)
+        """
+        with self._flush_lock:
+            with self._lock:
+                entries = self._pending.values()
+                if tour_ids is not None:
+                    wanted = set(tour_ids)
+                    entries = [entry for entry in entries if entry['tour_id'] in wanted]
+                entries = sorted(entries, key=lambda entry: entry['last_seq'])
+                entries = [dict(entry) for entry in entries[:WRITE_FLUSH_BATCH_SIZE]]
+
+            done, rejected = [], []
+            try:
+                # Plain field/status changes share one bulk round trip
+                simple, guarded = [], []
+                for entry in entries:
+                    needs_guard = entry['kind'] == 'add' or any(field in entry['fields'] for field in _GUARDED_FIELDS)
+                    (guarded if needs_guard else simple).append(entry)
+                if simple:
+                    result = self.api_client.apply_tour_changes([
+                        {'id': entry['tour_id'], 'fields': entry['fields'],
+                         'expected_updated_at': entry['base_updated_at']}
+                        for entry in simple
+                    ])
+                    if 'error' in result:
+                        # Connectivity failures raise, so this batch would fail the same way on every retry
+                        rejected.extend((entry, result['error']) for entry in simple)
+                    else:
+                        for entry, item in zip(simple, result['results']):
+                            if item['success']:
+                                done.append((entry, None))
+                            else:
+                                rejected.append((entry, item.get('error')))
+
+                for entry in guarded:
+                    try:
+                        result = self._send(entry)
+                    except Exception as e:
+                        if is_unavailable(e):
+                            raise
+                        logging.error(f"Failed to flush queued change to tour {entry['tour_id']}: {e}")
+                        result = {'success': False, 'error': str(e)}
+                    if result['success']:
+                        done.append((entry, result.get('tour')))
+                    else:
+                        rejected.append((entry, result.get('error')))
+            except Exception as e:
+                if not is_unavailable(e):
+                    logging.error(f"Failed to flush queued tour changes: {e}")
+                else:
+                    logging.info(f"Atlas unreachable, {len(entries) - len(done) - len(rejected)} tour changes stay queued")
+            finally:
+                self._complete(done, rejected)
+            return {'flushed': len(done), 'rejected': len(rejected)}
+
+    def _complete(self, done: List, rejected: List):
+        """Clear written or rejected changes from the journal and resync those tours
+
+        Args:
+            done: (entry, post-image or None) for each tour written
+            rejected: (entry, error) for each tour Atlas refused
+        """
+        finished = done + rejected
+        if not finished:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'DELETE FROM pending_writes WHERE tour_id = ? AND seq <= ?',
+                [(entry['tour_id'], entry['last_seq']) for entry, _ in finished]
+            )
+            self._reload_pending([entry['tour_id'] for entry, _ in finished])
+            for entry, error in rejected:
+                logging.warning(f"Queued change to tour {entry['tour_id']} rejected: {error}")
+                self._conflicts.append({
+                    'tour_id': entry['tour_id'],
+                    'kind': entry['kind'],
+                    'fields': entry['fields'],
+                    'error': error or 'Unknown error'
+                })
+        try:
+            # Written tours get their new updated_at (from the post-image when the
+            # write returned one); rejected ones roll back to the server copy
+            images = [tour for _, tour in done if tour]
+            if images:
+                self.sync_engine.apply_server_copies(images)
+            imaged = {tour['id'] for tour in images}
+            stale = [entry['tour_id'] for entry, _ in finished if entry['tour_id'] not in imaged]
+            if stale:
+                self.sync_engine.reload(stale)
+        except Exception as e:
+            logging.error(f"Failed to reload flushed tours: {e}")
+            return
+
+        # Changes queued while this flush ran were based on the copy we just replaced
+        rebase = []
+        for entry, _ in done:
+            current = self.sync_engine.get_tour(entry['tour_id'])
+            if entry['tour_id'] in self._pending and current is not None and current.updated_at:
+                rebase.append((current.updated_at.isoformat(), entry['tour_id']))
+        if rebase:
+            with self._lock, self._conn:
+                self._conn.executemany('UPDATE pending_writes SET base_updated_at = ? WHERE tour_id = ?', rebase)
+                self._reload_pending([tour_id for _, tour_id in rebase])
+
+    def _run(self):
+        while not self._stop.is_set():
+            # Retry leftovers periodically; new changes wake the flusher early
+            self._wake.wait(WRITE_RETRY_INTERVAL_SECONDS)
+            self._wake.clear()
+            # Give bursts of clicks a moment to coalesce
+            if self._stop.wait(WRITE_FLUSH_DELAY_SECONDS):
+                break
+            if self._pending:
+                self.flush()
+
+    def start(self):
+        """Flush from a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='write-queue', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flusher; anything unsent stays in the journal for next time"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        with self._lock:
+            self._conn.close()